@@ -16,6 +16,7 @@ sys.path.insert(0, str(Path(__file__).parent / "src"))
 from src.utils.config import Config
 from src.agents.tests.test_agent_connectivity import run_test as run_agent_test
 from src.agents.interactive_hotel_agent import interactive_hotel_agent
+from src.agents.agent_server import serve
 
 
 def print_banner():
@@ -33,7 +34,8 @@ def print_usage():
     print()
     print("Commands:")
     print("  agent      - Run the agent connectivity test")
-    print("  interactive - Run the interactive hotel agent")
+    print("  interactive [thread_id] - Run the interactive hotel agent (resumes thread_id if given)")
+    print("  serve [port] - Serve the hotel and DB admin agents over HTTP/WebSocket")
     print("  config     - Show current configuration")
     print("  validate   - Validate configuration")
     print("  help       - Show this help message")
@@ -41,6 +43,8 @@ def print_usage():
     print("Examples:")
     print("  python main.py agent")
     print("  python main.py interactive")
+    print("  python main.py interactive guest-42")
+    print("  python main.py serve 8100")
     print("  python main.py config")
 
 
@@ -88,9 +92,17 @@ async def main():
             print("❌ Cannot run agent with invalid configuration")
     elif command == "interactive":
         if validate_config():
-            await interactive_hotel_agent()
+            if len(sys.argv) > 2:
+                await interactive_hotel_agent(thread_id=sys.argv[2])
+            else:
+                await interactive_hotel_agent()
         else:
             print("❌ Cannot run interactive agent with invalid configuration")
+    elif command == "serve":
+        if validate_config():
+            await serve(port=int(sys.argv[2]) if len(sys.argv) > 2 else None)
+        else:
+            print("❌ Cannot run agent server with invalid configuration")
     else:
         print(f"❌ Unknown command: {command}")
         print_usage()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark the HTTP and in-process extraction backends on documents with many blocks.
+The Textract server runs under uvicorn in a background thread with a stub
+Textract client returning a synthetic response and no rate limit, so the
+difference measured is the HTTP round trip plus JSON encoding and decoding of
+the blocks. Each size is timed with the result cache off and on a cache hit.
+
+Usage: python scripts/benchmarks/bench_extraction_backends.py [pages ...]
+"""
+
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+from unittest import mock
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(os.path.dirname(__file__))
+
+import uvicorn
+
+from src.utils.extraction_backends import HttpExtractionBackend, InProcessExtractionBackend
+from src.utils.textract_cache import TextractResultCache
+from src.agents import textract_http_server
+from synthetic_blocks import make_textract_response
+
+REPEAT = 10
+
+
+class StubTextract:
+    def __init__(self, response):
+        self.response = response
+
+    def detect_document_text(self, Document):
+        return self.response
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server():
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(textract_http_server.app, host="127.0.0.1",
+                                           port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return server, f"http://127.0.0.1:{port}"
+
+
+def time_extract(backend, path):
+    backend.extract(path)
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        backend.extract(path)
+    return (time.perf_counter() - start) / REPEAT * 1000
+
+
+def main():
+    page_counts = [int(p) for p in sys.argv[1:]] or [1, 10, 50]
+    server, base_url = start_server()
+    http = HttpExtractionBackend(base_url)
+    in_process = InProcessExtractionBackend()
+    print(f"{'pages':>6} {'blocks':>7} {'cache':>6} {'http ms':>9} {'inproc ms':>10} {'speedup':>8}")
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "scan.png")
+            with open(path, "wb") as f:
+                f.write(b"\x89PNG synthetic")
+            caches = {
+                "off": None,
+                "hit": TextractResultCache(os.path.join(tmp, "cache"), max_bytes=1 << 30, ttl_seconds=0),
+            }
+            for pages in page_counts:
+                response = make_textract_response(pages=pages)
+                for name, cache in caches.items():
+                    with mock.patch.object(textract_http_server, "get_textract_client",
+                                           return_value=StubTextract(response)), \
+                            mock.patch.object(textract_http_server, "rate_limiter", None), \
+                            mock.patch.object(textract_http_server, "result_cache", cache):
+                        if cache is not None:
+                            cache.clear()
+                        http_ms = time_extract(http, path)
+                        local_ms = time_extract(in_process, path)
+                    print(f"{pages:6d} {len(response['Blocks']):7d} {name:>6} "
+                          f"{http_ms:9.2f} {local_ms:10.2f} {http_ms / local_ms:7.1f}x")
+    finally:
+        server.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark peak memory of summarizing a large text file read whole versus in chunks.
+Uses the stub chat model, so the time measured is reading and chunking.
+
+Usage: python scripts/benchmarks/bench_streaming_input.py [megabytes ...]
+"""
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.utils.stub_model import StubChatModel
+from src.utils.summarization import PAGE_BREAK, ChunkedSummarizer
+from src.utils.text_input import read_chunks
+
+CHUNK_TOKENS = 8000
+PAGE = "\n".join(f"Line {i} of an OCR dump, with words that go on for a while." for i in range(50))
+
+
+def write_text(path, megabytes):
+    with open(path, "w") as f:
+        written = 0
+        while written < megabytes << 20:
+            written += f.write(PAGE + PAGE_BREAK)
+
+
+def measure(summarize):
+    summarizer = ChunkedSummarizer(StubChatModel(latency=0, summary_words=20),
+                                   max_chunk_tokens=CHUNK_TOKENS, concurrency=4)
+    tracemalloc.start()
+    start = time.perf_counter()
+    summarize(summarizer)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / (1 << 20), elapsed
+
+
+def read_whole(path):
+    def summarize(summarizer):
+        with open(path) as f:
+            summarizer.summarize(f.read())
+    return summarize
+
+
+def read_streamed(path, use_mmap=False):
+    def summarize(summarizer):
+        summarizer.summarize_chunks(read_chunks(path, CHUNK_TOKENS, use_mmap=use_mmap))
+    return summarize
+
+
+def main():
+    sizes = [int(s) for s in sys.argv[1:]] or [10, 50]
+    print(f"{'input MB':>9} {'mode':>8} {'peak MB':>9} {'secs':>7}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for megabytes in sizes:
+            path = os.path.join(tmp, "dump.txt")
+            write_text(path, megabytes)
+            for mode, summarize in (("whole", read_whole(path)), ("chunks", read_streamed(path)),
+                                    ("mmap", read_streamed(path, use_mmap=True))):
+                peak, elapsed = measure(summarize)
+                print(f"{megabytes:9d} {mode:>8} {peak:9.1f} {elapsed:7.2f}")
+
+
+if __name__ == "__main__":
+    main()
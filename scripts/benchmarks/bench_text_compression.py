@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark extractive pre-compression on long synthetic documents.
+Reports the time compression takes and the prompt tokens and model calls of
+summarizing with and without it, counted with the stub chat model.
+
+Usage: python scripts/benchmarks/bench_text_compression.py [pages ...]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.utils.stub_model import StubChatModel
+from src.utils.summarization import PAGE_BREAK, ChunkedSummarizer, estimate_tokens
+from src.utils.text_compression import compress_text, np
+
+SUBJECTS = ("The guest", "The hotel", "The contract", "The invoice", "Room service", "The manager")
+VERBS = ("confirmed", "updated", "cancelled", "reviewed", "approved", "disputed")
+OBJECTS = ("the booking", "the payment terms", "the room rate", "the late checkout",
+           "the deposit", "the parking fee", "the breakfast order")
+CHUNK_TOKENS = 8000
+COMPRESS_TOKENS = 6000
+
+
+class CountingModel(StubChatModel):
+    """Stub model that also counts prompt tokens."""
+
+    def __init__(self):
+        super().__init__(latency=0)
+        self.prompt_tokens = 0
+
+    def invoke(self, prompt):
+        self.prompt_tokens += estimate_tokens(prompt)
+        return super().invoke(prompt)
+
+
+def make_document(pages, sentences_per_page=40, seed=3):
+    rng = random.Random(seed)
+    text = []
+    for page in range(1, pages + 1):
+        body = [
+            f"{rng.choice(SUBJECTS)} {rng.choice(VERBS)} {rng.choice(OBJECTS)} on day {rng.randint(1, 28)}."
+            for _ in range(sentences_per_page)
+        ]
+        text.append(
+            "ACME Hotels Group - Internal\nQuarterly operations report\n"
+            + "\n".join(body)
+            + f"\nConfidential\nPage {page} of {pages}"
+        )
+    return PAGE_BREAK.join(text)
+
+
+def summarize(document, compress_tokens):
+    model = CountingModel()
+    summarizer = ChunkedSummarizer(model, max_chunk_tokens=CHUNK_TOKENS, concurrency=4,
+                                   compress_tokens=compress_tokens)
+    summarizer.summarize(document)
+    return model.prompt_tokens, model.calls
+
+
+def main():
+    page_counts = [int(p) for p in sys.argv[1:]] or [20, 100, 500]
+    print(f"NumPy: {'yes' if np is not None else 'no (pure Python)'}; "
+          f"chunk budget {CHUNK_TOKENS}, compression budget {COMPRESS_TOKENS} tokens\n")
+    print(f"{'pages':>6} {'tokens':>8} {'ratio':>6} {'compress s':>11} "
+          f"{'sent (off)':>11} {'calls':>6} {'sent (on)':>10} {'calls':>6}")
+    for pages in page_counts:
+        document = make_document(pages)
+        start = time.perf_counter()
+        _, stats = compress_text(document, COMPRESS_TOKENS)
+        compress_seconds = time.perf_counter() - start
+        plain = summarize(document, 0)
+        compressed = summarize(document, COMPRESS_TOKENS)
+        print(f"{pages:6d} {stats['input_tokens']:8d} {stats['ratio']:5.1f}x {compress_seconds:11.2f} "
+              f"{plain[0]:11d} {plain[1]:6d} {compressed[0]:10d} {compressed[1]:6d}")
+
+
+if __name__ == "__main__":
+    main()
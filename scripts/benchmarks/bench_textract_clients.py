@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-request Textract client construction against the shared registry.
+Runs against a local stub endpoint, so no AWS credentials or network are needed.
+
+Usage: python scripts/benchmarks/bench_textract_clients.py [iterations]
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import boto3
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.utils.textract_clients import TextractClientRegistry
+
+STUB_RESPONSE = json.dumps({
+    "DocumentMetadata": {"Pages": 1},
+    "Blocks": [{"BlockType": "LINE", "Id": "1", "Text": "stub"}],
+}).encode("utf-8")
+
+
+class StubTextractHandler(BaseHTTPRequestHandler):
+    """Answers every Textract call with a fixed single-line response."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-amz-json-1.1")
+        self.send_header("Content-Length", str(len(STUB_RESPONSE)))
+        self.end_headers()
+        self.wfile.write(STUB_RESPONSE)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubTextractHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def time_calls(label, iterations, get_client):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        get_client().detect_document_text(Document={"Bytes": b"document"})
+    elapsed = time.perf_counter() - start
+    per_call_ms = elapsed / iterations * 1000
+    print(f"{label:<28} {iterations:>6} calls  {elapsed:8.3f}s  {per_call_ms:8.3f} ms/call")
+    return per_call_ms
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "bench")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "bench")
+    server, endpoint_url = start_stub_server()
+    print(f"📊 Textract client benchmark against stub endpoint {endpoint_url}\n")
+
+    try:
+        before = time_calls(
+            "client per request",
+            iterations,
+            lambda: boto3.client("textract", region_name="us-east-1", endpoint_url=endpoint_url),
+        )
+        registry = TextractClientRegistry(endpoint_url=endpoint_url)
+        after = time_calls("shared registry client", iterations, lambda: registry.get("us-east-1"))
+        registry.close()
+    finally:
+        server.shutdown()
+
+    print(f"\nPer-request overhead saved: {before - after:.3f} ms ({before / after:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
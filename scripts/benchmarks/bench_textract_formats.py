@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Benchmark response size and encoding time for each /extract-text format.
+Uses a synthetic Textract response, so no AWS access is needed.
+
+Usage: python scripts/benchmarks/bench_textract_formats.py [pages]
+"""
+
+import gzip
+import json
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(os.path.dirname(__file__))
+
+from src.utils.textract_formats import RESPONSE_FORMATS, encode_json, format_result, orjson
+from synthetic_blocks import make_textract_response
+
+
+def time_encode(encode, content, repeat=20):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        body = encode(content)
+    return (time.perf_counter() - start) / repeat * 1000, body
+
+
+def main():
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    blocks = make_textract_response(pages=pages)["Blocks"]
+    result = {
+        "text": "\n".join(b["Text"] for b in blocks if b["BlockType"] == "LINE"),
+        "blocks": blocks,
+    }
+    print(f"📊 Response formats for {pages} pages, {len(blocks)} blocks\n")
+    print(f"{'format':<10} {'json bytes':>12} {'gzip bytes':>12} {'stdlib ms':>10} {'fast ms':>10}")
+
+    baseline = None
+    for response_format in RESPONSE_FORMATS:
+        content = format_result(result, response_format)
+        stdlib_ms, stdlib_body = time_encode(lambda c: json.dumps(c).encode("utf-8"), content)
+        fast_ms, body = time_encode(encode_json, content)
+        gzipped = len(gzip.compress(body, compresslevel=5))
+        baseline = baseline or (len(stdlib_body), stdlib_ms)
+        print(f"{response_format:<10} {len(body):>12,} {gzipped:>12,} {stdlib_ms:>10.2f} {fast_ms:>10.2f}")
+
+    print(f"\nBaseline (full, stdlib json): {baseline[0]:,} bytes, {baseline[1]:.2f} ms")
+    print(f"Fast encoder: {'orjson' if orjson is not None else 'stdlib json (orjson not installed)'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Benchmark table and form reconstruction as documents grow.
+Compares the indexed, linear-time rebuild with a naive search of the block
+list for every relationship id. Uses synthetic blocks, so no AWS access is needed.
+
+Usage: python scripts/benchmarks/bench_textract_structure.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(os.path.dirname(__file__))
+
+from src.utils.textract_structure import extract_structure, related_ids
+from synthetic_blocks import make_structured_blocks
+
+
+def naive_structure(blocks):
+    """Rebuild tables and forms by scanning the block list for every id."""
+    def find(block_id):
+        return next(b for b in blocks if b["Id"] == block_id)
+
+    def text_of(block):
+        return " ".join(find(i)["Text"] for i in related_ids(block, "CHILD"))
+
+    tables, forms = [], []
+    for block in blocks:
+        if block["BlockType"] == "TABLE":
+            tables.append([text_of(find(i)) for i in related_ids(block, "CHILD")])
+        elif block["BlockType"] == "KEY_VALUE_SET" and "KEY" in block["EntityTypes"]:
+            value = find(related_ids(block, "VALUE")[0])
+            forms.append((text_of(block), text_of(value)))
+    return tables, forms
+
+
+def time_call(fn, blocks, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(blocks)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    print("📊 Table/form reconstruction time vs. document size\n")
+    print(f"{'blocks':>8} {'indexed ms':>11} {'us/block':>9} {'naive ms':>10}")
+    for scale in (1, 2, 4, 8, 16):
+        blocks = make_structured_blocks(tables=5 * scale, rows=10, columns=5, fields=50 * scale)
+        indexed_ms = time_call(extract_structure, blocks, repeat=20)
+        # The naive version is quadratic, so skip it once it gets slow
+        naive = f"{time_call(naive_structure, blocks, repeat=1):10.1f}" if scale <= 4 else f"{'-':>10}"
+        print(f"{len(blocks):>8,} {indexed_ms:>11.2f} {indexed_ms * 1000 / len(blocks):>9.2f} {naive}")
+
+
+if __name__ == "__main__":
+    main()
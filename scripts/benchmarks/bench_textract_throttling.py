@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark goodput under a burst against a throttling service.
+A simulated Textract endpoint accepts a fixed number of calls per second and
+throttles the rest. Compares callers that retry throttling errors with plain
+exponential backoff against callers sharing the adaptive rate limiter.
+
+Usage: python scripts/benchmarks/bench_textract_throttling.py
+"""
+
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from botocore.exceptions import ClientError
+
+from src.utils.rate_limiter import AdaptiveRateLimiter, is_throttling_error
+
+SERVICE_RATE = 50      # calls per second the service accepts
+CALLERS = 32
+CALLS_PER_CALLER = 10
+MAX_RETRIES = 8
+BASE_DELAY = 0.05
+
+
+class ThrottlingService:
+    """Token bucket on the service side; calls over the limit raise ThrottlingException."""
+
+    def __init__(self, rate):
+        self.rate = rate
+        self.tokens = rate / 10
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+        self.accepted = 0
+        self.throttled = 0
+
+    def call(self):
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.rate / 10, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens < 1:
+                self.throttled += 1
+                raise ClientError({"Error": {"Code": "ThrottlingException"}}, "AnalyzeDocument")
+            self.tokens -= 1
+            self.accepted += 1
+        time.sleep(0.005)
+        return "ok"
+
+
+def backoff_call(service):
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            return service.call()
+        except ClientError as e:
+            if not is_throttling_error(e) or attempt == MAX_RETRIES:
+                raise
+            time.sleep(BASE_DELAY * (2 ** attempt) * random.uniform(0.5, 1.5))
+
+
+def run(name, call):
+    service = ThrottlingService(SERVICE_RATE)
+    failures = []
+    latencies = []
+
+    def caller():
+        for _ in range(CALLS_PER_CALLER):
+            started = time.perf_counter()
+            try:
+                call(service)
+            except ClientError:
+                failures.append(1)
+            latencies.append(time.perf_counter() - started)
+
+    threads = [threading.Thread(target=caller) for _ in range(CALLERS)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    total = service.accepted + service.throttled
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95)]
+    print(
+        f"{name:<18} {elapsed:6.2f}s  goodput {service.accepted / elapsed:6.1f}/s  "
+        f"calls {total:5d}  throttled {service.throttled:5d} ({service.throttled / total:5.1%})  "
+        f"p95 {p95:5.2f}s  max {latencies[-1]:5.2f}s  failed {len(failures)}"
+    )
+
+
+def main():
+    print(f"{CALLERS} callers x {CALLS_PER_CALLER} calls, service limit {SERVICE_RATE}/s")
+    run("backoff only", backoff_call)
+    limiter = AdaptiveRateLimiter(rate=SERVICE_RATE * 2, burst=SERVICE_RATE / 10, min_rate=1)
+    run("adaptive limiter", lambda service: limiter.call(
+        service.call, max_retries=MAX_RETRIES, base_delay=BASE_DELAY,
+    ))
+    print(f"limiter settled at {limiter.stats()['rate']}/s")
+
+
+if __name__ == "__main__":
+    main()
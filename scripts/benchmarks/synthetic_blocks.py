@@ -0,0 +1,129 @@
+"""
+Synthetic Textract responses for the benchmarks.
+Builds PAGE/LINE/WORD blocks with realistic geometry, ids and relationships.
+"""
+
+import random
+import uuid
+
+WORDS = ("invoice", "total", "amount", "due", "contract", "party", "signature",
+         "date", "payment", "terms", "hotel", "booking", "guest", "room", "rate")
+
+
+def _geometry(rng):
+    left, top = rng.random(), rng.random()
+    width, height = rng.random() / 5, rng.random() / 50
+    return {
+        "BoundingBox": {"Width": width, "Height": height, "Left": left, "Top": top},
+        "Polygon": [
+            {"X": left, "Y": top},
+            {"X": left + width, "Y": top},
+            {"X": left + width, "Y": top + height},
+            {"X": left, "Y": top + height},
+        ],
+    }
+
+
+def make_textract_response(pages=2, lines_per_page=40, words_per_line=8, seed=7):
+    """Return a dict shaped like an analyze_document response."""
+    rng = random.Random(seed)
+    blocks = []
+    for page in range(1, pages + 1):
+        page_block = {
+            "BlockType": "PAGE",
+            "Id": str(uuid.UUID(int=rng.getrandbits(128))),
+            "Page": page,
+            "Geometry": _geometry(rng),
+            "Relationships": [{"Type": "CHILD", "Ids": []}],
+        }
+        blocks.append(page_block)
+        for _ in range(lines_per_page):
+            words = []
+            for _ in range(words_per_line):
+                words.append({
+                    "BlockType": "WORD",
+                    "Id": str(uuid.UUID(int=rng.getrandbits(128))),
+                    "Confidence": 90 + rng.random() * 10,
+                    "Text": rng.choice(WORDS),
+                    "TextType": "PRINTED",
+                    "Page": page,
+                    "Geometry": _geometry(rng),
+                })
+            line = {
+                "BlockType": "LINE",
+                "Id": str(uuid.UUID(int=rng.getrandbits(128))),
+                "Confidence": 90 + rng.random() * 10,
+                "Text": " ".join(w["Text"] for w in words),
+                "Page": page,
+                "Geometry": _geometry(rng),
+                "Relationships": [{"Type": "CHILD", "Ids": [w["Id"] for w in words]}],
+            }
+            page_block["Relationships"][0]["Ids"].append(line["Id"])
+            blocks.append(line)
+            blocks.extend(words)
+    return {"DocumentMetadata": {"Pages": pages}, "Blocks": blocks}
+
+
+def _word(rng, page, text):
+    return {
+        "BlockType": "WORD",
+        "Id": str(uuid.UUID(int=rng.getrandbits(128))),
+        "Confidence": 90 + rng.random() * 10,
+        "Text": text,
+        "Page": page,
+        "Geometry": _geometry(rng),
+    }
+
+
+def make_structured_blocks(tables=10, rows=20, columns=5, fields=100, pages=1, seed=11):
+    """Return blocks with TABLE/CELL and KEY_VALUE_SET structure, in Textract's layout."""
+    rng = random.Random(seed)
+    blocks = []
+    for t in range(tables):
+        page = t % pages + 1
+        table = {
+            "BlockType": "TABLE",
+            "Id": str(uuid.UUID(int=rng.getrandbits(128))),
+            "Page": page,
+            "Confidence": 95.0,
+            "Relationships": [{"Type": "CHILD", "Ids": []}],
+        }
+        blocks.append(table)
+        for r in range(1, rows + 1):
+            for c in range(1, columns + 1):
+                word = _word(rng, page, f"r{r}c{c}")
+                cell = {
+                    "BlockType": "CELL",
+                    "Id": str(uuid.UUID(int=rng.getrandbits(128))),
+                    "Page": page,
+                    "RowIndex": r,
+                    "ColumnIndex": c,
+                    "RowSpan": 1,
+                    "ColumnSpan": 1,
+                    "Relationships": [{"Type": "CHILD", "Ids": [word["Id"]]}],
+                }
+                table["Relationships"][0]["Ids"].append(cell["Id"])
+                blocks.extend([cell, word])
+    for f in range(fields):
+        page = f % pages + 1
+        key_word, value_word = _word(rng, page, f"field{f}"), _word(rng, page, f"value{f}")
+        value = {
+            "BlockType": "KEY_VALUE_SET",
+            "Id": str(uuid.UUID(int=rng.getrandbits(128))),
+            "EntityTypes": ["VALUE"],
+            "Page": page,
+            "Relationships": [{"Type": "CHILD", "Ids": [value_word["Id"]]}],
+        }
+        key = {
+            "BlockType": "KEY_VALUE_SET",
+            "Id": str(uuid.UUID(int=rng.getrandbits(128))),
+            "EntityTypes": ["KEY"],
+            "Page": page,
+            "Confidence": 90.0,
+            "Relationships": [
+                {"Type": "VALUE", "Ids": [value["Id"]]},
+                {"Type": "CHILD", "Ids": [key_word["Id"]]},
+            ],
+        }
+        blocks.extend([key, value, key_word, value_word])
+    return blocks
@@ -0,0 +1,267 @@
+"""
+Multi-session HTTP/WebSocket server for the hotel and DB admin agents.
+One process holds a single model client, toolbox client, checkpointer and
+compiled graph per agent; sessions are just thread ids in the checkpointer,
+so serving another user costs no more than their conversation state.
+
+Run with: python main.py serve
+"""
+
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+import uvicorn
+from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from src.utils.agent_sessions import AgentSession, SessionBusyError, SessionRegistry
+from src.utils.agent_streaming import TurnStats, turn_events
+from src.utils.config import Config
+from src.utils.textract_formats import encode_json
+
+
+class ServedAgent:
+    """A compiled agent graph shared by all its sessions."""
+
+    def __init__(self, graph: Any, make_inputs: Callable[[str], Dict[str, Any]], memory: Any = None):
+        """
+        Args:
+            graph: Compiled LangGraph agent with a checkpointer
+            make_inputs: Builds the graph input for a user message
+            memory: The agent's MemoryPolicy, used for prompt sizes the model doesn't report
+        """
+        self.graph = graph
+        self.make_inputs = make_inputs
+        self.memory = memory
+
+
+class AgentRuntime:
+    """Everything the sessions share; closing it closes the clients it was built with."""
+
+    def __init__(self, agents: Dict[str, ServedAgent], checkpointer: Any = None,
+                 registry: Optional[SessionRegistry] = None, stack: Optional[AsyncExitStack] = None,
+                 tool_cache: Any = None):
+        self.agents = agents
+        self.checkpointer = checkpointer
+        self.tool_cache = tool_cache
+        self.registry = registry or SessionRegistry(
+            max_turns_per_session=Config.AGENT_SESSION_MAX_TURNS,
+            max_concurrent_turns=Config.AGENT_SERVER_MAX_TURNS,
+            idle_seconds=Config.AGENT_SESSION_IDLE_SECONDS,
+        )
+        if self.registry.on_forget is None:
+            self.registry.on_forget = self.session_forgotten
+        self.stack = stack or AsyncExitStack()
+
+    def session_forgotten(self, session: AgentSession) -> None:
+        served = self.agents.get(session.agent_name)
+        if served is not None and served.memory is not None:
+            served.memory.forget(session.checkpoint_thread_id)
+
+    async def aclose(self) -> None:
+        await self.stack.aclose()
+
+
+async def close_toolbox_client(client: Any) -> None:
+    if hasattr(client, 'aclose'):
+        await client.aclose()
+    elif hasattr(client, 'close'):
+        await client.close()
+
+
+async def build_runtime() -> AgentRuntime:
+    """Connect to the model, toolbox server and checkpointer, and build both agents."""
+    # Imported here so the server can be run and tested with other agents without these installed
+    from langchain_google_genai import ChatGoogleGenerativeAI
+    from toolbox_langchain import ToolboxClient
+
+    from src.agents.db_admin_agent import build_db_admin_agent, db_admin_inputs
+    from src.agents.interactive_hotel_agent import build_hotel_agent, hotel_inputs
+    from src.utils.checkpointer import open_checkpointer
+    from src.utils.clock import get_clock
+    from src.utils.tool_cache import get_tool_cache
+
+    stack = AsyncExitStack()
+    try:
+        model = ChatGoogleGenerativeAI(model="gemini-1.5-flash")
+        # One toolbox client, and its connection pool, for every session of both agents
+        client = ToolboxClient(Config.get_toolbox_url())
+        stack.push_async_callback(close_toolbox_client, client)
+        checkpointer = await stack.enter_async_context(open_checkpointer())
+        clock = get_clock()
+        stack.callback(clock.stop)
+
+        # Tool results are cached across sessions, so one guest's lookups serve the next
+        tool_cache = get_tool_cache()
+        hotel, memory = build_hotel_agent(model, await client.aload_toolset("hotel-agent"), checkpointer,
+                                          tool_cache)
+        db_admin = build_db_admin_agent(model, await client.aload_toolset("db-admin"), checkpointer)
+    except BaseException:
+        await stack.aclose()
+        raise
+    agents = {
+        "hotel": ServedAgent(hotel, lambda message: hotel_inputs(message, memory, clock.current_date()), memory),
+        "db-admin": ServedAgent(db_admin, db_admin_inputs),
+    }
+    return AgentRuntime(agents, checkpointer, stack=stack, tool_cache=tool_cache)
+
+
+# Built at startup by the lifespan hook unless one was set beforehand
+runtime: Optional[AgentRuntime] = None
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global runtime
+    if runtime is not None:
+        yield
+        return
+    runtime = await build_runtime()
+    try:
+        yield
+    finally:
+        await runtime.aclose()
+        runtime = None
+
+
+app = FastAPI(lifespan=lifespan)
+
+
+class MessageRequest(BaseModel):
+    message: str
+    # Stream NDJSON events as they arrive instead of one JSON reply at the end
+    stream: bool = True
+
+
+def get_agent_or_404(agent_name: str) -> ServedAgent:
+    served = runtime.agents.get(agent_name)
+    if served is None:
+        raise HTTPException(status_code=404, detail=f"Unknown agent {agent_name!r}")
+    return served
+
+
+async def run_turn(served: ServedAgent, agent_name: str, thread_id: str,
+                   message: str) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Run one turn of a session, yielding its events and then a "done" event with the
+    reply and timings (or an "error" event).
+
+    The turn is claimed when iteration starts and released when it ends, so a
+    response whose body is never sent (the client left first) holds nothing.
+
+    Raises:
+        SessionBusyError: Before the first event, if the session has no turn free
+    """
+    registry = runtime.registry
+    session = registry.start_turn(agent_name, thread_id)
+    stats = TurnStats()
+    config = {"configurable": {"thread_id": session.checkpoint_thread_id}}
+    try:
+        await registry.acquire_slot()
+        try:
+            async for event in turn_events(served.graph, served.make_inputs(message), config, stats):
+                yield event
+        finally:
+            registry.release_slot()
+        if stats.prompt_tokens is None and served.memory:
+            stats.prompt_tokens = served.memory.prompt_tokens(session.checkpoint_thread_id)
+        yield {"type": "done", "text": stats.text, **stats.to_dict()}
+    except Exception as e:
+        yield {"type": "error", "error": str(e)}
+    finally:
+        registry.end_turn(session)
+
+
+@app.get("/agents")
+async def list_agents():
+    return {"agents": sorted(runtime.agents)}
+
+
+@app.post("/agents/{agent_name}/sessions/{thread_id}/messages")
+async def post_message(agent_name: str, thread_id: str, request: MessageRequest):
+    served = get_agent_or_404(agent_name)
+    if not request.message.strip():
+        raise HTTPException(status_code=400, detail="message is empty")
+    try:
+        runtime.registry.check_available(agent_name, thread_id)
+    except SessionBusyError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "1"})
+    events = run_turn(served, agent_name, thread_id, request.message)
+    if request.stream:
+        async def lines():
+            try:
+                async for event in events:
+                    yield encode_json(event) + b"\n"
+            except SessionBusyError as e:
+                # Another request took the session between the check and the first event
+                yield encode_json({"type": "error", "error": str(e)}) + b"\n"
+
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+    # Run the turn to the end, so the session is released before replying
+    try:
+        async for event in events:
+            last = event
+    except SessionBusyError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "1"})
+    if last["type"] == "error":
+        raise HTTPException(status_code=500, detail=last["error"])
+    return last
+
+
+@app.websocket("/agents/{agent_name}/sessions/{thread_id}/ws")
+async def session_websocket(websocket: WebSocket, agent_name: str, thread_id: str):
+    """Each {"message": ...} received runs a turn whose events are sent back as they arrive."""
+    await websocket.accept()
+    served = runtime.agents.get(agent_name)
+    if served is None:
+        await websocket.send_json({"type": "error", "error": f"Unknown agent {agent_name!r}"})
+        await websocket.close(code=1008)
+        return
+    try:
+        while True:
+            request = await websocket.receive_json()
+            message = request.get("message", "") if isinstance(request, dict) else ""
+            if not message.strip():
+                await websocket.send_json({"type": "error", "error": "message is empty"})
+                continue
+            try:
+                async for event in run_turn(served, agent_name, thread_id, message):
+                    await websocket.send_json(event)
+            except SessionBusyError as e:
+                await websocket.send_json({"type": "error", "error": str(e)})
+    except WebSocketDisconnect:
+        pass
+
+
+@app.delete("/agents/{agent_name}/sessions/{thread_id}")
+async def delete_session(agent_name: str, thread_id: str):
+    """Forget a session and delete its conversation from the checkpointer."""
+    get_agent_or_404(agent_name)
+    registry = runtime.registry
+    session = registry.get(agent_name, thread_id)
+    if session is not None and session.in_flight:
+        raise HTTPException(status_code=409, detail="Session has a turn running")
+    registry.forget(agent_name, thread_id)
+    if runtime.checkpointer is not None:
+        await runtime.checkpointer.adelete_thread(AgentSession(agent_name, thread_id).checkpoint_thread_id)
+    return {"deleted": thread_id}
+
+
+@app.get("/sessions/stats")
+async def session_stats():
+    return runtime.registry.stats()
+
+
+@app.get("/tools/cache/stats")
+async def tool_cache_stats():
+    """Hit rates of the tool result cache, overall and per tool."""
+    if runtime.tool_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **runtime.tool_cache.stats()}
+
+
+async def serve(host: Optional[str] = None, port: Optional[int] = None) -> None:
+    """Run the agent server until interrupted."""
+    config = uvicorn.Config(app, host=host or Config.AGENT_SERVER_HOST, port=port or Config.AGENT_SERVER_PORT)
+    await uvicorn.Server(config).serve()
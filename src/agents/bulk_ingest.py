@@ -0,0 +1,241 @@
+"""
+Bulk ingestion of document directories and archives through Textract.
+Walks a directory tree (or a .zip/.tar archive), extracts every document with
+extract_text_from_file on a thread or process pool and writes the results to
+an output store. A manifest of content hashes and statuses lets an interrupted
+run resume without redoing finished documents.
+
+Usage:
+    python -m src.agents.bulk_ingest /path/to/documents --output /path/to/store
+"""
+
+import argparse
+import os
+import sys
+import tarfile
+import tempfile
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from typing import List, Tuple
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.utils.config import Config
+from src.utils.ingest_manifest import (
+    STATUS_DONE,
+    STATUS_FAILED,
+    STATUS_SKIPPED,
+    IngestManifest,
+    IngestProgress,
+)
+from src.utils.textract_cache import make_file_cache_key
+from src.utils.textract_formats import RESPONSE_FORMATS, encode_json, format_result
+
+DEFAULT_EXTENSIONS = (".pdf", ".png", ".jpg", ".jpeg", ".tif", ".tiff")
+
+MANIFEST_NAME = "manifest.jsonl"
+RESULTS_DIR = "results"
+
+
+def is_archive(path: str) -> bool:
+    return os.path.isfile(path) and (zipfile.is_zipfile(path) or tarfile.is_tarfile(path))
+
+
+@contextmanager
+def open_source(source: str, staging_dir: str):
+    """
+    Yield a directory holding the source documents.
+
+    Archives are unpacked into a temporary directory under staging_dir, which is
+    removed afterwards; directories are used as they are.
+    """
+    if os.path.isdir(source):
+        yield source
+        return
+    if not is_archive(source):
+        raise ValueError(f"Source is neither a directory nor a zip/tar archive: {source}")
+    os.makedirs(staging_dir, exist_ok=True)
+    with tempfile.TemporaryDirectory(dir=staging_dir) as unpacked:
+        if zipfile.is_zipfile(source):
+            with zipfile.ZipFile(source) as archive:
+                archive.extractall(unpacked)
+        else:
+            with tarfile.open(source) as archive:
+                archive.extractall(unpacked, filter="data")
+        yield unpacked
+
+
+def find_documents(root: str, extensions: Tuple[str, ...]) -> List[Tuple[str, str]]:
+    """
+    List documents under root in a stable order.
+
+    Returns:
+        (name relative to root, absolute path) pairs; the name keys the manifest
+    """
+    documents = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            if os.path.splitext(filename)[1].lower() in extensions:
+                path = os.path.join(dirpath, filename)
+                documents.append((os.path.relpath(path, root).replace(os.sep, "/"), path))
+    return documents
+
+
+def result_path(output_dir: str, content_hash: str) -> str:
+    """Results are stored by content hash, so duplicate documents share one file."""
+    return os.path.join(output_dir, RESULTS_DIR, content_hash[:2], content_hash + ".json")
+
+
+def ingest_document(file_path: str, output_dir: str, use_cache: bool, response_format: str,
+                    skip_hash: str = None) -> dict:
+    """
+    Hash and extract one document and write its result. Runs on a pool worker.
+
+    The content hash is computed here, once, so files are hashed in parallel and
+    the extraction reuses it as its cache key.
+
+    Args:
+        skip_hash: Content hash the manifest has for the document when it needs no
+            work if unchanged; a document still matching it is skipped
+
+    Returns:
+        {"status": ..., "hash": ..., "size": ...} plus "error" on failure or "text_chars" on success
+    """
+    # Imported here so process-pool workers build their own clients and cache
+    from src.agents.textract_http_server import extract_text_from_file, feature_types_for
+
+    size = os.path.getsize(file_path)
+    content_hash = make_file_cache_key(file_path, feature_types_for(file_path))
+    if content_hash == skip_hash:
+        return {"status": STATUS_SKIPPED, "hash": content_hash, "size": size}
+    result = extract_text_from_file(file_path, use_cache=use_cache, cache_key=content_hash)
+    if "error" in result:
+        return {"status": STATUS_FAILED, "hash": content_hash, "size": size, "error": result["error"]}
+    out_path = result_path(output_dir, content_hash)
+    os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    tmp_path = out_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(encode_json(format_result(result, response_format)))
+    os.replace(tmp_path, out_path)
+    return {"status": STATUS_DONE, "hash": content_hash, "size": size, "text_chars": len(result["text"])}
+
+
+def ingest(source: str, output_dir: str, workers: int = Config.TEXTRACT_MAX_WORKERS,
+           extensions: Tuple[str, ...] = DEFAULT_EXTENSIONS, use_cache: bool = True,
+           response_format: str = "full", use_processes: bool = False,
+           retry_failed: bool = True, progress_seconds: float = 10.0, report=print) -> dict:
+    """
+    Ingest every document under source into output_dir, resuming from its manifest.
+
+    Args:
+        source: Directory or zip/tar archive of documents
+        output_dir: Output store holding the manifest and results
+        workers: Documents extracted concurrently
+        extensions: File extensions treated as documents
+        use_cache: Use the Textract result cache
+        response_format: Format results are stored in (see textract_formats)
+        use_processes: Use a process pool instead of a thread pool
+        retry_failed: Retry documents that failed on an earlier run
+        progress_seconds: Seconds between progress reports
+        report: Callable receiving progress lines
+
+    Returns:
+        Final progress snapshot
+    """
+    manifest = IngestManifest(os.path.join(output_dir, MANIFEST_NAME))
+    with open_source(source, os.path.join(output_dir, ".staging")) as root:
+        documents = find_documents(root, extensions)
+        progress = IngestProgress(total=len(documents))
+        report(f"Found {len(documents)} documents in {source}")
+
+        executor_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+        pending = {}
+        last_report = time.monotonic()
+
+        def collect(finished) -> None:
+            for future in finished:
+                name = pending.pop(future)
+                try:
+                    outcome = future.result()
+                except Exception as e:
+                    outcome = {"status": STATUS_FAILED, "hash": None, "size": 0, "error": f"Unexpected error: {e}"}
+                content_hash = outcome.pop("hash")
+                if outcome["status"] != STATUS_SKIPPED:
+                    manifest.record(name, content_hash, **outcome)
+                progress.update(outcome["status"], outcome["size"])
+
+        with executor_class(max_workers=workers) as executor:
+            for name, path in documents:
+                # Finished documents, and failed ones with skip-failed, are skipped by the worker if unchanged
+                entry = manifest.get(name)
+                skip_hash = None
+                if entry is not None and (entry["status"] == STATUS_DONE or not retry_failed):
+                    skip_hash = entry["hash"]
+                # Keep a bounded number of documents in flight rather than one future per file
+                while len(pending) >= workers * 2:
+                    finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(finished)
+                future = executor.submit(
+                    ingest_document, path, output_dir, use_cache, response_format, skip_hash,
+                )
+                pending[future] = name
+                if time.monotonic() - last_report >= progress_seconds:
+                    report(progress.format())
+                    last_report = time.monotonic()
+            while pending:
+                finished, _ = wait(pending, timeout=progress_seconds, return_when=FIRST_COMPLETED)
+                collect(finished)
+                if time.monotonic() - last_report >= progress_seconds:
+                    report(progress.format())
+                    last_report = time.monotonic()
+
+    manifest.compact()
+    report(progress.format())
+    return progress.snapshot()
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Extract text from every document in a directory or archive.")
+    parser.add_argument("source", help="Directory or zip/tar archive of documents")
+    parser.add_argument("--output", required=True, help="Output store for results and the manifest")
+    parser.add_argument("--workers", type=int, default=Config.TEXTRACT_MAX_WORKERS,
+                        help="Documents extracted concurrently")
+    parser.add_argument("--processes", action="store_true",
+                        help="Use a process pool instead of a thread pool")
+    parser.add_argument("--extensions", default=",".join(DEFAULT_EXTENSIONS),
+                        help="Comma-separated file extensions to ingest")
+    parser.add_argument("--format", choices=RESPONSE_FORMATS, default="full",
+                        help="Format results are stored in")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the Textract result cache")
+    parser.add_argument("--skip-failed", action="store_true",
+                        help="Don't retry documents that failed on an earlier run")
+    parser.add_argument("--progress-seconds", type=float, default=10.0,
+                        help="Seconds between progress reports")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    extensions = tuple(
+        ext if ext.startswith(".") else "." + ext
+        for ext in (e.strip().lower() for e in args.extensions.split(",")) if ext
+    )
+    summary = ingest(
+        args.source,
+        args.output,
+        workers=args.workers,
+        extensions=extensions,
+        use_cache=not args.no_cache,
+        response_format=args.format,
+        use_processes=args.processes,
+        retry_failed=not args.skip_failed,
+        progress_seconds=args.progress_seconds,
+    )
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,10 @@
-quit
 import asyncio
+from contextlib import AsyncExitStack
 from dotenv import load_dotenv
 from langgraph.prebuilt import create_react_agent
 from langchain_google_genai import ChatGoogleGenerativeAI
-from langgraph.checkpoint.memory import MemorySaver
 from toolbox_langchain import ToolboxClient
+from src.utils.checkpointer import open_checkpointer
 from src.utils.config import Config
 
 # Load environment variables from .env file
@@ -18,8 +18,14 @@ ADMIN_PROMPT = """
 You are a database administrator assistant. You can list tables, describe table schemas, and perform other admin tasks. Only use the available tools. Do not attempt to answer questions outside of database administration.
 """
 
-async def db_admin_agent():
-    """Interactive DB admin agent that accepts user queries."""
+def build_db_admin_agent(model, tools, checkpointer):
+    return create_react_agent(model, tools, checkpointer=checkpointer)
+
+def db_admin_inputs(user_query):
+    return {"messages": [("user", ADMIN_PROMPT + user_query)]}
+
+async def db_admin_agent(thread_id="db-admin-session"):
+    """Interactive DB admin agent that accepts user queries; an earlier session resumes under the same thread_id."""
     print("\U0001F4BE Welcome to the DB Admin Assistant!")
     print("=" * 50)
     print("You can ask me to:")
@@ -31,18 +37,21 @@ async def db_admin_agent():
     print("Type 'help' to see this message again")
     print("=" * 50)
 
+    stack = AsyncExitStack()
     try:
         model = ChatGoogleGenerativeAI(model="gemini-1.5-flash")
         client = ToolboxClient(TOOLBOX_URL)
         tools = await client.aload_toolset("db-admin")
-        agent = create_react_agent(model, tools, checkpointer=MemorySaver())
-        config = {"configurable": {"thread_id": "db-admin-session"}}
+        checkpointer = await stack.enter_async_context(open_checkpointer())
+        agent = build_db_admin_agent(model, tools, checkpointer)
+        config = {"configurable": {"thread_id": thread_id}}
         print("✅ Connected to toolbox server and AI model!\n")
     except Exception as e:
         print(f"❌ Error initializing agent: {e}")
         print("Make sure:")
         print("1. The toolbox server is running: ./scripts/tools/start_toolbox.sh")
         print("2. Your GOOGLE_API_KEY is set in .env file")
+        await stack.aclose()
         return
 
     while True:
@@ -63,9 +72,9 @@ async def db_admin_agent():
             if not user_query:
                 continue
             print("\n🤖 Processing your request...")
-            inputs = {"messages": [("user", ADMIN_PROMPT + user_query)]}
+            inputs = db_admin_inputs(user_query)
             try:
-                response = agent.invoke(inputs, config=config)
+                response = await agent.ainvoke(inputs, config=config)
                 print("\n💬 Assistant:")
                 if response and "messages" in response:
                     last_message = response["messages"][-1]
@@ -81,6 +90,7 @@ async def db_admin_agent():
         except KeyboardInterrupt:
             print("\n\n👋 Session interrupted. Goodbye!")
             break
+    await stack.aclose()
     try:
         if hasattr(client, 'aclose'):
             await client.aclose()
@@ -1,14 +1,18 @@
 #!/usr/bin/env python3
 
 import asyncio
+from contextlib import AsyncExitStack
 from dotenv import load_dotenv
-import requests
 
 from langgraph.prebuilt import create_react_agent
 from langchain_google_genai import ChatGoogleGenerativeAI
-from langgraph.checkpoint.memory import MemorySaver
 from toolbox_langchain import ToolboxClient
+from src.utils.agent_streaming import read_input, stream_turn
+from src.utils.checkpointer import open_checkpointer
+from src.utils.clock import get_clock
 from src.utils.config import Config
+from src.utils.conversation_memory import MemoryPolicy
+from src.utils.tool_cache import get_tool_cache
 
 # Load environment variables from .env file
 load_dotenv()
@@ -30,8 +34,40 @@ If you cannot fulfill a user's request using the available tools,
 politely inform them that you cannot help.
 """
 
-async def interactive_hotel_agent():
-    """Interactive hotel agent that accepts user queries."""
+def build_hotel_agent(model, tools, checkpointer, tool_cache=None):
+    """
+    Build the hotel ReAct agent, calling its tools through tool_cache if given.
+
+    Returns:
+        (agent, memory) where memory is the MemoryPolicy, or None when
+        AGENT_MEMORY_MAX_TOKENS is 0 and the prompt goes into each user message
+    """
+    if tool_cache is not None:
+        tools = tool_cache.wrap_all(tools)
+    # Send the prompt once per model call and keep history within a token budget
+    if Config.AGENT_MEMORY_MAX_TOKENS > 0:
+        memory = MemoryPolicy(
+            HOTEL_PROMPT,
+            max_tokens=Config.AGENT_MEMORY_MAX_TOKENS,
+            summary_model=model if Config.AGENT_MEMORY_SUMMARIES else None,
+        )
+        agent = create_react_agent(model, tools, checkpointer=checkpointer,
+                                   pre_model_hook=memory.pre_model_hook)
+        return agent, memory
+    return create_react_agent(model, tools, checkpointer=checkpointer), None
+
+def hotel_inputs(user_query, memory, current_date):
+    """Graph input for one user query, always providing current_date."""
+    return {
+        "messages": [("user", user_query if memory else HOTEL_PROMPT + user_query)],
+        "parameters": {"current_date": current_date}
+    }
+
+def print_streamed(text):
+    print(text, end="", flush=True)
+
+async def interactive_hotel_agent(thread_id="interactive-session"):
+    """Interactive hotel agent that accepts user queries; an earlier session resumes under the same thread_id."""
     
     print("🏨 Welcome to the Interactive Hotel Assistant!")
     print("=" * 50)
@@ -47,6 +83,7 @@ async def interactive_hotel_agent():
     print("=" * 50)
     
     # Initialize the model and tools
+    stack = AsyncExitStack()
     try:
         model = ChatGoogleGenerativeAI(model="gemini-1.5-flash")
         
@@ -54,10 +91,18 @@ async def interactive_hotel_agent():
         client = ToolboxClient(TOOLBOX_URL)
         tools = await client.aload_toolset("hotel-agent")
         
-        agent = create_react_agent(model, tools, checkpointer=MemorySaver())
+        # Sessions are checkpointed durably (Config.AGENT_CHECKPOINT_BACKEND)
+        checkpointer = await stack.enter_async_context(open_checkpointer())
         
-        # Use a unique thread ID for this session
-        config = {"configurable": {"thread_id": "interactive-session"}}
+        # Repeated read-only lookups are answered from the cache; bookings invalidate it
+        tool_cache = get_tool_cache()
+        agent, memory = build_hotel_agent(model, tools, checkpointer, tool_cache)
+        
+        # Checkpoints are stored per thread ID, so reusing one continues that conversation
+        config = {"configurable": {"thread_id": thread_id}}
+        
+        # Falls back to the local clock whenever the time server is unreachable
+        clock = get_clock()
         
         print("✅ Connected to hotel database and AI model!")
         print()
@@ -67,13 +112,14 @@ async def interactive_hotel_agent():
         print("Make sure:")
         print("1. The toolbox server is running: ./scripts/start_toolbox.sh")
         print("2. Your GOOGLE_API_KEY is set in .env file")
+        await stack.aclose()
         return
     
     # Interactive loop
     while True:
         try:
-            # Get user input
-            user_query = input("\n🤔 What would you like to know about hotels? ").strip()
+            # Get user input without blocking the event loop
+            user_query = (await read_input("\n🤔 What would you like to know about hotels? ")).strip()
             
             # Check for exit commands
             if user_query.lower() in ['quit', 'exit', 'bye']:
@@ -99,36 +145,23 @@ async def interactive_hotel_agent():
             
             print("\n🤖 Processing your request...")
             
-            # Always fetch the current date from the time_server
-            try:
-                resp = requests.get("http://127.0.0.1:8080/current_time")  # Adjust port if needed
-                resp.raise_for_status()
-                current_date = resp.json()['datetime'][:10]  # 'YYYY-MM-DD'
-            except Exception as e:
-                print(f"❌ Could not fetch current date from time_server: {e}")
-                continue
+            # The clock is refreshed from the time server in the background, so this never waits on it
+            current_date = clock.current_date()
 
-            # Process the query with the agent, always providing current_date
-            inputs = {
-                "messages": [("user", HOTEL_PROMPT + user_query)],
-                "parameters": {"current_date": current_date}
-            }
+            # Process the query with the agent
+            inputs = hotel_inputs(user_query, memory, current_date)
             try:
                 print(f"Calling agent with parameters: {inputs['parameters']}")
-                response = agent.invoke(inputs, config=config)
-                print("Agent call complete")
-                
                 print("\n💬 Assistant:")
-                if response and "messages" in response:
-                    last_message = response["messages"][-1]
-                    if hasattr(last_message, 'content'):
-                        print(last_message.content)
-                    else:
-                        # This case handles unexpected but valid-looking response structures
-                        print("I'm sorry, I received a response I couldn't understand. Please try again.")
-                else:
-                    # This case handles empty or invalid responses
+                # Tokens and tool calls are printed as they arrive
+                stats = await stream_turn(agent, inputs, config, write=print_streamed)
+                if stats.prompt_tokens is None and memory:
+                    # The model didn't report usage; use the memory policy's estimate
+                    stats.prompt_tokens = memory.prompt_tokens(thread_id)
+                if not stats.text:
+                    # This case handles turns that produced no answer text
                     print("I'm not sure how to respond to that. Could you please try asking in a different way?")
+                print(stats.format())
 
             except Exception:
                 # A generic error for the user is better than a technical one.
@@ -136,11 +169,18 @@ async def interactive_hotel_agent():
                 print("\n❌ I'm sorry, I ran into a problem processing that request.")
                 print("   Please try rephrasing your question or type 'help'.")
 
-        except KeyboardInterrupt:
+        except (KeyboardInterrupt, EOFError):
             print("\n\n👋 Session interrupted. Goodbye!")
             break
     
     # Clean up
+    if tool_cache is not None:
+        cache_stats = tool_cache.stats()
+        if cache_stats["hit_rate"] is not None:
+            print(f"🗃️  Tool cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses "
+                  f"({cache_stats['hit_rate']:.0%} hit rate)")
+    clock.stop()
+    await stack.aclose()
     try:
         if hasattr(client, 'aclose'):
             await client.aclose()
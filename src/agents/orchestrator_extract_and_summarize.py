@@ -1,38 +1,150 @@
-import sys
+import argparse
+import asyncio
+import glob
 import json
-import subprocess
+import sys
 import os
-from langchain_google_genai import ChatGoogleGenerativeAI
-import requests
-
-def extract_text_with_agent(file_path):
-    url = "http://127.0.0.1:8000/extract-text"  # Your FastAPI Textract server
-    response = requests.post(url, json={"file_path": file_path})
-    if response.status_code != 200:
-        print("Error extracting text:", response.text)
-        exit(1)
-    data = response.json()
-    return data.get("text", "")
-
-def summarize_text(text):
-    if not text.strip():
-        print("No text to summarize.")
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.utils.config import Config
+from src.utils.extraction_backends import BACKENDS, ExtractionError, get_extraction_backend
+from src.utils.streaming_summary import StreamingSummaryPipeline
+from src.utils.summarization import add_summary_arguments, build_summarizer
+
+def print_streamed(text):
+    print(text, end="", flush=True)
+
+def format_compression(stats):
+    return (
+        f"🗜️  compressed {stats['input_tokens']} → {stats['output_tokens']} tokens "
+        f"({stats['ratio']}x, {stats['repeated_lines_removed']} repeated lines dropped)"
+    )
+
+def summarize_compressed(file_path, backend, summarizer, use_cache):
+    """Compression needs the whole document, so pages are collected before summarizing."""
+    try:
+        text = backend.extract(file_path, use_cache=use_cache)
+        summary, stats = summarizer.summarize_with_stats(text)
+    except ExtractionError as e:
+        print("Error extracting text:", e)
+        sys.exit(1)
+    except ValueError as e:
+        print(e)
         sys.exit(1)
-    model = ChatGoogleGenerativeAI(model="gemini-1.5-flash")
-    prompt = f"Summarize the following document:\n\n{text}"
-    response = model.invoke(prompt)
-    if hasattr(response, 'content'):
-        print("Summary:\n" + response.content)
-    else:
-        print("Summary:\n" + str(response))
+    if stats:
+        print(format_compression(stats), file=sys.stderr)
+    print("Summary:")
+    print(summary)
+
+def summarize_one(file_path, backend, summarizer, use_cache):
+    if summarizer.compress_tokens:
+        summarize_compressed(file_path, backend, summarizer, use_cache)
+        return
+    pipeline = StreamingSummaryPipeline(summarizer, write=print_streamed)
+    try:
+        stats = pipeline.run(backend.stream_pages(file_path, use_cache=use_cache))
+    except ExtractionError as e:
+        print("Error extracting text:", e)
+        sys.exit(1)
+    except ValueError as e:
+        print(e)
+        sys.exit(1)
+    print(
+        f"\n⏱️  first page {stats['first_page_seconds']:.2f}s, "
+        f"first output {stats['first_output_seconds']:.2f}s, "
+        f"total {stats['total_seconds']:.2f}s "
+        f"({stats['pages']} pages, {stats['chunks']} chunks{', cached' if stats['cached'] else ''})",
+        file=sys.stderr,
+    )
+
+def expand_paths(patterns):
+    """Expand glob patterns; plain paths are kept so missing files show up in the report."""
+    paths = []
+    for pattern in patterns:
+        if glob.has_magic(pattern):
+            paths.extend(sorted(glob.glob(pattern, recursive=True)))
+        else:
+            paths.append(pattern)
+    return paths
+
+async def summarize_file(file_path, backend, summarizer, use_cache, semaphore):
+    """Extract and summarize one file, returning its report record instead of raising."""
+    async with semaphore:
+        record = {"file_path": file_path, "status": "ok"}
+        start = time.perf_counter()
+        stage = "extract"
+        try:
+            text = await asyncio.to_thread(backend.extract, file_path, use_cache)
+            record["extract_seconds"] = round(time.perf_counter() - start, 3)
+            record["text_chars"] = len(text)
+            stage = "summarize"
+            summarize_start = time.perf_counter()
+            record["summary"], compression = await asyncio.to_thread(summarizer.summarize_with_stats, text)
+            record["summarize_seconds"] = round(time.perf_counter() - summarize_start, 3)
+            if compression:
+                record["compression"] = compression
+        except Exception as e:
+            record.update(status="error", stage=stage, error=str(e) or type(e).__name__)
+        record["total_seconds"] = round(time.perf_counter() - start, 3)
+        return record
+
+async def run_batch(file_paths, backend, summarizer, report_path, concurrency, use_cache=True):
+    """
+    Summarize files concurrently, writing one JSONL record per file as it finishes.
+    Failures are recorded for the file and don't stop the batch.
+
+    Returns:
+        The report records in completion order
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    tasks = [
+        asyncio.ensure_future(summarize_file(path, backend, summarizer, use_cache, semaphore))
+        for path in file_paths
+    ]
+    records = []
+    with open(report_path, "w") as report:
+        for finished in asyncio.as_completed(tasks):
+            record = await finished
+            records.append(record)
+            report.write(json.dumps(record) + "\n")
+            report.flush()
+            mark = "✅" if record["status"] == "ok" else "❌"
+            print(f"{mark} [{len(records)}/{len(tasks)}] {record['file_path']} ({record['total_seconds']:.1f}s)")
+    return records
 
 def main():
-    if len(sys.argv) != 2:
-        print("Usage: python src/agents/orchestrator_extract_and_summarize.py /path/to/file.pdf")
+    parser = argparse.ArgumentParser(description="Extract text from documents and summarize them.")
+    parser.add_argument("file_paths", nargs="+", help="Documents (PDF or image) or glob patterns")
+    parser.add_argument("--report", help="Write a JSONL report (batch mode); default summaries.jsonl")
+    parser.add_argument("--files-concurrency", type=int, default=Config.SUMMARY_BATCH_CONCURRENCY,
+                        help="Files processed at once in batch mode")
+    parser.add_argument("--backend", choices=BACKENDS, default=Config.EXTRACTION_BACKEND,
+                        help="Extract through the Textract HTTP server, in this process, or with the text stub")
+    add_summary_arguments(parser)
+    args = parser.parse_args()
+    backend = get_extraction_backend(args.backend)
+    summarizer = build_summarizer(args)
+    # --no-cache also bypasses the Textract result cache
+    use_cache = not args.no_cache
+    file_paths = expand_paths(args.file_paths)
+    if len(file_paths) == 1 and not args.report and file_paths[0] == args.file_paths[0]:
+        summarize_one(file_paths[0], backend, summarizer, use_cache)
+        return
+
+    report_path = args.report or "summaries.jsonl"
+    start = time.perf_counter()
+    records = asyncio.run(
+        run_batch(file_paths, backend, summarizer, report_path, args.files_concurrency, use_cache)
+    )
+    failed = sum(1 for record in records if record["status"] != "ok")
+    print(
+        f"\n{len(records) - failed} summarized, {failed} failed in {time.perf_counter() - start:.1f}s; "
+        f"report written to {report_path}"
+    )
+    if failed:
         sys.exit(1)
-    file_path = sys.argv[1]
-    text = extract_text_with_agent(file_path)
-    summarize_text(text)
 
 if __name__ == "__main__":
     main()
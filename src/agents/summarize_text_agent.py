@@ -1,22 +1,49 @@
-from langchain_google_genai import ChatGoogleGenerativeAI
+import argparse
+import os
 import sys
 
-def main():
-    if len(sys.argv) != 2:
-        print("Usage: python src/agents/summarize_agent.py /path/to/textfile.txt")
-        return
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 
-    text_file = sys.argv[1]
-    with open(text_file, "r") as f:
-        text = f.read()
+from src.utils.summarization import NoTextError, add_summary_arguments, build_summarizer
+from src.utils.text_input import STDIN, open_text, read_chunks
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize a text file.")
+    parser.add_argument("text_file",
+                        help='Path of the text file to summarize ("-" for stdin; .gz files are decompressed)')
+    parser.add_argument("--mmap", action="store_true",
+                        help="Memory-map the file instead of reading it (plain files only)")
+    add_summary_arguments(parser)
+    args = parser.parse_args()
+    summarizer = build_summarizer(args)
 
-    if not text.strip():
+    try:
+        if args.compress_tokens:
+            # Ranking sentences needs the whole text, so it is read at once
+            with open_text(args.text_file) as f:
+                summary, compression = summarizer.summarize_with_stats(f.read())
+            if compression:
+                print(
+                    f"🗜️  compressed {compression['input_tokens']} → {compression['output_tokens']} tokens "
+                    f"({compression['ratio']}x)",
+                    file=sys.stderr,
+                )
+        else:
+            summary = None
+            if args.text_file != STDIN:
+                # Files can be read twice: hashing them first lets a cached summary skip the model entirely
+                summary = summarizer.cached_summary_of_chunks(
+                    read_chunks(args.text_file, args.chunk_tokens, use_mmap=args.mmap)
+                )
+            if summary is None:
+                # Read a chunk at a time, so memory use doesn't grow with the input
+                summary = summarizer.summarize_chunks(
+                    read_chunks(args.text_file, args.chunk_tokens, use_mmap=args.mmap)
+                )
+    except NoTextError:
         print("No text to summarize.")
         return
 
-    model = ChatGoogleGenerativeAI(model="gemini-1.5-flash")
-    prompt = f"Summarize the following document:\n\n{text}"
-    summary = model.invoke(prompt)
     print("Summary:")
     print(summary)
 
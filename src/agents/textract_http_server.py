@@ -1,47 +1,789 @@
 import os
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import JSONResponse
+import asyncio
+import mmap
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
+from typing import List, Literal
+from fastapi import Depends, FastAPI, HTTPException, Request
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from starlette.datastructures import UploadFile
 from pydantic import BaseModel
-import boto3
 from botocore.exceptions import BotoCoreError, ClientError
+from src.utils.config import Config
+from src.utils.metrics import snapshot_lines
+from src.utils.pdf_split import count_pdf_pages, split_pdf
+from src.utils.rate_limiter import AdaptiveRateLimiter, is_throttling_error
+from src.utils.singleflight import SingleFlight
+from src.utils.textract_cache import TextractResultCache, make_cache_key, make_file_cache_key
+from src.utils.textract_clients import TextractClientRegistry
+from src.utils.textract_formats import encode_json, format_result
+from src.utils.textract_structure import extract_structure
+from src.utils.textract_metrics import (
+    PHASE_CACHE_LOOKUP,
+    PHASE_FILE_READ,
+    PHASE_SERIALIZATION,
+    PHASE_TEXTRACT,
+    block_count,
+    document_bytes as document_bytes_histogram,
+    extractions,
+    metrics,
+    request_latency,
+    requests_in_flight,
+    server_timing_header,
+    timed_phase,
+)
+from src.utils.textract_jobs import (
+    JOB_FAILED,
+    JOB_SUCCEEDED,
+    JobTable,
+    TextractJob,
+    group_blocks_by_page,
+    run_textract_job,
+)
+from src.utils.worker_pool import PoolFullError, WorkerPool
 
-app = FastAPI()
+# Built at startup by the lifespan hook; created lazily for in-process callers
+client_registry = None
 
-class FilePathRequest(BaseModel):
+def build_client_registry() -> TextractClientRegistry:
+    return TextractClientRegistry(
+        max_pool_connections=Config.TEXTRACT_MAX_POOL_CONNECTIONS,
+        max_attempts=Config.TEXTRACT_MAX_ATTEMPTS,
+        retry_mode=Config.TEXTRACT_RETRY_MODE,
+        connect_timeout=Config.TEXTRACT_CONNECT_TIMEOUT,
+        read_timeout=Config.TEXTRACT_READ_TIMEOUT,
+        endpoint_url=Config.TEXTRACT_ENDPOINT_URL,
+    )
+
+def get_textract_client(region: str = None, retries: bool = True):
+    global client_registry
+    if client_registry is None:
+        client_registry = build_client_registry()
+    return client_registry.get(region or Config.AWS_REGION, retries=retries)
+
+def get_s3_client(region: str = None):
+    global client_registry
+    if client_registry is None:
+        client_registry = build_client_registry()
+    return client_registry.get(region or Config.AWS_REGION, service="s3")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global client_registry
+    client_registry = build_client_registry()
+    # Build the default client up front so the first request doesn't pay for it
+    client_registry.get(Config.AWS_REGION)
+    yield
+    client_registry.close()
+    client_registry = None
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with the fast encoder (orjson when available)."""
+
+    def render(self, content) -> bytes:
+        return encode_json(content)
+
+app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
+if Config.TEXTRACT_GZIP_ENABLED:
+    app.add_middleware(
+        GZipMiddleware,
+        minimum_size=Config.TEXTRACT_GZIP_MIN_BYTES,
+        compresslevel=Config.TEXTRACT_GZIP_LEVEL,
+    )
+
+# Results are cached by document content, so repeat extractions skip Textract
+result_cache = None
+if Config.TEXTRACT_CACHE_ENABLED:
+    result_cache = TextractResultCache(
+        Config.TEXTRACT_CACHE_DIR,
+        max_bytes=Config.TEXTRACT_CACHE_MAX_BYTES,
+        ttl_seconds=Config.TEXTRACT_CACHE_TTL_SECONDS,
+    )
+
+# Concurrent requests for the same document share one Textract call
+textract_flight = SingleFlight()
+
+# Paces Textract calls across all workers and backs off when AWS throttles us
+rate_limiter = None
+if Config.TEXTRACT_RATE_LIMIT > 0:
+    rate_limiter = AdaptiveRateLimiter(
+        rate=Config.TEXTRACT_RATE_LIMIT,
+        burst=Config.TEXTRACT_RATE_BURST,
+        min_rate=Config.TEXTRACT_RATE_MIN,
+    )
+
+# Extraction does blocking file I/O and boto3 calls, so it runs off the event loop
+extraction_pool = WorkerPool(
+    max_workers=Config.TEXTRACT_MAX_WORKERS,
+    max_queue=Config.TEXTRACT_MAX_QUEUE,
+    name="textract",
+)
+
+# Large documents run as start/poll Textract jobs on their own pool
+job_pool = WorkerPool(
+    max_workers=Config.TEXTRACT_JOB_WORKERS,
+    max_queue=Config.TEXTRACT_MAX_QUEUE,
+    name="textract-job",
+)
+job_table = JobTable(max_jobs=Config.TEXTRACT_MAX_JOBS)
+
+# Seconds between checks for new pages while streaming a job
+JOB_STREAM_POLL_SECONDS = 0.5
+
+# Bytes read per chunk when spooling multipart uploads
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+
+# Room for multipart boundaries and part headers on top of the upload size limit
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+# Largest document the synchronous Textract APIs accept
+TEXTRACT_SYNC_MAX_BYTES = 10 * 1024 * 1024
+
+# Page groups of split PDFs run here, not on extraction_pool, whose workers wait on them
+split_executor = ThreadPoolExecutor(
+    max_workers=Config.TEXTRACT_SPLIT_WORKERS,
+    thread_name_prefix="textract-split",
+)
+
+# See src/utils/textract_formats.py for what each format contains
+ResponseFormat = Literal["full", "text", "lines", "compact"]
+
+class OutputOptions(BaseModel):
+    format: ResponseFormat = "full"
+    # Add rebuilt tables and form key/value pairs to the response
+    structure: bool = False
+    tables_csv: bool = False
+
+class FilePathRequest(OutputOptions):
     file_path: str
+    use_cache: bool = True
 
-def extract_text_from_file(file_path: str) -> dict:
-    if not os.path.isfile(file_path):
-        return {"error": f"File not found: {file_path}"}
+class StreamRequest(BaseModel):
+    file_path: str
+    use_cache: bool = True
+
+class BatchRequest(OutputOptions):
+    file_paths: List[str]
+    use_cache: bool = True
+
+def shape_result(result: dict, options: OutputOptions) -> dict:
+    shaped = format_result(result, options.format)
+    if options.structure and "error" not in result:
+        shaped = {**shaped, **extract_structure(result["blocks"], include_csv=options.tables_csv)}
+    return shaped
+
+def feature_types_for(file_path: str) -> list:
     _, ext = os.path.splitext(file_path)
-    ext = ext.lower()
-    is_pdf = ext == ".pdf"
-    try:
-        region = os.getenv("AWS_REGION", "us-east-1")
-        textract = boto3.client("textract", region_name=region)
-        with open(file_path, "rb") as f:
-            document_bytes = f.read()
-        if is_pdf:
-            response = textract.analyze_document(
+    return ["TABLES", "FORMS"] if ext.lower() == ".pdf" else []
+
+@contextmanager
+def open_document(file_path: str):
+    """Memory-map a document so it is hashed and sent without copying it into the heap."""
+    with open(file_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b""
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as document:
+            yield document
+
+def analyze_bytes(document_bytes, feature_types: list) -> list:
+    # The rate limiter retries throttling itself; botocore retrying each of its
+    # attempts as well would multiply them (TEXTRACT_MAX_ATTEMPTS x THROTTLE_RETRIES)
+    textract = get_textract_client(retries=rate_limiter is None)
+
+    def call():
+        if feature_types:
+            return textract.analyze_document(
                 Document={"Bytes": document_bytes},
-                FeatureTypes=["TABLES", "FORMS"]
+                FeatureTypes=feature_types
             )
+        return textract.detect_document_text(
+            Document={"Bytes": document_bytes}
+        )
+
+    if rate_limiter is None:
+        response = call()
+    else:
+        response = rate_limiter.call(
+            call,
+            max_retries=Config.TEXTRACT_THROTTLE_RETRIES,
+            base_delay=Config.TEXTRACT_THROTTLE_BASE_DELAY,
+        )
+    return response.get("Blocks", [])
+
+def iter_chunk_blocks(file_path: str, feature_types: list):
+    """
+    Extract page groups concurrently and yield each group's blocks in page order,
+    renumbered to document pages. Unfinished groups are cancelled if the caller stops early.
+    """
+    chunks = split_pdf(file_path, Config.TEXTRACT_SPLIT_PAGES_PER_CHUNK)
+    futures = [split_executor.submit(analyze_bytes, chunk, feature_types) for _, chunk in chunks]
+    try:
+        for (first_page, _), future in zip(chunks, futures):
+            blocks = future.result()
+            for block in blocks:
+                # Chunk pages are numbered from 1; shift them back to document pages
+                block["Page"] = first_page + block.get("Page", 1) - 1
+            yield blocks
+    finally:
+        for future in futures:
+            future.cancel()
+
+def analyze_in_chunks(file_path: str, feature_types: list) -> list:
+    """Extract page groups concurrently and merge their blocks in page order."""
+    blocks = []
+    for chunk_blocks in iter_chunk_blocks(file_path, feature_types):
+        blocks.extend(chunk_blocks)
+    return blocks
+
+def should_split(file_path: str, feature_types: list) -> bool:
+    """Pre-flight: multi-page PDFs are split and their page groups extracted in parallel."""
+    if not (feature_types and Config.TEXTRACT_SPLIT_ENABLED):
+        return False
+    page_count = count_pdf_pages(file_path)
+    return page_count is not None and page_count >= Config.TEXTRACT_SPLIT_MIN_PAGES
+
+def text_of(blocks: list) -> str:
+    return "\n".join(b["Text"] for b in blocks if b["BlockType"] == "LINE")
+
+def extraction_error(e: Exception) -> str:
+    """Count a failed extraction by outcome and return its error message."""
+    if isinstance(e, BotoCoreError):
+        extractions.inc(outcome="botocore_error")
+        return str(e)
+    if isinstance(e, ClientError):
+        extractions.inc(outcome="throttled" if is_throttling_error(e) else "client_error")
+        return str(e)
+    extractions.inc(outcome="unexpected_error")
+    return f"Unexpected error: {e}"
+
+def extract_document(file_path: str, document_bytes, feature_types: list, timings: dict = None) -> dict:
+    """Run Textract on a document that missed the cache and build its result."""
+    if should_split(file_path, feature_types):
+        with timed_phase(PHASE_TEXTRACT, timings):
+            blocks = analyze_in_chunks(file_path, feature_types)
+    elif len(document_bytes) > TEXTRACT_SYNC_MAX_BYTES:
+        return {
+            "error": f"Document is {len(document_bytes)} bytes; synchronous Textract "
+                     f"accepts at most {TEXTRACT_SYNC_MAX_BYTES}. Use POST /jobs instead."
+        }
+    else:
+        with timed_phase(PHASE_TEXTRACT, timings):
+            blocks = analyze_bytes(document_bytes, feature_types)
+    return {"text": text_of(blocks), "blocks": blocks}
+
+def extract_and_cache(cache_key: str, file_path: str, document_bytes, feature_types: list,
+                      timings: dict = None) -> dict:
+    """
+    Extract a document and cache a successful result.
+
+    Runs inside the single flight, so callers arriving after the flight ends
+    find the result in the cache instead of starting another extraction.
+    """
+    result = extract_document(file_path, document_bytes, feature_types, timings)
+    if "error" not in result and result_cache is not None:
+        result_cache.put(cache_key, result)
+    return result
+
+def extract_text_from_file(file_path: str, use_cache: bool = True, timings: dict = None,
+                           cache_key: str = None) -> dict:
+    """
+    Extract a document on disk, from the result cache when possible.
+
+    cache_key is the file's make_file_cache_key, for callers that have already
+    hashed it; otherwise the file is hashed here.
+    """
+    if not os.path.isfile(file_path):
+        extractions.inc(outcome="not_found")
+        return {"error": f"File not found: {file_path}"}
+    feature_types = feature_types_for(file_path)
+    try:
+        with open_document(file_path) as document_bytes:
+            if cache_key is None:
+                # Hashing touches every page of the mapping, so it is where the file is read
+                with timed_phase(PHASE_FILE_READ, timings):
+                    cache_key = make_cache_key(document_bytes, feature_types)
+            document_bytes_histogram.observe(len(document_bytes))
+            if use_cache and result_cache is not None:
+                with timed_phase(PHASE_CACHE_LOOKUP, timings):
+                    cached = result_cache.get(cache_key)
+                if cached is not None:
+                    extractions.inc(outcome="cache_hit")
+                    return cached
+            if Config.TEXTRACT_COALESCE_ENABLED:
+                result, shared = textract_flight.do(
+                    cache_key, extract_and_cache, cache_key, file_path, document_bytes, feature_types, timings
+                )
+            else:
+                result = extract_and_cache(cache_key, file_path, document_bytes, feature_types, timings)
+                shared = False
+        if shared:
+            # The caller that ran the extraction already counted and cached it
+            extractions.inc(outcome="coalesced")
+            return result
+        if "error" in result:
+            extractions.inc(outcome="too_large")
+            return result
+        block_count.observe(len(result["blocks"]))
+        extractions.inc(outcome="ok")
+        return result
+    except Exception as e:
+        return {"error": extraction_error(e)}
+
+def page_items(blocks: list, cached: bool = False):
+    for page, page_blocks in sorted(group_blocks_by_page(blocks).items()):
+        yield {"page": page, "text": text_of(page_blocks), "cached": cached}
+
+def iter_document_pages(file_path: str, use_cache: bool = True):
+    """
+    Yield {"page", "text", "cached"} for each page in order as soon as it is extracted,
+    or a single {"error"} item. Split PDFs stream page group by page group; other
+    documents are extracted whole first. Results are cached like extract_text_from_file.
+    """
+    feature_types = feature_types_for(file_path)
+    if not should_split(file_path, feature_types):
+        result = extract_text_from_file(file_path, use_cache=use_cache)
+        if "error" in result:
+            yield result
         else:
-            response = textract.detect_document_text(
-                Document={"Bytes": document_bytes}
-            )
-        blocks = response.get("Blocks", [])
-        lines = [b["Text"] for b in blocks if b["BlockType"] == "LINE"]
-        text = "\n".join(lines)
-        return {"text": text, "blocks": blocks}
-    except (BotoCoreError, ClientError) as e:
-        return {"error": str(e)}
+            yield from page_items(result["blocks"])
+        return
+    cache_key = make_file_cache_key(file_path, feature_types)
+    if use_cache and result_cache is not None:
+        cached = result_cache.get(cache_key)
+        if cached is not None:
+            extractions.inc(outcome="cache_hit")
+            yield from page_items(cached["blocks"], cached=True)
+            return
+    blocks = []
+    try:
+        with timed_phase(PHASE_TEXTRACT):
+            for chunk_blocks in iter_chunk_blocks(file_path, feature_types):
+                blocks.extend(chunk_blocks)
+                yield from page_items(chunk_blocks)
     except Exception as e:
-        return {"error": f"Unexpected error: {e}"}
+        yield {"error": extraction_error(e)}
+        return
+    block_count.observe(len(blocks))
+    extractions.inc(outcome="ok")
+    if result_cache is not None:
+        result_cache.put(cache_key, {"text": text_of(blocks), "blocks": blocks})
 
-@app.post("/extract-text")
-async def extract_text(request: FilePathRequest):
-    result = extract_text_from_file(request.file_path)
+async def spool_upload(chunks, suffix: str) -> str:
+    """
+    Stream an upload into a spool file, enforcing the upload size limit.
+
+    Returns:
+        Path of the spool file; the caller removes it when done
+    """
+    fd, spool_path = tempfile.mkstemp(suffix=suffix, dir=Config.TEXTRACT_SPOOL_DIR or None)
+    size = 0
+    try:
+        with os.fdopen(fd, "wb") as spool:
+            async for chunk in chunks:
+                size += len(chunk)
+                if size > Config.TEXTRACT_MAX_UPLOAD_BYTES:
+                    raise upload_too_large()
+                spool.write(chunk)
+    except BaseException:
+        os.remove(spool_path)
+        raise
+    return spool_path
+
+def upload_too_large() -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=f"Upload exceeds {Config.TEXTRACT_MAX_UPLOAD_BYTES} bytes",
+    )
+
+def limit_request_body(request: Request, max_bytes: int) -> Request:
+    """
+    Reject request with 413 once its body passes max_bytes, checking the declared
+    Content-Length first and then the bytes actually received. Returns a view of
+    the request to read the body from, so multipart parsing stops at the limit
+    instead of buffering the whole upload first.
+    """
+    content_length = request.headers.get("content-length")
+    if content_length:
+        try:
+            declared = int(content_length)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid Content-Length header")
+        if declared > max_bytes:
+            raise upload_too_large()
+    received = 0
+
+    async def receive():
+        nonlocal received
+        message = await request.receive()
+        if message["type"] == "http.request":
+            received += len(message.get("body", b""))
+            if received > max_bytes:
+                raise upload_too_large()
+        return message
+
+    return Request(request.scope, receive)
+
+async def read_upload_file(upload: UploadFile):
+    while True:
+        chunk = await upload.read(UPLOAD_CHUNK_BYTES)
+        if not chunk:
+            return
+        yield chunk
+
+async def extract_batch_item(index: int, file_path: str, label: str, use_cache: bool,
+                             options: OutputOptions, semaphore: asyncio.Semaphore) -> dict:
+    async with semaphore:
+        try:
+            result = await extraction_pool.run(extract_text_from_file, file_path, use_cache=use_cache)
+            status_code = 400 if "error" in result else 200
+        except PoolFullError as e:
+            extractions.inc(outcome="pool_full")
+            result, status_code = {"error": str(e)}, 503
+    result = shape_result(result, options)
+    return {"index": index, "file_path": label, "status_code": status_code, **result}
+
+class SpooledStreamingResponse(StreamingResponse):
+    """
+    Streaming response that removes its spooled uploads once it ends.
+
+    Removal lives here rather than in the body generator, whose cleanup never
+    runs if the client disconnects before the body is first iterated.
+    """
+
+    def __init__(self, content, spool_paths: list, **kwargs):
+        super().__init__(content, **kwargs)
+        self.spool_paths = spool_paths
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            for spool_path in self.spool_paths:
+                os.remove(spool_path)
+
+def batch_response(items: list, use_cache: bool, options: OutputOptions,
+                   spool_paths: list = ()) -> StreamingResponse:
+    """
+    Extract (label, path) items concurrently and stream one NDJSON line per item
+    as it finishes. Failures are reported on the item's line, not for the batch.
+    """
+    semaphore = asyncio.Semaphore(Config.TEXTRACT_BATCH_CONCURRENCY)
+
+    async def results():
+        tasks = [
+            asyncio.ensure_future(
+                extract_batch_item(index, path, label, use_cache, options, semaphore)
+            )
+            for index, (label, path) in enumerate(items)
+        ]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                yield encode_json(await finished) + b"\n"
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    return SpooledStreamingResponse(results(), spool_paths, media_type="application/x-ndjson")
+
+def check_batch_size(count: int) -> None:
+    if count == 0:
+        raise HTTPException(status_code=400, detail="Batch is empty")
+    if count > Config.TEXTRACT_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch has {count} items; the limit is {Config.TEXTRACT_BATCH_MAX_ITEMS}",
+        )
+
+def run_job(job: TextractJob, use_cache: bool = True) -> dict:
+    cache_key = make_file_cache_key(job.file_path, job.feature_types)
+    if use_cache and result_cache is not None:
+        cached = result_cache.get(cache_key)
+        if cached is not None:
+            for page, blocks in sorted(group_blocks_by_page(cached["blocks"]).items()):
+                job.add_page(page, blocks)
+            job.total_pages = len(job.pages)
+            job.set_status(JOB_SUCCEEDED)
+            return cached
+    result = run_textract_job(
+        job,
+        get_textract_client(),
+        get_s3_client(),
+        bucket=Config.TEXTRACT_S3_BUCKET,
+        prefix=Config.TEXTRACT_S3_PREFIX,
+        poll_interval=Config.TEXTRACT_JOB_POLL_SECONDS,
+        timeout=Config.TEXTRACT_JOB_TIMEOUT_SECONDS,
+    )
+    if "error" not in result and result_cache is not None:
+        result_cache.put(cache_key, result)
+    return result
+
+def get_job_or_404(job_id: str) -> TextractJob:
+    job = job_table.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    return job
+
+async def extraction_response(http_request: Request, file_path: str, use_cache: bool,
+                              options: OutputOptions) -> FastJSONResponse:
+    timings = http_request.state.timings
+    try:
+        result = await extraction_pool.run(
+            extract_text_from_file, file_path, use_cache=use_cache, timings=timings
+        )
+    except PoolFullError as e:
+        extractions.inc(outcome="pool_full")
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
     if "error" in result:
         raise HTTPException(status_code=400, detail=result["error"])
-    return JSONResponse(content=result) 
\ No newline at end of file
+    with timed_phase(PHASE_SERIALIZATION, timings):
+        return FastJSONResponse(content=shape_result(result, options))
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """Record latency and in-flight requests, and add Server-Timing headers when asked."""
+    request.state.timings = {}
+    requests_in_flight.inc()
+    start = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+    finally:
+        elapsed = time.perf_counter() - start
+        requests_in_flight.dec()
+        route = request.scope.get("route")
+        request_latency.observe(
+            elapsed,
+            route=route.path if route is not None else "unmatched",
+            method=request.method,
+            status=str(status_code),
+        )
+    if Config.TEXTRACT_TIMING_HEADERS or request.headers.get("x-timing") == "1":
+        timings = {**request.state.timings, "total": elapsed}
+        response.headers["Server-Timing"] = server_timing_header(timings)
+    return response
+
+@app.post("/extract-text")
+async def extract_text(request: FilePathRequest, http_request: Request):
+    return await extraction_response(http_request, request.file_path, request.use_cache, request)
+
+@app.post("/extract-text/upload")
+async def extract_text_upload(request: Request, filename: str = "", use_cache: bool = True,
+                              options: OutputOptions = Depends()):
+    """Extract text from a document sent as the raw body or as a multipart "file" field."""
+    multipart = request.headers.get("content-type", "").startswith("multipart/form-data")
+    body = limit_request_body(
+        request,
+        Config.TEXTRACT_MAX_UPLOAD_BYTES + (MULTIPART_OVERHEAD_BYTES if multipart else 0),
+    )
+    if multipart:
+        form = await body.form(max_files=1)
+        upload = form.get("file")
+        if not isinstance(upload, UploadFile):
+            raise HTTPException(status_code=400, detail='Multipart upload needs a "file" field')
+        filename = filename or upload.filename or ""
+        chunks = read_upload_file(upload)
+    else:
+        chunks = body.stream()
+    _, suffix = os.path.splitext(filename)
+    try:
+        spool_path = await spool_upload(chunks, suffix.lower())
+    finally:
+        # Drops the parsed form's temporary files
+        await body.close()
+    try:
+        return await extraction_response(request, spool_path, use_cache, options)
+    finally:
+        os.remove(spool_path)
+
+@app.post("/extract-text/stream")
+async def stream_extracted_pages(request: StreamRequest):
+    """Stream {"page", "text", "cached"} NDJSON lines in page order as pages are extracted."""
+    pages = iter_document_pages(request.file_path, use_cache=request.use_cache)
+    # Run the first step before responding, so errors still get a proper status code
+    try:
+        first = await extraction_pool.run(next, pages, None)
+    except PoolFullError as e:
+        extractions.inc(outcome="pool_full")
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    if first is not None and "error" in first:
+        raise HTTPException(status_code=400, detail=first["error"])
+
+    async def lines():
+        page = first
+        step = None
+        try:
+            while page is not None:
+                yield encode_json(page) + b"\n"
+                try:
+                    step = extraction_pool.submit(next, pages, None)
+                except PoolFullError as e:
+                    extractions.inc(outcome="pool_full")
+                    yield encode_json({"error": str(e)}) + b"\n"
+                    return
+                page = await asyncio.wrap_future(step)
+        finally:
+            if step is None or step.done():
+                pages.close()
+            else:
+                # The client went away mid-page; a worker may be inside next(pages), and closing
+                # a running generator raises, so close it on that worker once the page is done
+                extraction_pool.cancel(step)
+                step.add_done_callback(lambda _: pages.close())
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+@app.post("/extract-text/batch")
+async def extract_text_batch(request: BatchRequest):
+    check_batch_size(len(request.file_paths))
+    items = [(path, path) for path in request.file_paths]
+    return batch_response(items, use_cache=request.use_cache, options=request)
+
+@app.post("/extract-text/batch/upload")
+async def extract_text_batch_upload(request: Request, use_cache: bool = True,
+                                    options: OutputOptions = Depends()):
+    """Batch variant of /extract-text/upload taking repeated multipart "files" fields."""
+    max_files = Config.TEXTRACT_BATCH_MAX_ITEMS + 1
+    body = limit_request_body(request, max_files * (Config.TEXTRACT_MAX_UPLOAD_BYTES + MULTIPART_OVERHEAD_BYTES))
+    form = await body.form(max_files=max_files)
+    uploads = [f for f in form.getlist("files") if isinstance(f, UploadFile)]
+    check_batch_size(len(uploads))
+    items = []
+    try:
+        for upload in uploads:
+            _, suffix = os.path.splitext(upload.filename or "")
+            spool_path = await spool_upload(read_upload_file(upload), suffix.lower())
+            items.append((upload.filename or "", spool_path))
+    except BaseException:
+        for _, spool_path in items:
+            os.remove(spool_path)
+        raise
+    finally:
+        await body.close()
+    return batch_response(
+        items,
+        use_cache=use_cache,
+        options=options,
+        spool_paths=[path for _, path in items],
+    )
+
+@app.get("/cache/stats")
+async def cache_stats():
+    if result_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **result_cache.stats()}
+
+@app.delete("/cache")
+async def clear_cache():
+    if result_cache is None:
+        raise HTTPException(status_code=404, detail="Result cache is disabled")
+    result_cache.clear()
+    return {"cleared": True}
+
+def collect_runtime_stats() -> list:
+    """Expose pool and cache statistics as metrics at scrape time."""
+    pools = {"extraction": extraction_pool.stats(), "job": job_pool.stats()}
+    lines = snapshot_lines(
+        "textract_pool_queue_depth", "Work waiting for a pool worker.", "gauge",
+        {name: stats["queue_depth"] for name, stats in pools.items()}, label="pool",
+    )
+    lines += snapshot_lines(
+        "textract_pool_running", "Work currently running on a pool worker.", "gauge",
+        {name: stats["running"] for name, stats in pools.items()}, label="pool",
+    )
+    lines += snapshot_lines(
+        "textract_pool_rejected_total", "Work rejected because the pool was full.", "counter",
+        {name: stats["rejected"] for name, stats in pools.items()}, label="pool",
+    )
+    lines += snapshot_lines(
+        "textract_jobs", "Asynchronous jobs in the job table.", "gauge", {"": len(job_table)},
+    )
+    if result_cache is not None:
+        cache = result_cache.stats()
+        for key in ("hits", "misses", "evictions"):
+            lines += snapshot_lines(
+                f"textract_cache_{key}_total", f"Result cache {key}.", "counter", {"": cache[key]},
+            )
+        lines += snapshot_lines("textract_cache_entries", "Result cache entries.", "gauge", {"": cache["entries"]})
+        lines += snapshot_lines("textract_cache_bytes", "Result cache size on disk.", "gauge", {"": cache["bytes"]})
+    flight = textract_flight.stats()
+    lines += snapshot_lines(
+        "textract_coalesced_calls_total", "Extractions that shared another request's Textract call.",
+        "counter", {"": flight["shared"]},
+    )
+    if rate_limiter is not None:
+        limiter = rate_limiter.stats()
+        lines += snapshot_lines(
+            "textract_rate_limit", "Current client-side Textract request rate limit per second.",
+            "gauge", {"": limiter["rate"]},
+        )
+        lines += snapshot_lines(
+            "textract_throttled_total", "Textract calls throttled by AWS.", "counter", {"": limiter["throttled"]},
+        )
+        lines += snapshot_lines(
+            "textract_rate_limit_wait_seconds_total", "Time spent waiting for the client-side rate limiter.",
+            "counter", {"": limiter["wait_seconds"]},
+        )
+    return lines
+
+metrics.add_collector(collect_runtime_stats)
+
+@app.get("/metrics")
+async def prometheus_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/pool/stats")
+async def pool_stats():
+    return {
+        **extraction_pool.stats(),
+        "coalescing": textract_flight.stats(),
+        "rate_limiter": rate_limiter.stats() if rate_limiter is not None else None,
+    }
+
+@app.post("/jobs", status_code=202)
+async def create_job(request: FilePathRequest):
+    if not Config.TEXTRACT_S3_BUCKET:
+        raise HTTPException(status_code=503, detail="TEXTRACT_S3_BUCKET is not configured")
+    if not os.path.isfile(request.file_path):
+        raise HTTPException(status_code=400, detail=f"File not found: {request.file_path}")
+    job = TextractJob(request.file_path, feature_types_for(request.file_path))
+    job_table.add(job)
+    try:
+        job_pool.submit(run_job, job, use_cache=request.use_cache)
+    except PoolFullError as e:
+        job_table.remove(job.id)
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    return {"job_id": job.id, "status": job.status}
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str, include_blocks: bool = False):
+    job = get_job_or_404(job_id)
+    response = job.to_dict(include_blocks=include_blocks)
+    if job.status == JOB_SUCCEEDED:
+        response["text"] = job.result()["text"]
+    return response
+
+@app.get("/jobs/{job_id}/pages")
+async def stream_job_pages(job_id: str):
+    """Stream completed pages as NDJSON, one line per page, until the job finishes."""
+    job = get_job_or_404(job_id)
+
+    async def pages():
+        last_page = 0
+        while True:
+            # Read the state before the pages so no page finished in between is missed
+            finished = job.finished
+            for page in job.completed_pages(after=last_page):
+                last_page = page["page"]
+                yield encode_json(page) + b"\n"
+            if finished:
+                if job.status == JOB_FAILED:
+                    yield encode_json({"error": job.error}) + b"\n"
+                return
+            await asyncio.sleep(JOB_STREAM_POLL_SECONDS)
+
+    return StreamingResponse(pages(), media_type="application/x-ndjson")
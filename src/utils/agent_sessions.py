@@ -0,0 +1,152 @@
+"""
+Session bookkeeping for the multi-session agent server.
+Tracks the turns running on each agent thread, caps how many run at once per
+session and across the server, and forgets sessions once they go idle (their
+conversation stays in the checkpointer).
+"""
+
+import asyncio
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+class SessionBusyError(Exception):
+    """Raised when a session already has as many turns running as it is allowed."""
+
+
+class AgentSession:
+    """One conversation thread of one agent."""
+
+    def __init__(self, agent_name: str, thread_id: str):
+        self.agent_name = agent_name
+        self.thread_id = thread_id
+        self.in_flight = 0
+        self.turns = 0
+        self.created_at = time.time()
+        self.last_used = time.monotonic()
+
+    @property
+    def checkpoint_thread_id(self) -> str:
+        """Thread id in the shared checkpointer, namespaced so agents' threads never collide."""
+        return f"{self.agent_name}:{self.thread_id}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "agent": self.agent_name,
+            "thread_id": self.thread_id,
+            "in_flight": self.in_flight,
+            "turns": self.turns,
+            "created_at": self.created_at,
+        }
+
+
+class SessionRegistry:
+    """Live sessions keyed by (agent, thread id), with per-session and server-wide turn limits."""
+
+    def __init__(self, max_turns_per_session: int = 1, max_concurrent_turns: int = 0,
+                 idle_seconds: float = 1800, on_forget: Optional[Callable[[AgentSession], None]] = None):
+        """
+        Args:
+            max_turns_per_session: Turns a session may run at once; more are rejected
+            max_concurrent_turns: Turns running at once across all sessions; more wait (0 = no limit)
+            idle_seconds: Sessions without a turn for this long are forgotten
+            on_forget: Called with each session forgotten or evicted, to drop per-thread state kept elsewhere
+        """
+        self.on_forget = on_forget
+        self.max_turns_per_session = max_turns_per_session
+        self.max_concurrent_turns = max_concurrent_turns
+        self.idle_seconds = idle_seconds
+        self._sessions: Dict[Tuple[str, str], AgentSession] = {}
+        self._slots = asyncio.Semaphore(max_concurrent_turns) if max_concurrent_turns > 0 else None
+        self.running = 0
+        self.waiting = 0
+        self.completed = 0
+        self.rejected = 0
+        self.evicted = 0
+
+    def get(self, agent_name: str, thread_id: str) -> Optional[AgentSession]:
+        return self._sessions.get((agent_name, thread_id))
+
+    def check_available(self, agent_name: str, thread_id: str) -> None:
+        """
+        Raise SessionBusyError if a turn couldn't start on the session now, without claiming one.
+        """
+        session = self._sessions.get((agent_name, thread_id))
+        if session is not None and session.in_flight >= self.max_turns_per_session:
+            self.rejected += 1
+            raise SessionBusyError(
+                f"Session {thread_id} of {agent_name} already has {session.in_flight} turn(s) running"
+            )
+
+    def start_turn(self, agent_name: str, thread_id: str) -> AgentSession:
+        """
+        Claim a turn on a session, creating it if needed. Pair with end_turn.
+
+        Raises:
+            SessionBusyError: If the session already runs max_turns_per_session turns
+        """
+        self.evict_idle()
+        key = (agent_name, thread_id)
+        session = self._sessions.get(key)
+        if session is None:
+            session = self._sessions[key] = AgentSession(agent_name, thread_id)
+        if session.in_flight >= self.max_turns_per_session:
+            self.rejected += 1
+            raise SessionBusyError(
+                f"Session {thread_id} of {agent_name} already has {session.in_flight} turn(s) running"
+            )
+        session.in_flight += 1
+        session.last_used = time.monotonic()
+        return session
+
+    def end_turn(self, session: AgentSession) -> None:
+        session.in_flight -= 1
+        session.turns += 1
+        session.last_used = time.monotonic()
+        self.completed += 1
+
+    async def acquire_slot(self) -> None:
+        """Wait for a server-wide turn slot. Pair with release_slot."""
+        self.waiting += 1
+        try:
+            if self._slots is not None:
+                await self._slots.acquire()
+        finally:
+            self.waiting -= 1
+        self.running += 1
+
+    def release_slot(self) -> None:
+        self.running -= 1
+        if self._slots is not None:
+            self._slots.release()
+
+    def _forgotten(self, session: AgentSession) -> None:
+        if self.on_forget is not None:
+            self.on_forget(session)
+
+    def forget(self, agent_name: str, thread_id: str) -> None:
+        session = self._sessions.pop((agent_name, thread_id), None)
+        if session is not None:
+            self._forgotten(session)
+
+    def evict_idle(self) -> int:
+        """Forget sessions idle past idle_seconds; returns how many were forgotten."""
+        cutoff = time.monotonic() - self.idle_seconds
+        idle = [key for key, s in self._sessions.items() if s.in_flight == 0 and s.last_used < cutoff]
+        for key in idle:
+            self._forgotten(self._sessions.pop(key))
+        self.evicted += len(idle)
+        return len(idle)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "sessions": len(self._sessions),
+            "active_sessions": sum(1 for s in self._sessions.values() if s.in_flight),
+            "running_turns": self.running,
+            "waiting_turns": self.waiting,
+            "completed_turns": self.completed,
+            "rejected_turns": self.rejected,
+            "evicted_sessions": self.evicted,
+            "max_turns_per_session": self.max_turns_per_session,
+            "max_concurrent_turns": self.max_concurrent_turns,
+        }
@@ -0,0 +1,129 @@
+"""
+Streaming agent turns for the interactive agents.
+Runs a LangGraph agent turn with astream, yielding model tokens and
+tool-call progress as they arrive (rendered to the terminal by stream_turn,
+sent to clients by the agent server), and measures time to first token and
+total turn latency.
+"""
+
+import asyncio
+import time
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+from langchain_core.messages import AIMessageChunk, ToolMessage
+
+# Node of create_react_agent graphs that calls the model for the answer
+AGENT_NODE = "agent"
+
+
+async def read_input(prompt: str) -> str:
+    """Read a line from the terminal in a worker thread, so the event loop keeps running."""
+    return await asyncio.to_thread(input, prompt)
+
+
+def chunk_text(chunk: AIMessageChunk) -> str:
+    """Text of a model chunk, whose content may be a string or a list of content parts."""
+    if isinstance(chunk.content, str):
+        return chunk.content
+    return "".join(
+        part if isinstance(part, str) else part.get("text", "")
+        for part in chunk.content
+        if isinstance(part, str) or part.get("type") == "text"
+    )
+
+
+class TurnStats:
+    """Timings of one agent turn."""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.first_token_seconds: Optional[float] = None
+        self.total_seconds: Optional[float] = None
+        self.tool_calls = 0
+        # Input tokens of the turn's last model call, when the model reports usage
+        self.prompt_tokens: Optional[int] = None
+        self.text = ""
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.start
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "first_token_seconds": self.first_token_seconds,
+            "total_seconds": self.total_seconds,
+            "tool_calls": self.tool_calls,
+            "prompt_tokens": self.prompt_tokens,
+        }
+
+    def format(self) -> str:
+        first = f"{self.first_token_seconds:.2f}s" if self.first_token_seconds is not None else "n/a"
+        calls = f", {self.tool_calls} tool call{'s' if self.tool_calls != 1 else ''}" if self.tool_calls else ""
+        prompt = f", {self.prompt_tokens} prompt tokens" if self.prompt_tokens is not None else ""
+        return f"⏱️  first token {first}, turn {self.total_seconds:.2f}s{calls}{prompt}"
+
+
+async def turn_events(agent: Any, inputs: Dict[str, Any], config: Dict[str, Any],
+                      stats: TurnStats) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Run one agent turn, yielding its output as events while updating stats.
+
+    Events are {"type": "token", "text"}, {"type": "tool_call", "name"} when the model
+    calls a tool and {"type": "tool_result", "name", "status"} when the tool returns.
+    """
+    announced = set()
+    pieces = []
+    async for chunk, metadata in agent.astream(inputs, config=config, stream_mode="messages"):
+        # Other nodes' model calls (e.g. the memory summary in pre_model_hook) aren't the answer
+        if isinstance(chunk, AIMessageChunk) and metadata.get("langgraph_node") == AGENT_NODE:
+            if chunk.usage_metadata:
+                stats.prompt_tokens = chunk.usage_metadata.get("input_tokens")
+            for call in chunk.tool_call_chunks:
+                # Arguments arrive in pieces; the first chunk of each call carries its name
+                if call.get("name") and call.get("id") not in announced:
+                    announced.add(call.get("id"))
+                    stats.tool_calls += 1
+                    yield {"type": "tool_call", "name": call["name"]}
+            text = chunk_text(chunk)
+            if text:
+                if stats.first_token_seconds is None:
+                    stats.first_token_seconds = stats.elapsed()
+                pieces.append(text)
+                stats.text = "".join(pieces)
+                yield {"type": "token", "text": text}
+        elif isinstance(chunk, ToolMessage):
+            yield {"type": "tool_result", "name": chunk.name or "tool", "status": chunk.status}
+    stats.text = "".join(pieces)
+    stats.total_seconds = stats.elapsed()
+
+
+async def stream_turn(agent: Any, inputs: Dict[str, Any], config: Dict[str, Any],
+                      write: Callable[[str], None]) -> TurnStats:
+    """
+    Run one agent turn, writing the answer token by token and a line per tool call.
+
+    Args:
+        agent: Compiled LangGraph agent (e.g. from create_react_agent)
+        inputs: Graph input, usually {"messages": [...]}
+        config: Run config carrying the thread id
+        write: Called with each piece of output as it arrives
+
+    Returns:
+        The turn's timings; its text is the model output of the turn
+    """
+    stats = TurnStats()
+    at_line_start = True
+    async for event in turn_events(agent, inputs, config, stats):
+        if event["type"] == "token":
+            write(event["text"])
+            at_line_start = event["text"].endswith("\n")
+            continue
+        if event["type"] == "tool_call":
+            line = f"🔧 Calling {event['name']}...\n"
+        else:
+            mark = "❌" if event["status"] == "error" else "✅"
+            line = f"{mark} {event['name']} finished\n"
+        write(("" if at_line_start else "\n") + line)
+        at_line_start = True
+    if not at_line_start:
+        write("\n")
+    return stats
@@ -0,0 +1,326 @@
+"""
+Durable SQLite storage for agent checkpoints.
+Checkpoints are stored without their channel values; each channel value is
+stored once per version as a compressed blob, so state that doesn't change
+between checkpoints isn't written again. Old checkpoints beyond a per-thread
+limit and threads idle past a TTL are pruned along with their blobs and writes.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Serialized values at least this large are zlib-compressed
+COMPRESS_MIN_BYTES = 256
+COMPRESSED_SUFFIX = "+zlib"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    parent_checkpoint_id TEXT,
+    type TEXT NOT NULL,
+    checkpoint BLOB NOT NULL,
+    metadata_type TEXT NOT NULL,
+    metadata BLOB NOT NULL,
+    channel_versions TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+);
+CREATE TABLE IF NOT EXISTS blobs (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    channel TEXT NOT NULL,
+    version TEXT NOT NULL,
+    type TEXT NOT NULL,
+    blob BLOB,
+    PRIMARY KEY (thread_id, checkpoint_ns, channel, version)
+);
+CREATE TABLE IF NOT EXISTS writes (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    task_path TEXT NOT NULL DEFAULT '',
+    idx INTEGER NOT NULL,
+    channel TEXT NOT NULL,
+    type TEXT NOT NULL,
+    blob BLOB NOT NULL,
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+);
+CREATE TABLE IF NOT EXISTS threads (
+    thread_id TEXT PRIMARY KEY,
+    updated_at REAL NOT NULL
+);
+"""
+
+
+def pack(typed: Tuple[str, bytes]) -> Tuple[str, bytes]:
+    """Compress a (type, bytes) serialized value when that makes it smaller."""
+    type_, data = typed
+    if len(data) >= COMPRESS_MIN_BYTES:
+        compressed = zlib.compress(data, 6)
+        if len(compressed) < len(data):
+            return type_ + COMPRESSED_SUFFIX, compressed
+    return type_, data
+
+
+def unpack(type_: str, data: bytes) -> Tuple[str, bytes]:
+    if type_.endswith(COMPRESSED_SUFFIX):
+        return type_[:-len(COMPRESSED_SUFFIX)], zlib.decompress(data)
+    return type_, data
+
+
+class CheckpointStore:
+    """SQLite checkpoint tables shared by every thread, safe to use from several threads."""
+
+    def __init__(self, path: str, serde: Any, keep_last: int = 20, ttl_seconds: float = 0,
+                 prune_every: int = 100):
+        """
+        Args:
+            path: SQLite database file (":memory:" for a throwaway store)
+            serde: Serializer with dumps_typed(obj) -> (type, bytes) and loads_typed((type, bytes))
+            keep_last: Checkpoints kept per thread and namespace (0 keeps all)
+            ttl_seconds: Threads idle longer than this are deleted (0 keeps them forever)
+            prune_every: Checkpoints written between automatic prunes
+        """
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.serde = serde
+        self.keep_last = keep_last
+        self.ttl_seconds = ttl_seconds
+        self.prune_every = prune_every
+        self._puts_since_prune = 0
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self.blobs_written = 0
+        self.blobs_reused = 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def dumps(self, value: Any) -> Tuple[str, bytes]:
+        return pack(self.serde.dumps_typed(value))
+
+    def loads(self, type_: str, data: bytes) -> Any:
+        return self.serde.loads_typed(unpack(type_, data))
+
+    def put(self, thread_id: str, checkpoint_ns: str, checkpoint: Dict[str, Any],
+            metadata: Dict[str, Any], parent_checkpoint_id: Optional[str],
+            new_versions: Dict[str, Any]) -> None:
+        """
+        Store a checkpoint. Only channels in new_versions have their values written;
+        the others already have a blob for their current version.
+        """
+        checkpoint = dict(checkpoint)
+        values = checkpoint.pop("channel_values", {})
+        blob_rows = []
+        for channel, version in new_versions.items():
+            if channel in values:
+                type_, data = self.dumps(values[channel])
+            else:
+                type_, data = "empty", None
+            blob_rows.append((thread_id, checkpoint_ns, channel, str(version), type_, data))
+        type_, data = self.dumps(checkpoint)
+        metadata_type, metadata_data = self.dumps(metadata)
+        versions = json.dumps({k: str(v) for k, v in checkpoint.get("channel_versions", {}).items()})
+        now = time.time()
+        with self._lock:
+            with self._conn:
+                self._conn.execute("BEGIN")
+                self._conn.executemany("INSERT OR REPLACE INTO blobs VALUES (?, ?, ?, ?, ?, ?)", blob_rows)
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (thread_id, checkpoint_ns, checkpoint["id"], parent_checkpoint_id, type_, data,
+                     metadata_type, metadata_data, versions, now),
+                )
+                self._conn.execute("INSERT OR REPLACE INTO threads VALUES (?, ?)", (thread_id, now))
+            self.blobs_written += len(blob_rows)
+            self.blobs_reused += len(values) - sum(1 for c in new_versions if c in values)
+            self._puts_since_prune += 1
+            if self.prune_every and self._puts_since_prune >= self.prune_every:
+                self.prune()
+
+    def put_writes(self, thread_id: str, checkpoint_ns: str, checkpoint_id: str, task_id: str,
+                   task_path: str, writes: Sequence[Tuple[int, str, Any]]) -> None:
+        """
+        Store pending writes as (idx, channel, value). Writes with a negative idx (errors,
+        interrupts) replace earlier ones; the others are kept from their first write.
+        """
+        rows = []
+        for idx, channel, value in writes:
+            type_, data = self.dumps(value)
+            rows.append((thread_id, checkpoint_ns, checkpoint_id, task_id, task_path, idx, channel, type_, data))
+        with self._lock:
+            with self._conn:
+                self._conn.execute("BEGIN")
+                for row in rows:
+                    verb = "INSERT OR REPLACE" if row[5] < 0 else "INSERT OR IGNORE"
+                    self._conn.execute(f"{verb} INTO writes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", row)
+
+    def _record(self, row: tuple) -> Dict[str, Any]:
+        thread_id, checkpoint_ns, checkpoint_id, parent_id, type_, data, metadata_type, metadata_data, _, _ = row
+        checkpoint = self.loads(type_, data)
+        versions = checkpoint.get("channel_versions", {})
+        blobs = self._conn.execute(
+            "SELECT channel, version, type, blob FROM blobs WHERE thread_id = ? AND checkpoint_ns = ?"
+            f" AND ({' OR '.join(['(channel = ? AND version = ?)'] * len(versions)) or '0'})",
+            [thread_id, checkpoint_ns] + [x for k, v in versions.items() for x in (k, str(v))],
+        ).fetchall()
+        checkpoint["channel_values"] = {
+            channel: self.loads(blob_type, blob) for channel, _, blob_type, blob in blobs if blob_type != "empty"
+        }
+        writes = self._conn.execute(
+            "SELECT task_id, channel, type, blob FROM writes"
+            " WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?"
+            " ORDER BY task_path, task_id, idx",
+            (thread_id, checkpoint_ns, checkpoint_id),
+        ).fetchall()
+        return {
+            "thread_id": thread_id,
+            "checkpoint_ns": checkpoint_ns,
+            "checkpoint_id": checkpoint_id,
+            "parent_checkpoint_id": parent_id,
+            "checkpoint": checkpoint,
+            "metadata": self.loads(metadata_type, metadata_data),
+            "pending_writes": [(task_id, channel, self.loads(t, b)) for task_id, channel, t, b in writes],
+        }
+
+    def get(self, thread_id: str, checkpoint_ns: str = "",
+            checkpoint_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """The checkpoint checkpoint_id of a thread, or its latest one; None if there is none."""
+        with self._lock:
+            if checkpoint_id:
+                row = self._conn.execute(
+                    "SELECT * FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+                    (thread_id, checkpoint_ns, checkpoint_id),
+                ).fetchone()
+            else:
+                row = self._conn.execute(
+                    "SELECT * FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ?"
+                    " ORDER BY checkpoint_id DESC LIMIT 1",
+                    (thread_id, checkpoint_ns),
+                ).fetchone()
+            return self._record(row) if row else None
+
+    def list(self, thread_id: Optional[str] = None, checkpoint_ns: Optional[str] = None,
+             before: Optional[str] = None, limit: Optional[int] = None,
+             metadata_filter: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+        """Checkpoints newest first, optionally of one thread/namespace, older than before and matching filter."""
+        clauses, params = [], []
+        for column, value in (("thread_id", thread_id), ("checkpoint_ns", checkpoint_ns)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if before:
+            clauses.append("checkpoint_id < ?")
+            params.append(before)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT * FROM checkpoints {where} ORDER BY checkpoint_id DESC", params
+            ).fetchall()
+        returned = 0
+        for row in rows:
+            if limit is not None and returned >= limit:
+                return
+            with self._lock:
+                record = self._record(row)
+            if metadata_filter and any(record["metadata"].get(k) != v for k, v in metadata_filter.items()):
+                continue
+            returned += 1
+            yield record
+
+    def threads(self) -> List[str]:
+        """Thread ids with stored checkpoints, most recently updated first."""
+        with self._lock:
+            return [r[0] for r in self._conn.execute("SELECT thread_id FROM threads ORDER BY updated_at DESC")]
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self._lock:
+            with self._conn:
+                self._conn.execute("BEGIN")
+                for table in ("checkpoints", "blobs", "writes", "threads"):
+                    self._conn.execute(f"DELETE FROM {table} WHERE thread_id = ?", (thread_id,))
+
+    def prune(self) -> Dict[str, int]:
+        """
+        Delete idle threads past the TTL and checkpoints beyond keep_last per thread,
+        with the writes and blobs only they referenced.
+
+        Returns:
+            Counts of threads, checkpoints and blobs deleted
+        """
+        deleted = {"threads": 0, "checkpoints": 0, "blobs": 0}
+        with self._lock:
+            self._puts_since_prune = 0
+            if self.ttl_seconds > 0:
+                expired = [r[0] for r in self._conn.execute(
+                    "SELECT thread_id FROM threads WHERE updated_at < ?", (time.time() - self.ttl_seconds,)
+                )]
+                for thread_id in expired:
+                    self.delete_thread(thread_id)
+                deleted["threads"] = len(expired)
+            if self.keep_last <= 0:
+                return deleted
+            groups = self._conn.execute(
+                "SELECT thread_id, checkpoint_ns FROM checkpoints GROUP BY thread_id, checkpoint_ns"
+                " HAVING COUNT(*) > ?", (self.keep_last,)
+            ).fetchall()
+            with self._conn:
+                self._conn.execute("BEGIN")
+                for thread_id, checkpoint_ns in groups:
+                    deleted["checkpoints"] += self._prune_group(thread_id, checkpoint_ns, deleted)
+        return deleted
+
+    def _prune_group(self, thread_id: str, checkpoint_ns: str, deleted: Dict[str, int]) -> int:
+        rows = self._conn.execute(
+            "SELECT checkpoint_id, channel_versions FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ?"
+            " ORDER BY checkpoint_id DESC", (thread_id, checkpoint_ns),
+        ).fetchall()
+        kept, dropped = rows[:self.keep_last], rows[self.keep_last:]
+        referenced = {(c, v) for _, versions in kept for c, v in json.loads(versions).items()}
+        for checkpoint_id, _ in dropped:
+            for table in ("checkpoints", "writes"):
+                self._conn.execute(
+                    f"DELETE FROM {table} WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+                    (thread_id, checkpoint_ns, checkpoint_id),
+                )
+        blobs = self._conn.execute(
+            "SELECT channel, version FROM blobs WHERE thread_id = ? AND checkpoint_ns = ?",
+            (thread_id, checkpoint_ns),
+        ).fetchall()
+        stale = [(thread_id, checkpoint_ns, c, v) for c, v in blobs if (c, v) not in referenced]
+        self._conn.executemany(
+            "DELETE FROM blobs WHERE thread_id = ? AND checkpoint_ns = ? AND channel = ? AND version = ?", stale
+        )
+        deleted["blobs"] += len(stale)
+        return len(dropped)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = {
+                table: self._conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ("threads", "checkpoints", "blobs", "writes")
+            }
+            stored_bytes = self._conn.execute(
+                "SELECT COALESCE(SUM(LENGTH(blob)), 0) FROM blobs"
+            ).fetchone()[0] + self._conn.execute(
+                "SELECT COALESCE(SUM(LENGTH(checkpoint) + LENGTH(metadata)), 0) FROM checkpoints"
+            ).fetchone()[0]
+            return {
+                **counts,
+                "stored_bytes": stored_bytes,
+                "blobs_written": self.blobs_written,
+                "blobs_reused": self.blobs_reused,
+            }
@@ -0,0 +1,167 @@
+"""
+Durable LangGraph checkpointers for the agents.
+SqliteCheckpointSaver persists sessions in a local CheckpointStore; open_checkpointer
+picks it, the Postgres saver or the in-memory one from Config, so agent sessions
+can be resumed by thread id after a restart.
+"""
+
+import asyncio
+import random
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Iterator, Optional, Sequence, Tuple
+
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+from langgraph.checkpoint.memory import MemorySaver
+
+from .checkpoint_store import CheckpointStore
+from .config import Config
+
+CHECKPOINT_BACKENDS = ("sqlite", "postgres", "memory")
+
+
+class SqliteCheckpointSaver(BaseCheckpointSaver):
+    """LangGraph checkpointer over a CheckpointStore; async methods run the store in a worker thread."""
+
+    def __init__(self, path: str, keep_last: int = 20, ttl_seconds: float = 0, serde: Any = None):
+        super().__init__(serde=serde)
+        self.store = CheckpointStore(path, self.serde, keep_last=keep_last, ttl_seconds=ttl_seconds)
+
+    def close(self) -> None:
+        self.store.close()
+
+    def _tuple(self, record: Dict[str, Any]) -> CheckpointTuple:
+        configurable = {
+            "thread_id": record["thread_id"],
+            "checkpoint_ns": record["checkpoint_ns"],
+        }
+        parent_id = record["parent_checkpoint_id"]
+        return CheckpointTuple(
+            config={"configurable": {**configurable, "checkpoint_id": record["checkpoint_id"]}},
+            checkpoint=record["checkpoint"],
+            metadata=record["metadata"],
+            parent_config={"configurable": {**configurable, "checkpoint_id": parent_id}} if parent_id else None,
+            pending_writes=record["pending_writes"],
+        )
+
+    def get_tuple(self, config: Dict[str, Any]) -> Optional[CheckpointTuple]:
+        configurable = config["configurable"]
+        record = self.store.get(
+            configurable["thread_id"], configurable.get("checkpoint_ns", ""), get_checkpoint_id(config)
+        )
+        return self._tuple(record) if record else None
+
+    def list(self, config: Optional[Dict[str, Any]], *, filter: Optional[Dict[str, Any]] = None,
+             before: Optional[Dict[str, Any]] = None, limit: Optional[int] = None) -> Iterator[CheckpointTuple]:
+        configurable = (config or {}).get("configurable", {})
+        records = self.store.list(
+            thread_id=configurable.get("thread_id"),
+            checkpoint_ns=configurable.get("checkpoint_ns"),
+            before=get_checkpoint_id(before) if before else None,
+            limit=limit,
+            metadata_filter=filter,
+        )
+        for record in records:
+            yield self._tuple(record)
+
+    def put(self, config: Dict[str, Any], checkpoint: Checkpoint, metadata: CheckpointMetadata,
+            new_versions: ChannelVersions) -> Dict[str, Any]:
+        configurable = config["configurable"]
+        thread_id = configurable["thread_id"]
+        checkpoint_ns = configurable.get("checkpoint_ns", "")
+        self.store.put(
+            thread_id,
+            checkpoint_ns,
+            checkpoint,
+            get_checkpoint_metadata(config, metadata),
+            configurable.get("checkpoint_id"),
+            new_versions,
+        )
+        return {"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns,
+                                 "checkpoint_id": checkpoint["id"]}}
+
+    def put_writes(self, config: Dict[str, Any], writes: Sequence[Tuple[str, Any]], task_id: str,
+                   task_path: str = "") -> None:
+        configurable = config["configurable"]
+        # Special writes (errors, interrupts) have fixed negative indices
+        indexed = [(WRITES_IDX_MAP.get(channel, i), channel, value) for i, (channel, value) in enumerate(writes)]
+        self.store.put_writes(
+            configurable["thread_id"],
+            configurable.get("checkpoint_ns", ""),
+            configurable["checkpoint_id"],
+            task_id,
+            task_path,
+            indexed,
+        )
+
+    def delete_thread(self, thread_id: str) -> None:
+        self.store.delete_thread(thread_id)
+
+    async def aget_tuple(self, config: Dict[str, Any]) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(self, config: Optional[Dict[str, Any]], *, filter: Optional[Dict[str, Any]] = None,
+                    before: Optional[Dict[str, Any]] = None,
+                    limit: Optional[int] = None) -> AsyncIterator[CheckpointTuple]:
+        tuples = await asyncio.to_thread(lambda: list(self.list(config, filter=filter, before=before, limit=limit)))
+        for checkpoint_tuple in tuples:
+            yield checkpoint_tuple
+
+    async def aput(self, config: Dict[str, Any], checkpoint: Checkpoint, metadata: CheckpointMetadata,
+                   new_versions: ChannelVersions) -> Dict[str, Any]:
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(self, config: Dict[str, Any], writes: Sequence[Tuple[str, Any]], task_id: str,
+                          task_path: str = "") -> None:
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await asyncio.to_thread(self.delete_thread, thread_id)
+
+    def get_next_version(self, current: Optional[str], channel: None = None) -> str:
+        # Sortable string versions like the in-memory saver's; the random suffix keeps
+        # versions written by forks of the same checkpoint from sharing a blob
+        current_v = 0 if current is None else int(str(current).split(".")[0])
+        return f"{current_v + 1:032}.{random.random():016}"
+
+
+@asynccontextmanager
+async def open_checkpointer(backend: Optional[str] = None) -> AsyncIterator[BaseCheckpointSaver]:
+    """
+    Open the checkpointer configured in Config (or backend) for the lifetime of an agent session.
+
+    Args:
+        backend: sqlite, postgres or memory; defaults to Config.AGENT_CHECKPOINT_BACKEND
+    """
+    backend = backend or Config.AGENT_CHECKPOINT_BACKEND
+    if backend == "sqlite":
+        saver = SqliteCheckpointSaver(
+            Config.AGENT_CHECKPOINT_PATH,
+            keep_last=Config.AGENT_CHECKPOINT_KEEP_LAST,
+            ttl_seconds=Config.AGENT_CHECKPOINT_TTL_SECONDS,
+        )
+        saver.store.prune()
+        try:
+            yield saver
+        finally:
+            saver.close()
+    elif backend == "postgres":
+        try:
+            from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
+        except ImportError as e:
+            raise ImportError("The postgres checkpointer needs langgraph-checkpoint-postgres installed") from e
+        async with AsyncPostgresSaver.from_conn_string(Config.get_database_url()) as saver:
+            await saver.setup()
+            yield saver
+    elif backend == "memory":
+        yield MemorySaver()
+    else:
+        raise ValueError(f"Unknown checkpoint backend {backend!r}; expected one of {', '.join(CHECKPOINT_BACKENDS)}")
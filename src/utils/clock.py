@@ -0,0 +1,136 @@
+"""
+Clock provider for the agents.
+Serves the current time from a cached reading of time_utils.get_current_time,
+optionally corrected by a remote time server that is polled in the background,
+so agent turns never wait on the network and keep working when the time
+server is down.
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+from zoneinfo import ZoneInfo
+
+import requests
+
+from .config import Config
+from .time_utils import get_current_time
+
+
+class ClockProvider:
+    """Current time from cached readings: the remote time server's when fresh, otherwise the local clock's."""
+
+    def __init__(self, timezone: str, ttl_seconds: float, remote_url: Optional[str] = None,
+                 refresh_seconds: float = 300.0, remote_timeout: float = 2.0):
+        """
+        Args:
+            timezone: IANA timezone times are reported in
+            ttl_seconds: How long a local reading is reused; later times are extrapolated from it
+            remote_url: Base URL of a time server with a GET /current_time endpoint, or None for local only
+            refresh_seconds: Interval between background refreshes from the time server; its readings
+                are used for up to twice this long, then the local clock takes over
+            remote_timeout: Seconds to wait for the time server
+        """
+        self.timezone = timezone
+        self.ttl_seconds = ttl_seconds
+        self.remote_url = remote_url.rstrip("/") if remote_url else None
+        self.refresh_seconds = refresh_seconds
+        self.remote_timeout = remote_timeout
+        self._tz = ZoneInfo(timezone)
+        self._local: Optional[tuple] = None
+        self._remote: Optional[tuple] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.local_reads = 0
+        self.remote_reads = 0
+        self.remote_errors = 0
+        self.last_remote_error: Optional[str] = None
+
+    def _read_local(self) -> datetime:
+        info = get_current_time(self.timezone)
+        if "error" in info:
+            raise ValueError(info["error"])
+        return datetime.fromisoformat(info["datetime"])
+
+    def refresh_remote(self) -> bool:
+        """Read the time server once; returns whether it answered. Failures are counted, not raised."""
+        try:
+            response = requests.get(f"{self.remote_url}/current_time", timeout=self.remote_timeout)
+            response.raise_for_status()
+            reading = datetime.fromisoformat(response.json()["datetime"]).astimezone(self._tz)
+        except Exception as e:
+            with self._lock:
+                self.remote_errors += 1
+                self.last_remote_error = str(e)
+            return False
+        with self._lock:
+            self._remote = (reading, time.monotonic())
+            self.remote_reads += 1
+        return True
+
+    def _refresh_loop(self) -> None:
+        while not self._stop.is_set():
+            self.refresh_remote()
+            self._stop.wait(self.refresh_seconds)
+
+    def start(self) -> "ClockProvider":
+        """Start refreshing from the time server in a background thread (no-op without one)."""
+        if self.remote_url and self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._refresh_loop, name="clock-refresh", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.remote_timeout + 1)
+            self._thread = None
+
+    def source(self) -> str:
+        """Where now() currently reads from: "remote" or "local"."""
+        with self._lock:
+            return "remote" if self._remote_is_fresh(time.monotonic()) else "local"
+
+    def _remote_is_fresh(self, now: float) -> bool:
+        return self._remote is not None and now - self._remote[1] <= 2 * self.refresh_seconds
+
+    def now(self) -> datetime:
+        """Current time in the configured timezone, without blocking on the network."""
+        with self._lock:
+            monotonic = time.monotonic()
+            if self._remote_is_fresh(monotonic):
+                reading, read_at = self._remote
+            else:
+                if self._local is None or monotonic - self._local[1] > self.ttl_seconds:
+                    self._local = (self._read_local(), monotonic)
+                    self.local_reads += 1
+                reading, read_at = self._local
+            return reading + timedelta(seconds=monotonic - read_at)
+
+    def current_date(self) -> str:
+        """Today's date as YYYY-MM-DD."""
+        return self.now().date().isoformat()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "source": "remote" if self._remote_is_fresh(time.monotonic()) else "local",
+                "local_reads": self.local_reads,
+                "remote_reads": self.remote_reads,
+                "remote_errors": self.remote_errors,
+                "last_remote_error": self.last_remote_error,
+            }
+
+
+def get_clock() -> ClockProvider:
+    """Build and start the clock configured in Config."""
+    return ClockProvider(
+        Config.CLOCK_TIMEZONE,
+        ttl_seconds=Config.CLOCK_TTL_SECONDS,
+        remote_url=Config.TIME_SERVER_URL or None,
+        refresh_seconds=Config.CLOCK_REFRESH_SECONDS,
+        remote_timeout=Config.CLOCK_REMOTE_TIMEOUT,
+    ).start()
@@ -24,6 +24,126 @@ class Config:
     # Google AI configuration
     GOOGLE_API_KEY = os.getenv('GOOGLE_API_KEY', '')
     
+    # Agent clock configuration (local time_utils clock, corrected by the time server when it answers;
+    # an empty TIME_SERVER_URL uses the local clock only)
+    CLOCK_TIMEZONE = os.getenv('CLOCK_TIMEZONE', 'America/Denver')
+    CLOCK_TTL_SECONDS = float(os.getenv('CLOCK_TTL_SECONDS', '60'))
+    TIME_SERVER_URL = os.getenv('TIME_SERVER_URL', 'http://127.0.0.1:8080')
+    CLOCK_REFRESH_SECONDS = float(os.getenv('CLOCK_REFRESH_SECONDS', '300'))
+    CLOCK_REMOTE_TIMEOUT = float(os.getenv('CLOCK_REMOTE_TIMEOUT', '2'))
+    
+    # Agent conversation memory (prompt, summary and history budget per model call; 0 keeps the full
+    # history and repeats the system prompt in every user message)
+    AGENT_MEMORY_MAX_TOKENS = int(os.getenv('AGENT_MEMORY_MAX_TOKENS', '4000'))
+    AGENT_MEMORY_SUMMARIES = os.getenv('AGENT_MEMORY_SUMMARIES', 'false').lower() == 'true'
+    
+    # Agent checkpoints (sessions resume by thread id): sqlite, postgres or memory. Only checkpoints
+    # past the last AGENT_CHECKPOINT_KEEP_LAST per thread are pruned; threads idle longer than
+    # AGENT_CHECKPOINT_TTL_SECONDS are deleted (0 keeps them)
+    AGENT_CHECKPOINT_BACKEND = os.getenv('AGENT_CHECKPOINT_BACKEND', 'sqlite')
+    AGENT_CHECKPOINT_PATH = os.getenv('AGENT_CHECKPOINT_PATH', '.cache/checkpoints.sqlite')
+    AGENT_CHECKPOINT_KEEP_LAST = int(os.getenv('AGENT_CHECKPOINT_KEEP_LAST', '20'))
+    AGENT_CHECKPOINT_TTL_SECONDS = float(os.getenv('AGENT_CHECKPOINT_TTL_SECONDS', str(30 * 24 * 3600)))
+    
+    # Agent server (python main.py serve): turns a session may run at once (more get 429),
+    # turns running across all sessions (more wait; 0 = no limit) and how long idle sessions are tracked
+    AGENT_SERVER_HOST = os.getenv('AGENT_SERVER_HOST', '127.0.0.1')
+    AGENT_SERVER_PORT = int(os.getenv('AGENT_SERVER_PORT', '8100'))
+    AGENT_SESSION_MAX_TURNS = int(os.getenv('AGENT_SESSION_MAX_TURNS', '1'))
+    AGENT_SERVER_MAX_TURNS = int(os.getenv('AGENT_SERVER_MAX_TURNS', '64'))
+    AGENT_SESSION_IDLE_SECONDS = float(os.getenv('AGENT_SESSION_IDLE_SECONDS', '1800'))
+    
+    # Tool result cache for the hotel toolset (TTLs per tool are in src/utils/tool_cache.py;
+    # TOOL_CACHE_TTLS overrides them as "tool=seconds,...", 0 turning a tool's caching off)
+    TOOL_CACHE_ENABLED = os.getenv('TOOL_CACHE_ENABLED', 'true').lower() == 'true'
+    TOOL_CACHE_MAX_ENTRIES = int(os.getenv('TOOL_CACHE_MAX_ENTRIES', '10000'))
+    TOOL_CACHE_TTLS = os.getenv('TOOL_CACHE_TTLS', '')
+    
+    # Extraction backend used by the summarization tools: http, inprocess or stub
+    EXTRACTION_BACKEND = os.getenv('EXTRACTION_BACKEND', 'http')
+    TEXTRACT_SERVER_URL = os.getenv('TEXTRACT_SERVER_URL', 'http://127.0.0.1:8000')
+    
+    # Summarization configuration (documents over SUMMARY_CHUNK_TOKENS are summarized in chunks)
+    SUMMARY_MODEL = os.getenv('SUMMARY_MODEL', 'gemini-1.5-flash')
+    SUMMARY_CHUNK_TOKENS = int(os.getenv('SUMMARY_CHUNK_TOKENS', '8000'))
+    SUMMARY_CONCURRENCY = int(os.getenv('SUMMARY_CONCURRENCY', '4'))
+    # Extractive compression budget applied before summarizing (0 disables it)
+    SUMMARY_COMPRESS_TOKENS = int(os.getenv('SUMMARY_COMPRESS_TOKENS', '0'))
+    # Default reduce mode of the summarizing tools; false makes --flat-reduce the default
+    SUMMARY_HIERARCHICAL = os.getenv('SUMMARY_HIERARCHICAL', 'true').lower() == 'true'
+    
+    # Model quota configuration (0 disables a limit)
+    SUMMARY_REQUESTS_PER_MINUTE = float(os.getenv('SUMMARY_REQUESTS_PER_MINUTE', '15'))
+    SUMMARY_TOKENS_PER_MINUTE = float(os.getenv('SUMMARY_TOKENS_PER_MINUTE', '1000000'))
+    SUMMARY_EXPECTED_OUTPUT_TOKENS = int(os.getenv('SUMMARY_EXPECTED_OUTPUT_TOKENS', '512'))
+    SUMMARY_BATCH_CONCURRENCY = int(os.getenv('SUMMARY_BATCH_CONCURRENCY', '4'))
+    
+    # Summary cache configuration (keyed by text hash, model and prompt)
+    SUMMARY_CACHE_ENABLED = os.getenv('SUMMARY_CACHE_ENABLED', 'true').lower() == 'true'
+    SUMMARY_CACHE_DIR = os.getenv('SUMMARY_CACHE_DIR', '.cache/summaries')
+    SUMMARY_CACHE_MAX_BYTES = int(os.getenv('SUMMARY_CACHE_MAX_BYTES', str(64 * 1024 * 1024)))
+    SUMMARY_CACHE_TTL_SECONDS = int(os.getenv('SUMMARY_CACHE_TTL_SECONDS', str(30 * 24 * 3600)))
+    
+    # Textract client configuration
+    AWS_REGION = os.getenv('AWS_REGION', 'us-east-1')
+    TEXTRACT_ENDPOINT_URL = os.getenv('TEXTRACT_ENDPOINT_URL', '')
+    TEXTRACT_MAX_POOL_CONNECTIONS = int(os.getenv('TEXTRACT_MAX_POOL_CONNECTIONS', '10'))
+    TEXTRACT_MAX_ATTEMPTS = int(os.getenv('TEXTRACT_MAX_ATTEMPTS', '3'))
+    TEXTRACT_RETRY_MODE = os.getenv('TEXTRACT_RETRY_MODE', 'standard')
+    TEXTRACT_CONNECT_TIMEOUT = float(os.getenv('TEXTRACT_CONNECT_TIMEOUT', '5'))
+    TEXTRACT_READ_TIMEOUT = float(os.getenv('TEXTRACT_READ_TIMEOUT', '60'))
+    
+    # Textract result cache configuration
+    TEXTRACT_CACHE_ENABLED = os.getenv('TEXTRACT_CACHE_ENABLED', 'true').lower() == 'true'
+    TEXTRACT_CACHE_DIR = os.getenv('TEXTRACT_CACHE_DIR', '.cache/textract')
+    TEXTRACT_CACHE_MAX_BYTES = int(os.getenv('TEXTRACT_CACHE_MAX_BYTES', str(512 * 1024 * 1024)))
+    TEXTRACT_CACHE_TTL_SECONDS = int(os.getenv('TEXTRACT_CACHE_TTL_SECONDS', str(7 * 24 * 3600)))
+    
+    # Textract worker pool configuration
+    TEXTRACT_MAX_WORKERS = int(os.getenv('TEXTRACT_MAX_WORKERS', '8'))
+    TEXTRACT_MAX_QUEUE = int(os.getenv('TEXTRACT_MAX_QUEUE', '32'))
+    
+    # Textract page-splitting configuration (synchronous Textract takes one-page PDFs)
+    TEXTRACT_SPLIT_ENABLED = os.getenv('TEXTRACT_SPLIT_ENABLED', 'true').lower() == 'true'
+    TEXTRACT_SPLIT_MIN_PAGES = int(os.getenv('TEXTRACT_SPLIT_MIN_PAGES', '2'))
+    TEXTRACT_SPLIT_PAGES_PER_CHUNK = int(os.getenv('TEXTRACT_SPLIT_PAGES_PER_CHUNK', '1'))
+    TEXTRACT_SPLIT_WORKERS = int(os.getenv('TEXTRACT_SPLIT_WORKERS', '8'))
+    
+    # Textract upload configuration
+    TEXTRACT_MAX_UPLOAD_BYTES = int(os.getenv('TEXTRACT_MAX_UPLOAD_BYTES', str(500 * 1024 * 1024)))
+    TEXTRACT_SPOOL_DIR = os.getenv('TEXTRACT_SPOOL_DIR', '')
+    
+    # Textract batch extraction configuration
+    TEXTRACT_BATCH_CONCURRENCY = int(os.getenv('TEXTRACT_BATCH_CONCURRENCY', '4'))
+    TEXTRACT_BATCH_MAX_ITEMS = int(os.getenv('TEXTRACT_BATCH_MAX_ITEMS', '100'))
+    
+    # Textract response compression configuration
+    TEXTRACT_GZIP_ENABLED = os.getenv('TEXTRACT_GZIP_ENABLED', 'true').lower() == 'true'
+    TEXTRACT_GZIP_MIN_BYTES = int(os.getenv('TEXTRACT_GZIP_MIN_BYTES', '1024'))
+    TEXTRACT_GZIP_LEVEL = int(os.getenv('TEXTRACT_GZIP_LEVEL', '5'))
+    
+    # Textract metrics configuration (Server-Timing headers on every response)
+    TEXTRACT_TIMING_HEADERS = os.getenv('TEXTRACT_TIMING_HEADERS', 'false').lower() == 'true'
+    
+    # Textract call coalescing and client-side rate limiting (TEXTRACT_RATE_LIMIT=0 disables the limiter).
+    # While the limiter is on it alone retries synchronous calls (TEXTRACT_THROTTLE_RETRIES); their
+    # clients make a single attempt instead of TEXTRACT_MAX_ATTEMPTS.
+    TEXTRACT_COALESCE_ENABLED = os.getenv('TEXTRACT_COALESCE_ENABLED', 'true').lower() == 'true'
+    TEXTRACT_RATE_LIMIT = float(os.getenv('TEXTRACT_RATE_LIMIT', '10'))
+    TEXTRACT_RATE_BURST = float(os.getenv('TEXTRACT_RATE_BURST', '10'))
+    TEXTRACT_RATE_MIN = float(os.getenv('TEXTRACT_RATE_MIN', '0.5'))
+    TEXTRACT_THROTTLE_RETRIES = int(os.getenv('TEXTRACT_THROTTLE_RETRIES', '5'))
+    TEXTRACT_THROTTLE_BASE_DELAY = float(os.getenv('TEXTRACT_THROTTLE_BASE_DELAY', '0.25'))
+    
+    # Textract asynchronous job configuration
+    TEXTRACT_S3_BUCKET = os.getenv('TEXTRACT_S3_BUCKET', '')
+    TEXTRACT_S3_PREFIX = os.getenv('TEXTRACT_S3_PREFIX', 'textract-jobs/')
+    TEXTRACT_JOB_WORKERS = int(os.getenv('TEXTRACT_JOB_WORKERS', '4'))
+    TEXTRACT_JOB_POLL_SECONDS = float(os.getenv('TEXTRACT_JOB_POLL_SECONDS', '2'))
+    # Jobs still IN_PROGRESS after this many seconds are marked failed (0 = wait indefinitely)
+    TEXTRACT_JOB_TIMEOUT_SECONDS = float(os.getenv('TEXTRACT_JOB_TIMEOUT_SECONDS', '1800'))
+    TEXTRACT_MAX_JOBS = int(os.getenv('TEXTRACT_MAX_JOBS', '1000'))
+    
     @classmethod
     def get_database_url(cls) -> str:
         """Get the PostgreSQL connection URL."""
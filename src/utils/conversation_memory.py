@@ -0,0 +1,149 @@
+"""
+Bounded conversation memory for the LangGraph agents.
+A pre-model hook that sends the system prompt once per model call instead of
+storing it in every user message, trims history to a token budget on turn
+boundaries and, optionally, folds the trimmed turns into a rolling summary,
+so prompt size stays flat over long sessions.
+"""
+
+import json
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from langchain_core.messages import BaseMessage, HumanMessage, RemoveMessage, SystemMessage
+
+from .summarization import estimate_tokens, response_text
+
+try:
+    from langgraph.graph.message import REMOVE_ALL_MESSAGES
+except ImportError:  # langgraph is only needed to run the agents; the marker is a plain id
+    REMOVE_ALL_MESSAGES = "__remove_all__"
+
+# Name of the system message holding the rolling summary in the stored history
+SUMMARY_NAME = "conversation_summary"
+
+# Tokens each message costs on top of its content (role, separators)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+SUMMARY_PROMPT = (
+    "Update the summary of a conversation between a user and a hotel assistant with the turns below. "
+    "Keep hotel ids, names, dates, bookings and anything the user asked to remember.\n\n"
+    "Current summary:\n{summary}\n\nNew turns:\n{turns}\n\nUpdated summary:"
+)
+
+
+def message_tokens(message: BaseMessage) -> int:
+    """Estimated tokens of a message, including the arguments of any tool calls it makes."""
+    content = message.content if isinstance(message.content, str) else json.dumps(message.content)
+    tokens = estimate_tokens(content) + MESSAGE_OVERHEAD_TOKENS
+    tool_calls = getattr(message, "tool_calls", None)
+    if tool_calls:
+        tokens += estimate_tokens(json.dumps([[c["name"], c["args"]] for c in tool_calls]))
+    return tokens
+
+
+def count_tokens(messages: Sequence[BaseMessage]) -> int:
+    return sum(message_tokens(m) for m in messages)
+
+
+def format_turns(messages: Sequence[BaseMessage]) -> str:
+    lines = []
+    for message in messages:
+        content = message.content if isinstance(message.content, str) else json.dumps(message.content)
+        if content:
+            lines.append(f"{message.type}: {content}")
+        for call in getattr(message, "tool_calls", None) or []:
+            lines.append(f"{message.type}: called {call['name']}({json.dumps(call['args'])})")
+    return "\n".join(lines)
+
+
+class MemoryPolicy:
+    """Decides what of a thread's history each model call sees, and compacts what is stored."""
+
+    def __init__(self, system_prompt: str, max_tokens: int, summary_model: Any = None):
+        """
+        Args:
+            system_prompt: Sent as a system message at the start of every model call, never stored
+            max_tokens: Budget for the system prompt, summary and history sent to the model
+            summary_model: Chat model folding trimmed turns into a rolling summary; None just drops them
+        """
+        self.system_prompt = system_prompt
+        self.max_tokens = max_tokens
+        self.summary_model = summary_model
+        self._prompt_tokens: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.summaries = 0
+
+    def split_summary(self, messages: Sequence[BaseMessage]) -> Tuple[Optional[str], List[BaseMessage]]:
+        """Separate the stored rolling summary, if any, from the rest of the history."""
+        if messages and isinstance(messages[0], SystemMessage) and messages[0].name == SUMMARY_NAME:
+            return messages[0].content, list(messages[1:])
+        return None, list(messages)
+
+    def system_message(self, summary: Optional[str]) -> SystemMessage:
+        content = self.system_prompt.strip()
+        if summary:
+            content += "\n\nSummary of the conversation so far:\n" + summary
+        return SystemMessage(content=content)
+
+    def trim(self, history: Sequence[BaseMessage], budget: int) -> Tuple[List[BaseMessage], List[BaseMessage]]:
+        """
+        Split history into the turns that no longer fit in budget and the recent turns that do.
+
+        History is only cut where a user message starts a turn, so tool calls stay
+        with their results. The latest turn is always kept, even over budget.
+
+        Returns:
+            (dropped, kept)
+        """
+        turn_starts = [i for i, m in enumerate(history) if isinstance(m, HumanMessage)]
+        if not turn_starts:
+            return [], list(history)
+        cut = turn_starts[-1]
+        used = count_tokens(history[cut:])
+        for start in reversed(turn_starts[:-1]):
+            used += count_tokens(history[start:cut])
+            if used > budget:
+                break
+            cut = start
+        return list(history[:cut]), list(history[cut:])
+
+    def summarize(self, summary: Optional[str], dropped: Sequence[BaseMessage]) -> str:
+        prompt = SUMMARY_PROMPT.format(summary=summary or "(none)", turns=format_turns(dropped))
+        with self._lock:
+            self.summaries += 1
+        # Runs inside the graph, whose "messages" stream would otherwise pick this call up as answer tokens
+        return response_text(self.summary_model.invoke(prompt, config={"tags": ["nostream"]})).strip()
+
+    def pre_model_hook(self, state: Dict[str, Any], config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        LangGraph pre_model_hook for create_react_agent.
+
+        Returns the messages for this model call and, when turns were trimmed, a
+        state update replacing the stored history with the summary and the kept turns.
+        """
+        summary, history = self.split_summary(state["messages"])
+        budget = self.max_tokens - message_tokens(self.system_message(summary))
+        dropped, kept = self.trim(history, budget)
+        update: Dict[str, Any] = {}
+        if dropped:
+            if self.summary_model is not None:
+                summary = self.summarize(summary, dropped)
+            stored = [SystemMessage(content=summary, name=SUMMARY_NAME)] if summary else []
+            update["messages"] = [RemoveMessage(id=REMOVE_ALL_MESSAGES)] + stored + kept
+        llm_input = [self.system_message(summary)] + kept
+        update["llm_input_messages"] = llm_input
+        thread_id = ((config or {}).get("configurable") or {}).get("thread_id", "")
+        with self._lock:
+            self._prompt_tokens[thread_id] = count_tokens(llm_input)
+        return update
+
+    def forget(self, thread_id: str) -> None:
+        """Drop what is kept about thread_id, once its session has ended."""
+        with self._lock:
+            self._prompt_tokens.pop(thread_id, None)
+
+    def prompt_tokens(self, thread_id: str = "") -> Optional[int]:
+        """Estimated prompt tokens of the last model call on thread_id."""
+        with self._lock:
+            return self._prompt_tokens.get(thread_id)
@@ -0,0 +1,114 @@
+"""
+Pluggable text extraction backends for the summarization tools.
+"http" calls the Textract HTTP server, "inprocess" calls its extraction code
+directly in this process (no JSON encoding or socket hop) and "stub" reads
+documents as plain text for offline runs and tests.
+"""
+
+import json
+import time
+from typing import Dict, Iterator
+
+from .config import Config
+from .summarization import PAGE_BREAK, join_pages
+
+BACKENDS = ("http", "inprocess", "stub")
+
+
+class ExtractionError(Exception):
+    """Raised when a backend can't extract a document."""
+
+
+class HttpExtractionBackend:
+    """Extracts through the Textract HTTP server, reusing one keep-alive session."""
+
+    def __init__(self, base_url: str):
+        import requests
+
+        self.base_url = base_url.rstrip("/")
+        self.session = requests.Session()
+
+    def extract(self, file_path: str, use_cache: bool = True) -> str:
+        # Lines carry page numbers, so long documents can be chunked on page boundaries
+        response = self.session.post(
+            f"{self.base_url}/extract-text",
+            json={"file_path": file_path, "format": "lines", "use_cache": use_cache},
+        )
+        if response.status_code != 200:
+            raise ExtractionError(response.text)
+        return join_pages(response.json().get("lines", []))
+
+    def stream_pages(self, file_path: str, use_cache: bool = True) -> Iterator[dict]:
+        """Yield {"page", "text", "cached"} as the server finishes each page."""
+        with self.session.post(
+            f"{self.base_url}/extract-text/stream",
+            json={"file_path": file_path, "use_cache": use_cache},
+            stream=True,
+        ) as response:
+            if response.status_code != 200:
+                raise ExtractionError(response.text)
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                page = json.loads(line)
+                if "error" in page:
+                    raise ExtractionError(page["error"])
+                yield page
+
+
+class InProcessExtractionBackend:
+    """Calls the Textract server's extraction functions directly, sharing its clients and cache."""
+
+    def __init__(self):
+        # Imported here so the other backends don't pull in FastAPI and boto3
+        from src.agents import textract_http_server
+
+        self.server = textract_http_server
+
+    def extract(self, file_path: str, use_cache: bool = True) -> str:
+        result = self.server.extract_text_from_file(file_path, use_cache=use_cache)
+        if "error" in result:
+            raise ExtractionError(result["error"])
+        return PAGE_BREAK.join(page["text"] for page in self.server.page_items(result["blocks"]))
+
+    def stream_pages(self, file_path: str, use_cache: bool = True) -> Iterator[dict]:
+        for page in self.server.iter_document_pages(file_path, use_cache=use_cache):
+            if "error" in page:
+                raise ExtractionError(page["error"])
+            yield page
+
+
+class StubExtractionBackend:
+    """Reads documents as UTF-8 text with form feeds between pages, after an optional delay per page."""
+
+    def __init__(self, page_latency: float = 0.0):
+        self.page_latency = page_latency
+
+    def _pages(self, file_path: str):
+        try:
+            with open(file_path, "r", encoding="utf-8", errors="replace") as f:
+                return f.read().split(PAGE_BREAK)
+        except OSError as e:
+            raise ExtractionError(str(e))
+
+    def extract(self, file_path: str, use_cache: bool = True) -> str:
+        pages = self._pages(file_path)
+        time.sleep(self.page_latency * len(pages))
+        return PAGE_BREAK.join(pages)
+
+    def stream_pages(self, file_path: str, use_cache: bool = True) -> Iterator[Dict]:
+        for number, text in enumerate(self._pages(file_path), start=1):
+            time.sleep(self.page_latency)
+            yield {"page": number, "text": text, "cached": False}
+
+
+def get_extraction_backend(name: str = None):
+    """Build the backend called name, defaulting to Config.EXTRACTION_BACKEND."""
+    name = name or Config.EXTRACTION_BACKEND
+    if name == "http":
+        return HttpExtractionBackend(Config.TEXTRACT_SERVER_URL)
+    if name == "inprocess":
+        return InProcessExtractionBackend()
+    if name == "stub":
+        return StubExtractionBackend()
+    raise ValueError(f"Unknown extraction backend: {name} (expected one of {', '.join(BACKENDS)})")
@@ -0,0 +1,133 @@
+"""
+Manifest and progress tracking for bulk document ingestion.
+The manifest is an append-only JSONL file recording each document's content
+hash and status, so an interrupted run can resume without redoing work.
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+# Progress only: unchanged documents aren't recorded again
+STATUS_SKIPPED = "skipped"
+
+
+class IngestManifest:
+    """Append-only record of ingested documents, keyed by their name in the source."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries: Dict[str, dict] = {}
+        self._load()
+        self.compact()
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A run killed mid-write can leave a partial last line
+                    continue
+                self._entries[entry["name"]] = entry
+
+    def compact(self) -> None:
+        """Rewrite the manifest with only the latest entry per document."""
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with self._lock:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for entry in self._entries.values():
+                    f.write(json.dumps(entry) + "\n")
+            os.replace(tmp_path, self.path)
+
+    def get(self, name: str) -> Optional[dict]:
+        return self._entries.get(name)
+
+    def record(self, name: str, content_hash: str, status: str, **fields) -> dict:
+        """Append an entry for a document; later entries replace earlier ones on load."""
+        entry = {"name": name, "hash": content_hash, "status": status, "time": time.time(), **fields}
+        line = json.dumps(entry) + "\n"
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+            self._entries[name] = entry
+        return entry
+
+    def counts(self) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for entry in self._entries.values():
+            counts[entry["status"]] = counts.get(entry["status"], 0) + 1
+        return counts
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def format_eta(seconds: float) -> str:
+    """HH:MM:SS, with a day count in front once it passes 24 hours."""
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    days, hours = divmod(hours, 24)
+    clock = f"{hours:02d}:{minutes:02d}:{secs:02d}"
+    return f"{days}d {clock}" if days else clock
+
+
+class IngestProgress:
+    """Counts processed documents and estimates throughput and time remaining."""
+
+    def __init__(self, total: int):
+        self.total = total
+        self.done = 0
+        self.failed = 0
+        self.skipped = 0
+        self.bytes = 0
+        self._started = time.monotonic()
+        self._lock = threading.Lock()
+
+    def update(self, status: str, size: int = 0) -> None:
+        with self._lock:
+            if status == STATUS_DONE:
+                self.done += 1
+                self.bytes += size
+            elif status == STATUS_FAILED:
+                self.failed += 1
+            else:
+                self.skipped += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            elapsed = time.monotonic() - self._started
+            processed = self.done + self.failed
+            remaining = self.total - processed - self.skipped
+            # Skipped documents cost almost nothing, so they don't count towards the rate
+            rate = processed / elapsed if elapsed > 0 else 0.0
+            return {
+                "total": self.total,
+                "done": self.done,
+                "failed": self.failed,
+                "skipped": self.skipped,
+                "remaining": remaining,
+                "elapsed_seconds": round(elapsed, 1),
+                "docs_per_second": round(rate, 2),
+                "mb_per_second": round(self.bytes / elapsed / 1e6, 2) if elapsed > 0 else 0.0,
+                "eta_seconds": round(remaining / rate) if rate > 0 else None,
+            }
+
+    def format(self) -> str:
+        s = self.snapshot()
+        eta = "?" if s["eta_seconds"] is None else format_eta(s["eta_seconds"])
+        finished = s["done"] + s["failed"] + s["skipped"]
+        return (
+            f"{finished}/{s['total']} "
+            f"(done {s['done']}, failed {s['failed']}, skipped {s['skipped']}) "
+            f"{s['docs_per_second']} docs/s, {s['mb_per_second']} MB/s, ETA {eta}"
+        )
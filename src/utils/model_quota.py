@@ -0,0 +1,145 @@
+"""
+Requests-per-minute and tokens-per-minute limits for chat model calls.
+Wraps a chat model so every call first takes its share of both budgets,
+backs off when the API reports the quota is exhausted and settles the token
+budget with the real usage once the response arrives.
+"""
+
+import random
+import threading
+import time
+from typing import Any, Dict, Iterator, Optional
+
+from .rate_limiter import AdaptiveRateLimiter
+from .summarization import estimate_tokens
+
+
+# Fallback for errors that carry no status code; a bare "429" could be a page count or an id
+QUOTA_PHRASES = ("resource_exhausted", "resource has been exhausted", "rate limit", "quota",
+                 "429 too many requests")
+
+
+def status_code(error: BaseException) -> Optional[int]:
+    """HTTP status of an API error, from the error or its response, or None if it has none."""
+    for source in (error, getattr(error, "response", None)):
+        for attribute in ("status_code", "code"):
+            value = getattr(source, attribute, None)
+            if isinstance(value, int):
+                return int(value)
+    return None
+
+
+def is_quota_error(error: BaseException) -> bool:
+    """True for HTTP 429 / RESOURCE_EXHAUSTED errors from the model API, or errors caused by one."""
+    if type(error).__name__ in ("ResourceExhausted", "TooManyRequests") or status_code(error) == 429:
+        return True
+    message = str(error).lower()
+    if any(phrase in message for phrase in QUOTA_PHRASES):
+        return True
+    # LangChain integrations wrap the client library's exception
+    return error.__cause__ is not None and is_quota_error(error.__cause__)
+
+
+def usage_tokens(response: Any) -> int:
+    """Total tokens reported by a LangChain response, or 0 if it reports none."""
+    usage = getattr(response, "usage_metadata", None) or {}
+    return usage.get("total_tokens", 0)
+
+
+# Share of the configured rate each successful call wins back after a 429 backoff
+RECOVERY_FRACTION = 0.05
+
+
+def budget_limiter(per_minute: float) -> Optional[AdaptiveRateLimiter]:
+    """Limiter for a per-minute budget (requests or tokens), or None when per_minute is 0."""
+    if per_minute <= 0:
+        return None
+    rate = per_minute / 60
+    # Buckets hold ten seconds of budget, so a fresh batch can't spend a whole minute at once.
+    # Recovery is in the budget's own units, so token budgets climb back as fast as request ones.
+    return AdaptiveRateLimiter(
+        rate=rate,
+        burst=max(1.0, per_minute / 6),
+        min_rate=per_minute / 600,
+        recovery_per_success=rate * RECOVERY_FRACTION,
+    )
+
+
+class RateLimitedModel:
+    """Chat model wrapper enforcing requests- and tokens-per-minute budgets across threads."""
+
+    def __init__(self, model: Any, requests_per_minute: float, tokens_per_minute: float,
+                 expected_output_tokens: int = 512, max_retries: int = 5, base_delay: float = 2.0):
+        """
+        Args:
+            model: Chat model with invoke (and optionally stream)
+            requests_per_minute: Request budget; 0 for no limit
+            tokens_per_minute: Token budget (prompt plus output); 0 for no limit
+            expected_output_tokens: Output tokens charged up front, corrected after the call
+            max_retries: Retries of a call rejected for exhausted quota
+            base_delay: First retry delay in seconds, doubled on each retry
+        """
+        self.model = model
+        self.expected_output_tokens = expected_output_tokens
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.requests = budget_limiter(requests_per_minute)
+        self.tokens = budget_limiter(tokens_per_minute)
+        self.calls = 0
+        self.quota_errors = 0
+        self._lock = threading.Lock()
+
+    def _acquire(self, prompt: str) -> int:
+        charged = estimate_tokens(prompt) + self.expected_output_tokens
+        if self.requests is not None:
+            self.requests.acquire()
+        if self.tokens is not None:
+            self.tokens.acquire(charged)
+        with self._lock:
+            self.calls += 1
+        return charged
+
+    def _settle(self, charged: int, response: Any) -> None:
+        used = usage_tokens(response)
+        if used and self.tokens is not None:
+            self.tokens.adjust(used - charged)
+
+    def _on_quota_error(self) -> None:
+        with self._lock:
+            self.quota_errors += 1
+        for limiter in (self.requests, self.tokens):
+            if limiter is not None:
+                limiter.on_throttle()
+
+    def invoke(self, prompt: str) -> Any:
+        for attempt in range(self.max_retries + 1):
+            charged = self._acquire(prompt)
+            try:
+                response = self.model.invoke(prompt)
+            except Exception as e:
+                if not is_quota_error(e) or attempt == self.max_retries:
+                    raise
+                self._on_quota_error()
+                time.sleep(self.base_delay * (2 ** attempt) * random.uniform(0.5, 1.5))
+                continue
+            self._settle(charged, response)
+            for limiter in (self.requests, self.tokens):
+                if limiter is not None:
+                    limiter.on_success()
+            return response
+
+    def stream(self, prompt: str) -> Iterator[Any]:
+        """Stream under the budgets; streams aren't retried once started."""
+        self._acquire(prompt)
+        if not hasattr(self.model, "stream"):
+            yield self.model.invoke(prompt)
+            return
+        yield from self.model.stream(prompt)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "quota_errors": self.quota_errors,
+            "requests": self.requests.stats() if self.requests is not None else None,
+            "tokens": self.tokens.stats() if self.tokens is not None else None,
+        }
@@ -0,0 +1,52 @@
+"""
+PDF inspection and page splitting for parallel Textract extraction.
+Uses pypdf when it is installed; without it documents are never split.
+"""
+
+import io
+from typing import List, Optional, Tuple
+
+try:
+    import pypdf
+except ImportError:  # pypdf is optional; without it PDFs are sent whole
+    pypdf = None
+
+
+def count_pdf_pages(file_path: str) -> Optional[int]:
+    """
+    Count the pages of a PDF without sending it anywhere.
+
+    Returns:
+        The page count, or None if pypdf is missing or the file can't be parsed
+    """
+    if pypdf is None:
+        return None
+    try:
+        return len(pypdf.PdfReader(file_path).pages)
+    except Exception:
+        return None
+
+
+def split_pdf(file_path: str, pages_per_chunk: int) -> List[Tuple[int, bytes]]:
+    """
+    Split a PDF into standalone PDFs of at most pages_per_chunk pages.
+
+    Args:
+        file_path: Path of the PDF
+        pages_per_chunk: Maximum pages in each chunk
+
+    Returns:
+        (first page number, chunk bytes) pairs in page order; page numbers start at 1
+    """
+    if pypdf is None:
+        raise RuntimeError("pypdf is required to split PDFs")
+    reader = pypdf.PdfReader(file_path)
+    chunks = []
+    for start in range(0, len(reader.pages), pages_per_chunk):
+        writer = pypdf.PdfWriter()
+        for page in reader.pages[start:start + pages_per_chunk]:
+            writer.add_page(page)
+        buffer = io.BytesIO()
+        writer.write(buffer)
+        chunks.append((start + 1, buffer.getvalue()))
+    return chunks
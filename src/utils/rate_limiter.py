@@ -0,0 +1,145 @@
+"""
+Client-side rate limiting for AWS and model API calls.
+A token bucket whose rate adapts to throttling: it halves on a throttling
+error and climbs back slowly on success (AIMD), so bursts queue locally
+instead of turning into retry storms against the service.
+"""
+
+import random
+import threading
+import time
+from typing import Any, Callable, Dict
+
+from botocore.exceptions import ClientError
+
+# Error codes AWS services use to signal request throttling
+THROTTLING_ERROR_CODES = frozenset({
+    "ThrottlingException",
+    "Throttling",
+    "TooManyRequestsException",
+    "ProvisionedThroughputExceededException",
+    "RequestLimitExceeded",
+    "LimitExceededException",
+    "SlowDown",
+})
+
+
+def is_throttling_error(error: BaseException) -> bool:
+    if not isinstance(error, ClientError):
+        return False
+    return error.response.get("Error", {}).get("Code") in THROTTLING_ERROR_CODES
+
+
+class AdaptiveRateLimiter:
+    """Token bucket shared by all threads, with a rate that backs off on throttling."""
+
+    def __init__(self, rate: float, burst: float, min_rate: float,
+                 backoff_factor: float = 0.5, recovery_per_success: float = 0.1):
+        """
+        Args:
+            rate: Requests per second allowed, also the ceiling the rate recovers to
+            burst: Bucket size, i.e. requests allowed back to back after a quiet period
+            min_rate: Floor the rate never backs off below
+            backoff_factor: Multiplier applied to the rate on each throttling error
+            recovery_per_success: Requests per second added back on each success
+        """
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.backoff_factor = backoff_factor
+        self.recovery_per_success = recovery_per_success
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.throttled = 0
+        self.retries = 0
+        self.wait_seconds = 0.0
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, amount: float = 1) -> float:
+        """
+        Block until amount tokens can be taken, and take them.
+
+        Amounts larger than the bucket only wait for a full bucket; the balance
+        goes negative, so later callers wait for the debt to be refilled.
+
+        Returns:
+            Seconds spent waiting
+        """
+        start = time.monotonic()
+        needed = min(amount, self.burst)
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= needed:
+                    self._tokens -= amount
+                    waited = now - start
+                    self.wait_seconds += waited
+                    return waited
+                delay = (needed - self._tokens) / self.rate
+            time.sleep(delay)
+
+    def adjust(self, amount: float) -> None:
+        """Take amount more tokens (or give them back if negative) once the real cost is known."""
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens - amount)
+
+    def on_success(self) -> None:
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.recovery_per_success)
+
+    def on_throttle(self) -> None:
+        with self._lock:
+            self.throttled += 1
+            self.rate = max(self.min_rate, self.rate * self.backoff_factor)
+            # Drop saved-up tokens so the callers already waiting don't burst into the limit again
+            self._tokens = min(self._tokens, 0)
+
+    def reset(self) -> None:
+        """Back to the full rate and a full bucket, with the counters cleared."""
+        with self._lock:
+            self.rate = self.max_rate
+            self._tokens = self.burst
+            self._updated = time.monotonic()
+            self.throttled = 0
+            self.retries = 0
+            self.wait_seconds = 0.0
+
+    def call(self, fn: Callable[[], Any], max_retries: int, base_delay: float) -> Any:
+        """
+        Call fn under the rate limit, retrying throttling errors with jittered backoff.
+
+        Raises:
+            ClientError: The last throttling error once retries run out, or any other error
+        """
+        for attempt in range(max_retries + 1):
+            self.acquire()
+            try:
+                result = fn()
+            except ClientError as e:
+                if not is_throttling_error(e):
+                    raise
+                self.on_throttle()
+                if attempt == max_retries:
+                    raise
+                with self._lock:
+                    self.retries += 1
+                time.sleep(base_delay * (2 ** attempt) * random.uniform(0.5, 1.5))
+                continue
+            self.on_success()
+            return result
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "rate": round(self.rate, 3),
+                "max_rate": self.max_rate,
+                "throttled": self.throttled,
+                "retries": self.retries,
+                "wait_seconds": round(self.wait_seconds, 3),
+            }
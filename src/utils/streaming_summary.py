@@ -0,0 +1,142 @@
+"""
+Streaming extract-to-summarize pipeline.
+Pages are summarized in chunks while later pages are still being extracted,
+partial summaries are written as soon as they are ready and the final summary
+is streamed token by token. Time to first output is measured for each run.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional
+
+from .summarization import (
+    CHARS_PER_TOKEN,
+    PAGE_BREAK,
+    STREAM_MAP_PROMPT,
+    SUMMARY_PROMPT,
+    ChunkedSummarizer,
+    NoTextError,
+    split_text,
+    stream_text,
+)
+
+
+class StreamingSummaryPipeline:
+    """Summarizes a stream of extracted pages, writing output as soon as any is ready."""
+
+    def __init__(self, summarizer: ChunkedSummarizer, write: Callable[[str], None]):
+        """
+        Args:
+            summarizer: Summarizer providing the model, budget, concurrency and cache
+            write: Called with each piece of output text as it becomes available
+        """
+        self.summarizer = summarizer
+        self._write = write
+        self._start = 0.0
+        self.first_page_seconds: Optional[float] = None
+        self.first_output_seconds: Optional[float] = None
+
+    def _elapsed(self) -> float:
+        return time.perf_counter() - self._start
+
+    def write(self, text: str) -> None:
+        if self.first_output_seconds is None:
+            self.first_output_seconds = self._elapsed()
+        self._write(text)
+
+    def run(self, pages: Iterable[dict]) -> Dict[str, object]:
+        """
+        Summarize pages ({"page", "text"} dictionaries, optionally with "cached") in order.
+
+        Pages marked cached arrive all at once, so their chunks aren't sent to the
+        model before the summary cache has been checked.
+
+        Returns:
+            Timing and size statistics for the run
+        """
+        self._start = time.perf_counter()
+        self.first_page_seconds = self.first_output_seconds = None
+        summarizer = self.summarizer
+        max_chars = summarizer.max_chunk_tokens * CHARS_PER_TOKEN
+        executor = ThreadPoolExecutor(max_workers=summarizer.concurrency)
+        futures = []
+        written = 0
+        page_texts: List[str] = []
+        pending: List[str] = []
+        pending_chars = 0
+        defer = False
+
+        def submit(texts: List[str]) -> None:
+            for chunk in split_text(PAGE_BREAK.join(texts), summarizer.max_chunk_tokens):
+                prompt = STREAM_MAP_PROMPT.format(index=len(futures) + 1, text=chunk)
+                futures.append(executor.submit(summarizer.invoke, prompt))
+
+        def write_ready(block: bool) -> None:
+            # Partial summaries are written in document order as each becomes ready
+            nonlocal written
+            while written < len(futures) and (block or futures[written].done()):
+                self.write(f"[part {written + 1}] {futures[written].result()}\n\n")
+                written += 1
+
+        try:
+            for page in pages:
+                if self.first_page_seconds is None:
+                    self.first_page_seconds = self._elapsed()
+                text = page["text"]
+                page_texts.append(text)
+                defer = defer or page.get("cached", False)
+                if pending and pending_chars + len(text) > max_chars and not defer:
+                    submit(pending)
+                    pending, pending_chars = [], 0
+                pending.append(text)
+                pending_chars += len(text) + len(PAGE_BREAK)
+                write_ready(block=False)
+
+            document = PAGE_BREAK.join(page_texts)
+            cached = summarizer.cached_summary(document)
+            if cached is not None:
+                for future in futures:
+                    future.cancel()
+                self.write("Summary:\n" + cached + "\n")
+                return self._stats(len(page_texts), chunks=0, cached=True)
+
+            if not futures:
+                chunks = split_text(document, summarizer.max_chunk_tokens)
+                if not chunks:
+                    raise NoTextError("No text to summarize")
+                if len(chunks) == 1:
+                    summary = self._stream_final(SUMMARY_PROMPT.format(text=chunks[0]))
+                    summarizer.store_summary(document, summary)
+                    return self._stats(len(page_texts), chunks=1, cached=False)
+            if pending:
+                submit(pending)
+            write_ready(block=True)
+            summaries = [future.result() for future in futures]
+            if len(summaries) == 1:
+                summary = summaries[0]
+                self.write("Summary:\n" + summary + "\n")
+            else:
+                summary = self._stream_final(summarizer.reduce_prompt(summaries))
+            summarizer.store_summary(document, summary)
+            return self._stats(len(page_texts), chunks=len(futures), cached=False)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _stream_final(self, prompt: str) -> str:
+        self.write("Summary:\n")
+        pieces = []
+        for piece in stream_text(self.summarizer.model, prompt):
+            pieces.append(piece)
+            self.write(piece)
+        self.write("\n")
+        return "".join(pieces)
+
+    def _stats(self, pages: int, chunks: int, cached: bool) -> Dict[str, object]:
+        return {
+            "pages": pages,
+            "chunks": chunks,
+            "cached": cached,
+            "first_page_seconds": self.first_page_seconds,
+            "first_output_seconds": self.first_output_seconds,
+            "total_seconds": self._elapsed(),
+        }
@@ -0,0 +1,65 @@
+"""
+Local stand-in for the Gemini chat model.
+Answers every prompt after a fixed delay with the opening words of the text
+being summarized, whole or streamed word by word, so summarization can be
+run and timed without API access.
+"""
+
+import threading
+import time
+
+
+class StubMessage:
+    """Minimal chat response carrying only its content."""
+
+    def __init__(self, content: str):
+        self.content = content
+
+
+class StubChatModel:
+    """Chat model with a fixed per-call latency that records how calls overlap."""
+
+    def __init__(self, latency: float = 0.05, summary_words: int = 40, token_latency: float = 0.0):
+        self.latency = latency
+        self.summary_words = summary_words
+        self.token_latency = token_latency
+        self.model = "stub"
+        self.calls = 0
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def _answer(self, prompt: str) -> str:
+        # Prompts end with the text after a blank line; summarize it as its first words
+        text = prompt.split("\n\n", 1)[-1]
+        return " ".join(text.split()[:self.summary_words])
+
+    def _start(self) -> None:
+        with self._lock:
+            self.calls += 1
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+
+    def _finish(self) -> None:
+        with self._lock:
+            self.active -= 1
+
+    def invoke(self, prompt: str, config=None) -> StubMessage:
+        self._start()
+        try:
+            time.sleep(self.latency)
+            return StubMessage(self._answer(prompt))
+        finally:
+            self._finish()
+
+    def stream(self, prompt: str):
+        """Yield the answer word by word: latency before the first word, token_latency between words."""
+        self._start()
+        try:
+            time.sleep(self.latency)
+            for i, word in enumerate(self._answer(prompt).split(" ")):
+                if i:
+                    time.sleep(self.token_latency)
+                yield StubMessage(word if i == 0 else " " + word)
+        finally:
+            self._finish()
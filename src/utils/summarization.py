@@ -0,0 +1,386 @@
+"""
+Map-reduce summarization for documents too long for a single prompt.
+Splits text on page and paragraph boundaries within a token budget,
+summarizes the chunks concurrently and combines the partial summaries,
+in several rounds when they don't fit in one prompt.
+"""
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .config import Config
+from .summary_cache import SummaryCache, SummaryKeyBuilder, make_summary_key
+
+# Separates pages in extracted text
+PAGE_BREAK = "\f"
+
+# Boundaries text is split on, coarsest first
+SEPARATORS = (PAGE_BREAK, "\n\n", "\n", " ")
+
+# Rough characters per token for English text; no tokenizer is needed for budgeting
+CHARS_PER_TOKEN = 4
+
+SUMMARY_PROMPT = "Summarize the following document:\n\n{text}"
+MAP_PROMPT = "Summarize the following excerpt (part {index} of {total}) of a longer document:\n\n{text}"
+# For chunks of text still being read, when the number of parts isn't known yet
+STREAM_MAP_PROMPT = "Summarize the following excerpt (part {index}) of a longer document:\n\n{text}"
+REDUCE_PROMPT = (
+    "The following are summaries of consecutive parts of one document. "
+    "Combine them into a single summary of the whole document:\n\n{text}"
+)
+
+
+class NoTextError(ValueError):
+    """Raised when the input to summarize is empty or blank."""
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def split_text(text: str, max_tokens: int, separators: Sequence[str] = SEPARATORS) -> List[str]:
+    """
+    Split text into chunks of at most max_tokens, preferring the coarsest boundaries.
+
+    Pages are packed together while they fit; a page that doesn't fit on its own
+    is split into paragraphs, then lines, then words.
+
+    Args:
+        text: Text to split; pages are separated by PAGE_BREAK
+        max_tokens: Token budget per chunk
+        separators: Boundaries to split on, coarsest first
+
+    Returns:
+        Non-empty chunks in document order
+    """
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return [text] if text.strip() else []
+    if not separators:
+        return [text[i:i + max_chars] for i in range(0, len(text), max_chars)]
+    separator, finer = separators[0], separators[1:]
+    chunks: List[str] = []
+    current: List[str] = []
+    current_chars = 0
+    for part in text.split(separator):
+        if not part.strip():
+            continue
+        if len(part) > max_chars:
+            if current:
+                chunks.append(separator.join(current))
+                current, current_chars = [], 0
+            chunks.extend(split_text(part, max_tokens, finer))
+            continue
+        added = len(part) + (len(separator) if current else 0)
+        if current and current_chars + added > max_chars:
+            chunks.append(separator.join(current))
+            current, current_chars = [part], len(part)
+        else:
+            current.append(part)
+            current_chars += added
+    if current:
+        chunks.append(separator.join(current))
+    return chunks
+
+
+def join_pages(lines: List[dict]) -> str:
+    """Rebuild page-separated text from Textract lines ({"text", "page"}) in the "lines" format."""
+    pages: dict = {}
+    for line in lines:
+        pages.setdefault(line.get("page", 1), []).append(line["text"])
+    return PAGE_BREAK.join("\n".join(pages[page]) for page in sorted(pages))
+
+
+def response_text(response: Any) -> str:
+    """Text of a chat model response, which may be a message or a plain string."""
+    return response.content if hasattr(response, "content") else str(response)
+
+
+def stream_text(model: Any, prompt: str) -> Iterator[str]:
+    """Yield the model's answer piece by piece, or whole if the model can't stream."""
+    if not hasattr(model, "stream"):
+        yield response_text(model.invoke(prompt))
+        return
+    for chunk in model.stream(prompt):
+        text = response_text(chunk)
+        if text:
+            yield text
+
+
+def get_summary_model(model_name: str):
+    """Build the chat model for model_name; "stub" gives the local stub model."""
+    if model_name == "stub":
+        from src.utils.stub_model import StubChatModel
+        return StubChatModel()
+    from langchain_google_genai import ChatGoogleGenerativeAI
+    return ChatGoogleGenerativeAI(model=model_name)
+
+
+class ChunkedSummarizer:
+    """Summarizes long text by mapping over chunks and reducing the partial summaries."""
+
+    def __init__(self, model: Any, max_chunk_tokens: int, concurrency: int, hierarchical: bool = True,
+                 cache=None, model_name: str = "", use_cache: bool = True, compress_tokens: int = 0):
+        """
+        Args:
+            model: Chat model with an invoke(prompt) method
+            max_chunk_tokens: Token budget for each chunk and each reduce prompt
+            concurrency: Model calls made in parallel
+            hierarchical: Reduce in rounds while the partial summaries exceed the budget;
+                otherwise combine them all in one prompt
+            cache: Optional SummaryCache for finished summaries
+            model_name: Model name used in cache keys
+            use_cache: Read summaries from the cache; new summaries are stored either way
+            compress_tokens: Extractively compress longer text to about this many tokens
+                before summarizing (0 to send the text as is)
+        """
+        self.model = model
+        self.max_chunk_tokens = max_chunk_tokens
+        self.concurrency = concurrency
+        self.hierarchical = hierarchical
+        self.cache = cache
+        self.model_name = model_name
+        self.use_cache = use_cache
+        self.compress_tokens = compress_tokens
+
+    def prompt_fingerprint(self) -> str:
+        """Prompts and settings that change the summary, for cache keys."""
+        return "\0".join([
+            SUMMARY_PROMPT, MAP_PROMPT, STREAM_MAP_PROMPT, REDUCE_PROMPT,
+            str(self.max_chunk_tokens), str(self.hierarchical), str(self.compress_tokens),
+        ])
+
+    def invoke(self, prompt: str) -> str:
+        return response_text(self.model.invoke(prompt))
+
+    def _invoke_all(self, prompts: List[str]) -> List[str]:
+        if len(prompts) == 1:
+            return [self.invoke(prompts[0])]
+        with ThreadPoolExecutor(max_workers=min(self.concurrency, len(prompts))) as executor:
+            return list(executor.map(self.invoke, prompts))
+
+    def _group(self, summaries: List[str]) -> List[List[str]]:
+        """Pack summaries into reduce groups that fit the budget, at least two per group."""
+        max_chars = self.max_chunk_tokens * CHARS_PER_TOKEN
+        groups: List[List[str]] = []
+        current: List[str] = []
+        current_chars = 0
+        for summary in summaries:
+            # A group of one wouldn't shrink anything, so the second summary always joins
+            if len(current) >= 2 and current_chars + len(summary) > max_chars:
+                groups.append(current)
+                current, current_chars = [], 0
+            current.append(summary)
+            current_chars += len(summary) + 2
+        if len(current) == 1 and groups:
+            groups[-1].extend(current)
+        elif current:
+            groups.append(current)
+        return groups
+
+    def reduce_prompt(self, summaries: List[str]) -> str:
+        """Reduce summaries in rounds until they fit the budget, and return the final reduce prompt."""
+        while self.hierarchical and estimate_tokens("\n\n".join(summaries)) > self.max_chunk_tokens:
+            groups = self._group(summaries)
+            if len(groups) == 1:
+                break
+            summaries = self._invoke_all([REDUCE_PROMPT.format(text="\n\n".join(g)) for g in groups])
+        return REDUCE_PROMPT.format(text="\n\n".join(summaries))
+
+    def reduce(self, summaries: List[str]) -> str:
+        if len(summaries) == 1:
+            return summaries[0]
+        return self.invoke(self.reduce_prompt(summaries))
+
+    def cache_key(self, text: str) -> str:
+        return make_summary_key(text, self.model_name, self.prompt_fingerprint())
+
+    def _cached(self, key: str) -> Optional[str]:
+        cached = self.cache.get(key)
+        return cached["summary"] if cached is not None else None
+
+    def cached_summary(self, text: str) -> Optional[str]:
+        """Return the cached summary of text, or None on a miss or when the cache is bypassed."""
+        if self.cache is None or not self.use_cache:
+            return None
+        return self._cached(self.cache_key(text))
+
+    def cached_summary_of_chunks(self, chunks: Iterable[str]) -> Optional[str]:
+        """
+        Like cached_summary for text read as chunks, hashing them one at a time. Lets
+        callers that can read their input twice check the cache before summarize_chunks.
+        """
+        if self.cache is None or not self.use_cache:
+            return None
+        builder = SummaryKeyBuilder()
+        for chunk in chunks:
+            builder.update(chunk)
+        return self._cached(builder.key(self.model_name, self.prompt_fingerprint()))
+
+    def _store(self, key: str, summary: str) -> None:
+        if self.cache is not None:
+            self.cache.put(key, {"summary": summary, "model": self.model_name})
+
+    def store_summary(self, text: str, summary: str) -> None:
+        if self.cache is not None:
+            self._store(self.cache_key(text), summary)
+
+    def compress(self, text: str) -> Tuple[str, Optional[Dict[str, float]]]:
+        """Compress text to the compress_tokens budget, returning it with the compression stats (None if skipped)."""
+        if not self.compress_tokens or estimate_tokens(text) <= self.compress_tokens:
+            return text, None
+        from src.utils.text_compression import compress_text
+        return compress_text(text, self.compress_tokens)
+
+    def summarize(self, text: str) -> str:
+        """
+        Summarize text, from the cache when possible and with a single prompt when it fits in one chunk.
+
+        Raises:
+            NoTextError: If text is empty
+        """
+        return self.summarize_with_stats(text)[0]
+
+    def summarize_with_stats(self, text: str) -> Tuple[str, Optional[Dict[str, float]]]:
+        """Like summarize, also returning the compression stats (None when cached or not compressed)."""
+        cached = self.cached_summary(text)
+        if cached is not None:
+            return cached, None
+        compressed, stats = self.compress(text)
+        summary = self._summarize(compressed)
+        self.store_summary(text, summary)
+        return summary, stats
+
+    def summarize_chunks(self, chunks: Iterable[str]) -> str:
+        """
+        Summarize text arriving as chunks of at most max_chunk_tokens, e.g. from text_input.read_chunks.
+
+        Memory stays bounded however many chunks there are: at most concurrency
+        chunks are being summarized at once, and whenever the partial summaries
+        outgrow the budget they are reduced into one. Input that turns out to be
+        a single chunk is summarized like summarize, with the cache and compression.
+
+        Longer input is keyed in the summary cache by hashing the chunks as they
+        are read. The key is known once the input ends; a hit then skips the chunks
+        not yet summarized and the final reduce.
+
+        Raises:
+            NoTextError: If there are no chunks
+        """
+        builder = SummaryKeyBuilder()
+
+        def hashed(chunks: Iterable[str]) -> Iterator[str]:
+            for chunk in chunks:
+                builder.update(chunk)
+                yield chunk
+
+        chunks = hashed(chunks)
+        first = next(chunks, None)
+        if first is None:
+            raise NoTextError("No text to summarize")
+        second = next(chunks, None)
+        if second is None:
+            return self.summarize(first)
+
+        summaries: List[str] = []
+        in_flight = deque()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+
+            def collect() -> None:
+                summaries.append(in_flight.popleft().result())
+                if len(summaries) > 1 and estimate_tokens("\n\n".join(summaries)) > self.max_chunk_tokens:
+                    summaries[:] = [self.invoke(REDUCE_PROMPT.format(text="\n\n".join(summaries)))]
+
+            for index, chunk in enumerate(chain((first, second), chunks), start=1):
+                if len(in_flight) >= self.concurrency:
+                    collect()
+                in_flight.append(executor.submit(
+                    self.invoke, STREAM_MAP_PROMPT.format(index=index, text=chunk)
+                ))
+
+            key = builder.key(self.model_name, self.prompt_fingerprint())
+            cached = self._cached(key) if self.cache is not None and self.use_cache else None
+            if cached is not None:
+                for future in in_flight:
+                    future.cancel()
+                return cached
+            while in_flight:
+                collect()
+        summary = self.reduce(summaries)
+        self._store(key, summary)
+        return summary
+
+    def _summarize(self, text: str) -> str:
+        chunks = split_text(text, self.max_chunk_tokens)
+        if not chunks:
+            raise NoTextError("No text to summarize")
+        if len(chunks) == 1:
+            return self.invoke(SUMMARY_PROMPT.format(text=chunks[0]))
+        summaries = self._invoke_all([
+            MAP_PROMPT.format(index=i, total=len(chunks), text=chunk)
+            for i, chunk in enumerate(chunks, start=1)
+        ])
+        return self.reduce(summaries)
+
+
+def add_summary_arguments(parser) -> None:
+    """Add the summarization options shared by the summarizing command-line tools."""
+    parser.add_argument("--model", default=Config.SUMMARY_MODEL,
+                        help='Chat model to summarize with ("stub" for the local stub model)')
+    parser.add_argument("--chunk-tokens", type=int, default=Config.SUMMARY_CHUNK_TOKENS,
+                        help="Token budget per chunk; longer documents are summarized in chunks")
+    parser.add_argument("--concurrency", type=int, default=Config.SUMMARY_CONCURRENCY,
+                        help="Chunks summarized in parallel")
+    parser.add_argument("--flat-reduce", action="store_true", default=not Config.SUMMARY_HIERARCHICAL,
+                        help="Combine all chunk summaries in one prompt instead of in rounds "
+                             "(the default when SUMMARY_HIERARCHICAL=false)")
+    parser.add_argument("--rpm", type=float, default=Config.SUMMARY_REQUESTS_PER_MINUTE,
+                        help="Model requests per minute (0 for no limit)")
+    parser.add_argument("--tpm", type=float, default=Config.SUMMARY_TOKENS_PER_MINUTE,
+                        help="Model tokens per minute (0 for no limit)")
+    parser.add_argument("--compress-tokens", type=int, default=Config.SUMMARY_COMPRESS_TOKENS,
+                        help="Drop repeated headers and low-ranked sentences to fit this many tokens "
+                             "before summarizing (0 to disable)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Bypass cached summaries (the new summary is still cached)")
+    parser.add_argument("--clear-cache", action="store_true",
+                        help="Clear the summary cache before summarizing")
+
+
+def get_summary_cache():
+    """Build the summary cache from Config, or None when it is disabled."""
+    if not Config.SUMMARY_CACHE_ENABLED:
+        return None
+    return SummaryCache(
+        Config.SUMMARY_CACHE_DIR,
+        max_bytes=Config.SUMMARY_CACHE_MAX_BYTES,
+        ttl_seconds=Config.SUMMARY_CACHE_TTL_SECONDS,
+    )
+
+
+def build_summarizer(args) -> ChunkedSummarizer:
+    from src.utils.model_quota import RateLimitedModel
+
+    cache = get_summary_cache()
+    if cache is not None and args.clear_cache:
+        cache.clear()
+    model = get_summary_model(args.model)
+    if args.rpm > 0 or args.tpm > 0:
+        model = RateLimitedModel(
+            model,
+            requests_per_minute=args.rpm,
+            tokens_per_minute=args.tpm,
+            expected_output_tokens=Config.SUMMARY_EXPECTED_OUTPUT_TOKENS,
+        )
+    return ChunkedSummarizer(
+        model,
+        max_chunk_tokens=args.chunk_tokens,
+        concurrency=args.concurrency,
+        hierarchical=not args.flat_reduce,
+        cache=cache,
+        model_name=args.model,
+        use_cache=not args.no_cache,
+        compress_tokens=args.compress_tokens,
+    )
@@ -0,0 +1,63 @@
+"""
+Persistent cache of document summaries.
+Summaries are keyed by a hash of the normalized text, the model name and the
+prompt settings, so re-runs and documents shared between runs skip the model.
+"""
+
+import hashlib
+import re
+import unicodedata
+
+from .textract_cache import TextractResultCache
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Normalize Unicode and collapse whitespace, so trivially different extractions share a key."""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+class SummaryKeyBuilder:
+    """
+    Builds the key make_summary_key gives a text from the text's pieces as they
+    arrive, so streamed input is keyed without being held in memory. Pieces are
+    taken to be separated by whitespace, as read_chunks' chunks are.
+    """
+
+    def __init__(self):
+        self._digest = hashlib.sha256()
+        self._started = False
+
+    def update(self, text: str) -> None:
+        normalized = normalize_text(text)
+        if normalized:
+            self._digest.update(((" " if self._started else "") + normalized).encode("utf-8"))
+            self._started = True
+
+    def key(self, model_name: str, prompt_fingerprint: str) -> str:
+        digest = self._digest.copy()
+        for part in (model_name, prompt_fingerprint):
+            digest.update(b"\0" + part.encode("utf-8"))
+        return digest.hexdigest()
+
+
+def make_summary_key(text: str, model_name: str, prompt_fingerprint: str) -> str:
+    """
+    Build the cache key for a summary.
+
+    Args:
+        text: Document text
+        model_name: Name of the model producing the summary
+        prompt_fingerprint: Prompt templates and settings that change the summary
+
+    Returns:
+        Hex digest identifying the text/model/prompt combination
+    """
+    builder = SummaryKeyBuilder()
+    builder.update(text)
+    return builder.key(model_name, prompt_fingerprint)
+
+
+class SummaryCache(TextractResultCache):
+    """On-disk LRU cache of summaries with a TTL; entries are {"summary", "model"} dictionaries."""
@@ -0,0 +1,225 @@
+"""
+Extractive pre-compression of extracted text before summarization.
+Drops headers and footers repeated across pages, then ranks sentences with
+TextRank over TF-IDF vectors and keeps the best ones, in document order,
+until the token budget is filled. Uses NumPy for the similarity graph when
+it is installed.
+"""
+
+import math
+import re
+from collections import Counter
+from typing import Dict, List, Tuple
+
+from .summarization import PAGE_BREAK, estimate_tokens
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; sparse pure-Python vectors are the fallback
+    np = None
+
+# Lines within this many lines of the top or bottom of a page can be headers or footers
+EDGE_LINES = 3
+
+# Sentences ranked together; windows keep the graph small, so cost grows linearly with length.
+# Without NumPy the graph is walked in Python, so its windows are smaller.
+GRAPH_WINDOW = 256 if np is not None else 64
+
+DAMPING = 0.85
+MAX_ITERATIONS = 50
+# Power iteration stops once no score moves by more than this
+TOLERANCE = 1e-6
+
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+|\n\s*\n")
+WORD = re.compile(r"[a-z][a-z0-9'-]+")
+DIGITS = re.compile(r"\d+")
+
+STOPWORDS = frozenset("""
+a an and are as at be but by for from has have in is it its of on or that the this to was were will with
+""".split())
+
+
+def _line_key(line: str) -> str:
+    # Page numbers and dates change from page to page, so digits don't count
+    return DIGITS.sub("#", " ".join(line.lower().split()))
+
+
+def strip_repeated_lines(pages: List[str], min_fraction: float = 0.5) -> Tuple[List[str], int]:
+    """
+    Remove header and footer lines that repeat on at least min_fraction of the pages.
+
+    Returns:
+        The pages without those lines and the number of lines removed
+    """
+    if len(pages) < 3:
+        return pages, 0
+    split_pages = [page.split("\n") for page in pages]
+    seen = Counter()
+    for lines in split_pages:
+        # Short pages are mostly body, so their edges are at most a third of their lines each
+        edge = min(EDGE_LINES, len(lines) // 3)
+        edges = lines[:edge] + lines[len(lines) - edge:]
+        seen.update({_line_key(line) for line in edges if line.strip()})
+    threshold = max(2, math.ceil(len(pages) * min_fraction))
+    repeated = {key for key, count in seen.items() if count >= threshold}
+    if not repeated:
+        return pages, 0
+    removed = 0
+    stripped = []
+    for lines in split_pages:
+        kept = []
+        edge = min(EDGE_LINES, len(lines) // 3)
+        for index, line in enumerate(lines):
+            at_edge = index < edge or index >= len(lines) - edge
+            if at_edge and _line_key(line) in repeated:
+                removed += 1
+            else:
+                kept.append(line)
+        stripped.append("\n".join(kept))
+    return stripped, removed
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split text into sentences, treating blank lines as boundaries and joining wrapped lines."""
+    sentences = []
+    for part in SENTENCE_END.split(text):
+        sentence = " ".join(part.split())
+        if sentence:
+            sentences.append(sentence)
+    return sentences
+
+
+def _terms(sentence: str) -> List[str]:
+    return [w for w in WORD.findall(sentence.lower()) if w not in STOPWORDS]
+
+
+def _tfidf_vectors(sentences: List[str]) -> List[Dict[str, float]]:
+    """Unit-length TF-IDF vectors, with IDF taken over the sentences of the whole document."""
+    term_counts = [Counter(_terms(s)) for s in sentences]
+    document_frequency = Counter()
+    for counts in term_counts:
+        document_frequency.update(counts.keys())
+    total = len(sentences)
+    vectors = []
+    for counts in term_counts:
+        vector = {t: c * (math.log(total / (1 + document_frequency[t])) + 1) for t, c in counts.items()}
+        norm = math.sqrt(sum(w * w for w in vector.values()))
+        vectors.append({t: w / norm for t, w in vector.items()} if norm else {})
+    return vectors
+
+
+def _textrank_numpy(vectors: List[Dict[str, float]]) -> List[float]:
+    vocabulary = {t: i for i, t in enumerate({t for v in vectors for t in v})}
+    matrix = np.zeros((len(vectors), max(1, len(vocabulary))))
+    for row, vector in enumerate(vectors):
+        for term, weight in vector.items():
+            matrix[row, vocabulary[term]] = weight
+    similarity = matrix @ matrix.T
+    np.fill_diagonal(similarity, 0.0)
+    out_weight = similarity.sum(axis=1, keepdims=True)
+    transition = np.divide(similarity, out_weight, out=np.zeros_like(similarity), where=out_weight > 0)
+    n = len(vectors)
+    scores = np.full(n, 1.0 / n)
+    for _ in range(MAX_ITERATIONS):
+        updated = (1 - DAMPING) / n + DAMPING * (transition.T @ scores)
+        converged = np.abs(updated - scores).max() < TOLERANCE
+        scores = updated
+        if converged:
+            break
+    return scores.tolist()
+
+
+def _textrank_python(vectors: List[Dict[str, float]]) -> List[float]:
+    n = len(vectors)
+    # Similarity of each pair of sentences that share a term, found through an inverted index
+    postings: Dict[str, List[Tuple[int, float]]] = {}
+    for i, vector in enumerate(vectors):
+        for term, weight in vector.items():
+            postings.setdefault(term, []).append((i, weight))
+    similarity: List[Dict[int, float]] = [{} for _ in range(n)]
+    for entries in postings.values():
+        for a, (i, wi) in enumerate(entries):
+            row = similarity[i]
+            for j, wj in entries[a + 1:]:
+                row[j] = row.get(j, 0.0) + wi * wj
+    out_weight = [0.0] * n
+    for i, row in enumerate(similarity):
+        for j, weight in row.items():
+            out_weight[i] += weight
+            out_weight[j] += weight
+    # Incoming edges of each sentence as (neighbour, transition probability)
+    edges: List[List[Tuple[int, float]]] = [[] for _ in range(n)]
+    for i, row in enumerate(similarity):
+        for j, weight in row.items():
+            edges[i].append((j, weight / out_weight[j]))
+            edges[j].append((i, weight / out_weight[i]))
+    scores = [1.0 / n] * n
+    for _ in range(MAX_ITERATIONS):
+        updated = [
+            (1 - DAMPING) / n + DAMPING * sum(scores[j] * p for j, p in edges[i])
+            for i in range(n)
+        ]
+        converged = max(abs(u - s) for u, s in zip(updated, scores)) < TOLERANCE
+        scores = updated
+        if converged:
+            break
+    return scores
+
+
+def rank_sentences(sentences: List[str]) -> List[float]:
+    """
+    TextRank score of each sentence, ranked within windows of GRAPH_WINDOW sentences.
+
+    Scores are scaled by window size so sentences in different windows compare.
+    """
+    vectors = _tfidf_vectors(sentences)
+    textrank = _textrank_numpy if np is not None else _textrank_python
+    scores: List[float] = []
+    for start in range(0, len(vectors), GRAPH_WINDOW):
+        window = vectors[start:start + GRAPH_WINDOW]
+        # Rounded so rounding noise, which differs between the two implementations, cannot reorder ties
+        scores.extend(round(score * len(window), 12) for score in textrank(window))
+    return scores
+
+
+def compress_text(text: str, max_tokens: int) -> Tuple[str, Dict[str, float]]:
+    """
+    Shrink text to about max_tokens by dropping repeated headers and footers and low-ranked sentences.
+
+    Kept sentences stay in document order, one per line, with PAGE_BREAK between pages.
+
+    Returns:
+        The compressed text and statistics including the compression ratio (input / output tokens)
+    """
+    input_tokens = estimate_tokens(text)
+    pages, repeated = strip_repeated_lines(text.split(PAGE_BREAK))
+    stats = {"input_tokens": input_tokens, "repeated_lines_removed": repeated}
+    page_sentences = [split_sentences(page) for page in pages]
+    sentences = [s for page in page_sentences for s in page]
+    if sum(estimate_tokens(s) + 1 for s in sentences) > max_tokens:
+        scores = rank_sentences(sentences)
+        budget = max_tokens
+        keep = set()
+        for index in sorted(range(len(sentences)), key=scores.__getitem__, reverse=True):
+            cost = estimate_tokens(sentences[index]) + 1
+            if cost <= budget:
+                keep.add(index)
+                budget -= cost
+    else:
+        keep = set(range(len(sentences)))
+    kept_pages = []
+    index = 0
+    for page in page_sentences:
+        kept = [s for offset, s in enumerate(page) if index + offset in keep]
+        index += len(page)
+        if kept:
+            kept_pages.append("\n".join(kept))
+    compressed = PAGE_BREAK.join(kept_pages)
+    output_tokens = estimate_tokens(compressed)
+    stats.update(
+        output_tokens=output_tokens,
+        sentences_total=len(sentences),
+        sentences_kept=len(keep),
+        ratio=round(input_tokens / output_tokens, 2) if output_tokens else 0.0,
+    )
+    return compressed, stats
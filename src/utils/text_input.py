@@ -0,0 +1,99 @@
+"""
+Memory-bounded reading of large text inputs for summarization.
+Text is read incrementally from files, gzip files or stdin and cut into
+chunks on the same boundaries split_text prefers, so no more than about two
+chunks of text are held in memory however large the input is.
+"""
+
+import gzip
+import io
+import mmap
+import sys
+from typing import IO, Iterator
+
+from .summarization import CHARS_PER_TOKEN, SEPARATORS
+
+STDIN = "-"
+
+
+def open_text(path: str) -> IO[str]:
+    """Open path for reading text; "-" is stdin and paths ending in .gz are decompressed on the fly."""
+    if path == STDIN:
+        if hasattr(sys.stdin, "buffer"):
+            return io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8", errors="replace")
+        return sys.stdin
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8", errors="replace")
+    return open(path, "r", encoding="utf-8", errors="replace")
+
+
+def _cut(buffer: str, max_chars: int) -> int:
+    """End of the largest prefix of at most max_chars ending on the coarsest boundary available."""
+    for separator in SEPARATORS:
+        index = buffer.rfind(separator, 0, max_chars)
+        if index > 0:
+            return index + len(separator)
+    return max_chars
+
+
+def iter_chunks(stream: IO[str], max_tokens: int) -> Iterator[str]:
+    """
+    Yield non-blank chunks of at most max_tokens from a text stream, reading one chunk at a time.
+
+    Chunks end on page breaks where possible, then paragraphs, lines and words.
+    """
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    buffer = ""
+    eof = False
+    while not eof or buffer:
+        if not eof and len(buffer) <= max_chars:
+            data = stream.read(max_chars)
+            eof = not data
+            buffer += data
+            continue
+        cut = _cut(buffer, max_chars) if len(buffer) > max_chars else len(buffer)
+        chunk, buffer = buffer[:cut], buffer[cut:]
+        if chunk.strip():
+            yield chunk.strip()
+
+
+def iter_mmap_chunks(path: str, max_tokens: int) -> Iterator[str]:
+    """
+    Like iter_chunks for a plain file, slicing a memory map instead of reading.
+
+    Only the slice being decoded is copied into Python memory; the OS pages
+    the rest of the file in and out as needed.
+    """
+    max_bytes = max_tokens * CHARS_PER_TOKEN
+    separators = [separator.encode("utf-8") for separator in SEPARATORS]
+    with open(path, "rb") as f:
+        if not f.seek(0, io.SEEK_END):
+            return  # Empty files can't be mapped
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            size = len(mapped)
+            start = 0
+            while start < size:
+                end = min(start + max_bytes, size)
+                if end < size:
+                    for separator in separators:
+                        index = mapped.rfind(separator, start, end)
+                        if index > start:
+                            end = index + len(separator)
+                            break
+                    else:
+                        # Don't split a multi-byte UTF-8 character
+                        while end > start + 1 and mapped[end] & 0xC0 == 0x80:
+                            end -= 1
+                chunk = mapped[start:end].decode("utf-8", errors="replace").strip()
+                start = end
+                if chunk:
+                    yield chunk
+
+
+def read_chunks(path: str, max_tokens: int, use_mmap: bool = False) -> Iterator[str]:
+    """Yield chunks of path ("-" for stdin, .gz for gzip) of at most max_tokens each."""
+    if use_mmap and path != STDIN and not path.endswith(".gz"):
+        yield from iter_mmap_chunks(path, max_tokens)
+        return
+    with open_text(path) as stream:
+        yield from iter_chunks(stream, max_tokens)
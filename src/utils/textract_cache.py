@@ -0,0 +1,159 @@
+"""
+Content-addressed result cache for Textract extractions.
+Stores extraction results on disk keyed by a hash of the document bytes and
+the requested feature types, with size-bounded LRU eviction and a TTL.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional
+
+
+def make_cache_key(document_bytes: bytes, feature_types: Iterable[str]) -> str:
+    """
+    Build the cache key for a document and its Textract feature types.
+
+    Args:
+        document_bytes: Raw bytes of the document sent to Textract
+        feature_types: Feature types requested (empty for plain text detection)
+
+    Returns:
+        Hex digest identifying the document/feature combination
+    """
+    digest = hashlib.sha256(document_bytes)
+    features = ",".join(sorted(feature_types)) or "DETECT"
+    digest.update(b"\0" + features.encode("ascii"))
+    return digest.hexdigest()
+
+
+def make_file_cache_key(file_path: str, feature_types: Iterable[str],
+                        chunk_size: int = 1024 * 1024) -> str:
+    """
+    Build the same key as make_cache_key by hashing a file in chunks.
+
+    Args:
+        file_path: Path of the document on disk
+        feature_types: Feature types requested (empty for plain text detection)
+        chunk_size: Bytes read per chunk
+
+    Returns:
+        Hex digest identifying the document/feature combination
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    features = ",".join(sorted(feature_types)) or "DETECT"
+    digest.update(b"\0" + features.encode("ascii"))
+    return digest.hexdigest()
+
+
+class TextractResultCache:
+    """On-disk LRU cache of Textract results with a TTL and hit/miss counters."""
+
+    def __init__(self, cache_dir: str, max_bytes: int, ttl_seconds: int):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        # key -> (size in bytes, created_at); ordered least to most recently used
+        self._index: "OrderedDict[str, tuple]" = OrderedDict()
+        self._total_bytes = 0
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load_index()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _load_index(self) -> None:
+        """Rebuild the in-memory index from the files already on disk."""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".json"):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.cache_dir, name))
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, name[:-5], stat.st_size))
+        for mtime, key, size in sorted(entries):
+            self._index[key] = (size, mtime)
+            self._total_bytes += size
+
+    def _is_expired(self, created_at: float) -> bool:
+        return self.ttl_seconds > 0 and time.time() - created_at > self.ttl_seconds
+
+    def _remove(self, key: str) -> None:
+        size, _ = self._index.pop(key)
+        self._total_bytes -= size
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached result for key, or None on a miss or expiry."""
+        with self._lock:
+            entry = self._index.get(key)
+            if entry is None or self._is_expired(entry[1]):
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return None
+            try:
+                with open(self._path(key), "r") as f:
+                    result = json.load(f)
+            except (OSError, ValueError):
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._index.move_to_end(key)
+            self.hits += 1
+            return result
+
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        """Store a result, evicting least recently used entries past max_bytes."""
+        data = json.dumps(result).encode("utf-8")
+        if len(data) > self.max_bytes:
+            return
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with self._lock:
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+            if key in self._index:
+                self._total_bytes -= self._index.pop(key)[0]
+            self._index[key] = (len(data), time.time())
+            self._total_bytes += len(data)
+            while self._total_bytes > self.max_bytes and self._index:
+                self._remove(next(iter(self._index)))
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Remove every cached entry."""
+        with self._lock:
+            for key in list(self._index):
+                self._remove(key)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache counters and occupancy."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._index),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,84 @@
+"""
+Shared Textract client registry.
+Builds one boto3 client per service, region and credential set, with tunable
+connection-pool and retry settings, and reuses it across requests.
+"""
+
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import boto3
+from botocore.config import Config as BotoConfig
+
+
+class TextractClientRegistry:
+    """Thread-safe cache of AWS clients keyed by service, region and credentials."""
+
+    def __init__(self, max_pool_connections: int = 10, max_attempts: int = 3,
+                 retry_mode: str = "standard", connect_timeout: float = 5,
+                 read_timeout: float = 60, endpoint_url: Optional[str] = None):
+        self.endpoint_url = endpoint_url or None
+        self.retry_mode = retry_mode
+        self.boto_config = BotoConfig(
+            max_pool_connections=max_pool_connections,
+            retries={"total_max_attempts": max_attempts, "mode": retry_mode},
+            connect_timeout=connect_timeout,
+            read_timeout=read_timeout,
+        )
+        self._clients: Dict[Tuple, Any] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(service: str, region: str, credentials: Optional[Dict[str, str]], retries: bool) -> Tuple:
+        return (service, region, tuple(sorted((credentials or {}).items())), retries)
+
+    def get(self, region: str, credentials: Optional[Dict[str, str]] = None,
+            service: str = "textract", retries: bool = True):
+        """
+        Return the shared client for a region and credential set.
+
+        Args:
+            region: AWS region name
+            credentials: Optional aws_access_key_id / aws_secret_access_key /
+                aws_session_token overrides; None uses the default chain
+            service: AWS service name; endpoint_url only applies to Textract
+            retries: False for a client that makes a single attempt per call, for
+                callers that retry themselves (the rate limiter retries throttling)
+
+        Returns:
+            A boto3 client for the service
+        """
+        key = self._key(service, region, credentials, retries)
+        client = self._clients.get(key)
+        if client is not None:
+            return client
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                # boto3 sessions are not thread-safe, so each client gets its own
+                session = boto3.session.Session(**(credentials or {}))
+                config = self.boto_config
+                if not retries:
+                    config = config.merge(BotoConfig(
+                        retries={"total_max_attempts": 1, "mode": self.retry_mode}
+                    ))
+                client = session.client(
+                    service,
+                    region_name=region,
+                    endpoint_url=self.endpoint_url if service == "textract" else None,
+                    config=config,
+                )
+                self._clients[key] = client
+            return client
+
+    def close(self) -> None:
+        """Close every client's connection pool and forget the clients."""
+        with self._lock:
+            for client in self._clients.values():
+                close = getattr(client, "close", None)
+                if close is not None:
+                    close()
+            self._clients.clear()
+
+    def __len__(self) -> int:
+        return len(self._clients)
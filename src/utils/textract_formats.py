@@ -0,0 +1,100 @@
+"""
+Response formats for Textract extraction results.
+Shrinks the verbose Textract block list into lighter shapes for callers that
+only need text, lines or a columnar block encoding, and provides a fast JSON
+encoder.
+"""
+
+import json
+from typing import Any, Dict, List
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the standard library encoder is the fallback
+    orjson = None
+
+# full: text plus raw blocks, text: text only, lines: lines with confidence,
+# compact: text plus a columnar block encoding
+RESPONSE_FORMATS = ("full", "text", "lines", "compact")
+
+# Columns of the compact block encoding, in order
+COMPACT_COLUMNS = ("type", "text", "confidence", "page", "bbox", "children")
+
+
+def encode_json(content: Any) -> bytes:
+    """Serialize content to UTF-8 JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _bounding_box(block: Dict[str, Any]) -> List[float]:
+    box = block.get("Geometry", {}).get("BoundingBox")
+    if not box:
+        return []
+    return [round(box["Left"], 4), round(box["Top"], 4), round(box["Width"], 4), round(box["Height"], 4)]
+
+
+def _lines(blocks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [
+        {
+            "text": b.get("Text", ""),
+            "confidence": round(b.get("Confidence", 0.0), 2),
+            "page": b.get("Page", 1),
+        }
+        for b in blocks
+        if b["BlockType"] == "LINE"
+    ]
+
+
+def compact_blocks(blocks: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Encode blocks column by column instead of one verbose object per block.
+
+    Polygons are dropped, bounding boxes become [left, top, width, height]
+    and child relationships point at row indices instead of block ids.
+
+    Args:
+        blocks: Textract blocks
+
+    Returns:
+        Dictionary with the column names and one list per column
+    """
+    row_of = {b["Id"]: i for i, b in enumerate(blocks) if "Id" in b}
+    columns: Dict[str, List[Any]] = {name: [] for name in COMPACT_COLUMNS}
+    for block in blocks:
+        children = []
+        for relationship in block.get("Relationships", []):
+            if relationship.get("Type") == "CHILD":
+                children.extend(row_of[i] for i in relationship.get("Ids", []) if i in row_of)
+        columns["type"].append(block["BlockType"])
+        columns["text"].append(block.get("Text"))
+        columns["confidence"].append(round(block["Confidence"], 2) if "Confidence" in block else None)
+        columns["page"].append(block.get("Page", 1))
+        columns["bbox"].append(_bounding_box(block))
+        columns["children"].append(children)
+    return {"columns": list(COMPACT_COLUMNS), "rows": len(blocks), **columns}
+
+
+def format_result(result: Dict[str, Any], response_format: str = "full") -> Dict[str, Any]:
+    """
+    Reshape an extraction result ({"text", "blocks"}) into the requested format.
+
+    Args:
+        result: Extraction result from extract_text_from_file
+        response_format: One of RESPONSE_FORMATS
+
+    Returns:
+        The reshaped result; error results are returned unchanged
+    """
+    if "error" in result or response_format == "full":
+        return result
+    blocks = result.get("blocks", [])
+    extra = {k: v for k, v in result.items() if k not in ("text", "blocks")}
+    if response_format == "text":
+        return {"text": result.get("text", ""), **extra}
+    if response_format == "lines":
+        return {"text": result.get("text", ""), "lines": _lines(blocks), **extra}
+    if response_format == "compact":
+        return {"text": result.get("text", ""), "blocks": compact_blocks(blocks), **extra}
+    raise ValueError(f"Unknown response format: {response_format}")
@@ -0,0 +1,207 @@
+"""
+Asynchronous Textract jobs for large, multi-page documents.
+Uploads a document to S3, starts a Textract analysis job, polls it and
+collects the results page by page into a local job table.
+"""
+
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+# Job states, in the order a successful job passes through them
+JOB_QUEUED = "queued"
+JOB_UPLOADING = "uploading"
+JOB_RUNNING = "running"
+JOB_COLLECTING = "collecting"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+FINISHED_STATES = (JOB_SUCCEEDED, JOB_FAILED)
+
+
+class TextractJob:
+    """State of one document job, with pages filled in as they complete."""
+
+    def __init__(self, file_path: str, feature_types: List[str]):
+        self.id = uuid.uuid4().hex
+        self.file_path = file_path
+        self.feature_types = feature_types
+        self.status = JOB_QUEUED
+        self.textract_job_id: Optional[str] = None
+        self.total_pages: Optional[int] = None
+        self.pages: Dict[int, Dict[str, Any]] = {}
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.updated_at = self.created_at
+        self._lock = threading.Lock()
+
+    def set_status(self, status: str, error: Optional[str] = None) -> None:
+        with self._lock:
+            self.status = status
+            self.error = error
+            self.updated_at = time.time()
+
+    def add_page(self, page: int, blocks: List[Dict[str, Any]]) -> None:
+        """Record a completed page and its blocks."""
+        lines = [b["Text"] for b in blocks if b["BlockType"] == "LINE"]
+        with self._lock:
+            self.pages[page] = {"page": page, "text": "\n".join(lines), "blocks": blocks}
+            self.updated_at = time.time()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATES
+
+    def completed_pages(self, after: int = 0) -> List[Dict[str, Any]]:
+        """Return completed pages numbered above `after`, in page order."""
+        with self._lock:
+            return [self.pages[p] for p in sorted(self.pages) if p > after]
+
+    def result(self) -> Dict[str, Any]:
+        """Assemble the pages into the same shape /extract-text returns."""
+        pages = self.completed_pages()
+        return {
+            "text": "\n".join(p["text"] for p in pages),
+            "blocks": [b for p in pages for b in p["blocks"]],
+        }
+
+    def to_dict(self, include_blocks: bool = False) -> Dict[str, Any]:
+        pages = self.completed_pages()
+        if not include_blocks:
+            pages = [{"page": p["page"], "text": p["text"]} for p in pages]
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "file_path": self.file_path,
+            "textract_job_id": self.textract_job_id,
+            "total_pages": self.total_pages,
+            "pages_completed": len(pages),
+            "pages": pages,
+            "error": self.error,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+        }
+
+
+def group_blocks_by_page(blocks: List[Dict[str, Any]]) -> Dict[int, List[Dict[str, Any]]]:
+    """Split a flat block list into per-page lists, keyed by page number."""
+    pages: Dict[int, List[Dict[str, Any]]] = {}
+    for block in blocks:
+        pages.setdefault(block.get("Page", 1), []).append(block)
+    return pages
+
+
+class JobTable:
+    """In-memory table of jobs that forgets the oldest finished jobs past max_jobs."""
+
+    def __init__(self, max_jobs: int = 1000):
+        self.max_jobs = max_jobs
+        self._jobs: "OrderedDict[str, TextractJob]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, job: TextractJob) -> None:
+        with self._lock:
+            self._jobs[job.id] = job
+            if len(self._jobs) > self.max_jobs:
+                for job_id in [j.id for j in self._jobs.values() if j.finished]:
+                    if len(self._jobs) <= self.max_jobs:
+                        break
+                    del self._jobs[job_id]
+
+    def get(self, job_id: str) -> Optional[TextractJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def remove(self, job_id: str) -> None:
+        with self._lock:
+            self._jobs.pop(job_id, None)
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+
+def run_textract_job(job: TextractJob, textract, s3, bucket: str, prefix: str = "",
+                     poll_interval: float = 2.0, timeout: float = 0) -> Dict[str, Any]:
+    """
+    Run a job end to end: upload, start, poll and collect pages.
+
+    Textract returns blocks ordered by page, so a page is complete as soon as
+    a block from a later page (or the end of the results) is seen.
+
+    Args:
+        job: Job to run; its status and pages are updated in place
+        textract: boto3 Textract client (or a compatible stand-in)
+        s3: boto3 S3 client used to stage the document
+        bucket: S3 bucket Textract reads the document from
+        prefix: Key prefix for staged documents
+        poll_interval: Seconds between job status polls
+        timeout: Seconds to wait for Textract to finish the job before it is marked
+            failed (0 = no limit); Textract jobs can't be cancelled, so it is only abandoned
+
+    Returns:
+        The assembled result, or a dictionary with an "error" key
+    """
+    s3_key = f"{prefix}{job.id}/{os.path.basename(job.file_path)}"
+    uploaded = False
+    try:
+        job.set_status(JOB_UPLOADING)
+        with open(job.file_path, "rb") as f:
+            s3.upload_fileobj(f, bucket, s3_key)
+        uploaded = True
+
+        location = {"S3Object": {"Bucket": bucket, "Name": s3_key}}
+        if job.feature_types:
+            started = textract.start_document_analysis(
+                DocumentLocation=location, FeatureTypes=job.feature_types
+            )
+            get_results = textract.get_document_analysis
+        else:
+            started = textract.start_document_text_detection(DocumentLocation=location)
+            get_results = textract.get_document_text_detection
+        job.textract_job_id = started["JobId"]
+        job.set_status(JOB_RUNNING)
+
+        deadline = time.monotonic() + timeout if timeout > 0 else None
+        response = get_results(JobId=job.textract_job_id)
+        while response["JobStatus"] == "IN_PROGRESS":
+            if deadline is not None and time.monotonic() + poll_interval > deadline:
+                message = f"Textract job {job.textract_job_id} did not finish within {timeout:g} seconds"
+                job.set_status(JOB_FAILED, error=message)
+                return {"error": message}
+            time.sleep(poll_interval)
+            response = get_results(JobId=job.textract_job_id)
+        if response["JobStatus"] == "FAILED":
+            message = response.get("StatusMessage", "Textract job failed")
+            job.set_status(JOB_FAILED, error=message)
+            return {"error": message}
+
+        job.total_pages = response.get("DocumentMetadata", {}).get("Pages")
+        job.set_status(JOB_COLLECTING)
+        current_page, current_blocks = None, []
+        while True:
+            for block in response.get("Blocks", []):
+                page = block.get("Page", 1)
+                if current_page is not None and page != current_page:
+                    job.add_page(current_page, current_blocks)
+                    current_blocks = []
+                current_page = page
+                current_blocks.append(block)
+            next_token = response.get("NextToken")
+            if not next_token:
+                break
+            response = get_results(JobId=job.textract_job_id, NextToken=next_token)
+        if current_page is not None:
+            job.add_page(current_page, current_blocks)
+        job.set_status(JOB_SUCCEEDED)
+        return job.result()
+    except Exception as e:
+        job.set_status(JOB_FAILED, error=str(e))
+        return {"error": str(e)}
+    finally:
+        if uploaded:
+            try:
+                s3.delete_object(Bucket=bucket, Key=s3_key)
+            except Exception:
+                pass
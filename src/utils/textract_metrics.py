@@ -0,0 +1,77 @@
+"""
+Metrics for the Textract HTTP server.
+Defines the request, phase, size and outcome metrics and a helper for timing
+extraction phases.
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+from .metrics import MetricsRegistry
+
+# Document size buckets in bytes (10 KB .. 500 MB)
+BYTE_BUCKETS = (10e3, 100e3, 500e3, 1e6, 5e6, 10e6, 50e6, 100e6, 500e6)
+
+# Block count buckets
+BLOCK_BUCKETS = (10, 100, 500, 1000, 5000, 10000, 50000, 100000)
+
+# Extraction phases timed by timed_phase
+PHASE_FILE_READ = "file_read"
+PHASE_CACHE_LOOKUP = "cache_lookup"
+PHASE_TEXTRACT = "textract"
+PHASE_SERIALIZATION = "serialization"
+
+metrics = MetricsRegistry()
+
+request_latency = metrics.histogram(
+    "textract_http_request_duration_seconds",
+    "HTTP request latency by route, method and status code.",
+)
+requests_in_flight = metrics.gauge(
+    "textract_http_requests_in_flight",
+    "HTTP requests currently being handled.",
+)
+phase_latency = metrics.histogram(
+    "textract_phase_duration_seconds",
+    "Time spent in each extraction phase.",
+)
+extractions = metrics.counter(
+    "textract_extractions_total",
+    "Document extractions by outcome (ok, cache_hit, coalesced, not_found, too_large, "
+    "throttled, botocore_error, client_error, unexpected_error, pool_full).",
+)
+document_bytes = metrics.histogram(
+    "textract_document_bytes",
+    "Size of documents sent for extraction.",
+    buckets=BYTE_BUCKETS,
+)
+block_count = metrics.histogram(
+    "textract_blocks",
+    "Number of Textract blocks per extracted document.",
+    buckets=BLOCK_BUCKETS,
+)
+
+
+@contextmanager
+def timed_phase(phase: str, timings: Optional[Dict[str, float]] = None):
+    """
+    Time a block of code as one extraction phase.
+
+    Args:
+        phase: Phase name used as the metric label
+        timings: Optional per-request dictionary the duration is also added to
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        phase_latency.observe(elapsed, phase=phase)
+        if timings is not None:
+            timings[phase] = timings.get(phase, 0.0) + elapsed
+
+
+def server_timing_header(timings: Dict[str, float]) -> str:
+    """Format phase durations as a Server-Timing header value (milliseconds)."""
+    return ", ".join(f"{phase};dur={seconds * 1000:.1f}" for phase, seconds in timings.items())
@@ -0,0 +1,129 @@
+"""
+Table and form reconstruction from Textract blocks.
+Builds an id -> block index in one pass, then follows relationships to
+rebuild tables (rows of cells) and form key/value pairs in linear time.
+"""
+
+import csv
+import io
+from typing import Any, Dict, List, Optional
+
+
+def index_blocks(blocks: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Map block ids to blocks."""
+    return {b["Id"]: b for b in blocks if "Id" in b}
+
+
+def related_ids(block: Dict[str, Any], relationship_type: str) -> List[str]:
+    """Return the ids a block points at through one relationship type."""
+    ids: List[str] = []
+    for relationship in block.get("Relationships", []):
+        if relationship.get("Type") == relationship_type:
+            ids.extend(relationship.get("Ids", []))
+    return ids
+
+
+def block_text(block: Dict[str, Any], index: Dict[str, Dict[str, Any]]) -> str:
+    """Join the words (and selection marks) under a cell, key or value block."""
+    parts = []
+    for child_id in related_ids(block, "CHILD"):
+        child = index.get(child_id)
+        if child is None:
+            continue
+        if child["BlockType"] == "WORD":
+            parts.append(child.get("Text", ""))
+        elif child["BlockType"] == "SELECTION_ELEMENT":
+            parts.append("[X]" if child.get("SelectionStatus") == "SELECTED" else "[ ]")
+    return " ".join(parts)
+
+
+def rebuild_table(table: Dict[str, Any], index: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Rebuild one TABLE block as a grid of cell texts.
+
+    Textract reports a cell spanning several positions either as a CELL with a
+    RowSpan/ColumnSpan, or as a MERGED_CELL whose children are the single-position
+    CELLs it covers. Either way the text goes in the top-left position, the other
+    covered positions are left empty, and the span is listed in "merged_cells".
+    """
+    cells = [index[i] for i in related_ids(table, "CHILD") if i in index]
+    cells = [c for c in cells if c["BlockType"] == "CELL"]
+    merged = [index[i] for i in related_ids(table, "MERGED_CELL") if i in index]
+    spanning = [c for c in cells if c.get("RowSpan", 1) > 1 or c.get("ColumnSpan", 1) > 1]
+    spanning += [m for m in merged if m["BlockType"] == "MERGED_CELL"]
+    row_count = max((c["RowIndex"] + c.get("RowSpan", 1) - 1 for c in cells + spanning), default=0)
+    column_count = max((c["ColumnIndex"] + c.get("ColumnSpan", 1) - 1 for c in cells + spanning), default=0)
+    rows = [[""] * column_count for _ in range(row_count)]
+    for cell in cells:
+        rows[cell["RowIndex"] - 1][cell["ColumnIndex"] - 1] = block_text(cell, index)
+    merged_cells = []
+    for span in spanning:
+        top, left = span["RowIndex"] - 1, span["ColumnIndex"] - 1
+        bottom, right = top + span.get("RowSpan", 1), left + span.get("ColumnSpan", 1)
+        # A merged cell's words sit in whichever of its cells Textract put them
+        texts = [rows[r][c] for r in range(top, bottom) for c in range(left, right) if rows[r][c]]
+        for r in range(top, bottom):
+            for c in range(left, right):
+                rows[r][c] = ""
+        rows[top][left] = " ".join(texts)
+        merged_cells.append({
+            "row": top + 1,
+            "column": left + 1,
+            "row_span": bottom - top,
+            "column_span": right - left,
+        })
+    return {
+        "page": table.get("Page", 1),
+        "row_count": row_count,
+        "column_count": column_count,
+        "confidence": table.get("Confidence"),
+        "rows": rows,
+        "merged_cells": merged_cells,
+    }
+
+
+def rebuild_form_field(key: Dict[str, Any], index: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """Rebuild one KEY block and the VALUE block it points at."""
+    value: Optional[Dict[str, Any]] = None
+    for value_id in related_ids(key, "VALUE"):
+        value = index.get(value_id)
+        if value is not None:
+            break
+    return {
+        "page": key.get("Page", 1),
+        "key": block_text(key, index),
+        "value": block_text(value, index) if value is not None else "",
+        "confidence": key.get("Confidence"),
+    }
+
+
+def table_to_csv(table: Dict[str, Any]) -> str:
+    """Render a rebuilt table's rows as CSV text."""
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="\n").writerows(table["rows"])
+    return buffer.getvalue()
+
+
+def extract_structure(blocks: List[Dict[str, Any]], include_csv: bool = False) -> Dict[str, Any]:
+    """
+    Rebuild every table and form key/value pair in a block list.
+
+    Args:
+        blocks: Textract blocks from analyze_document with TABLES and FORMS
+        include_csv: Add a "csv" rendering to each table
+
+    Returns:
+        Dictionary with "tables" and "forms" lists, in document order
+    """
+    index = index_blocks(blocks)
+    tables, forms = [], []
+    for block in blocks:
+        block_type = block["BlockType"]
+        if block_type == "TABLE":
+            table = rebuild_table(block, index)
+            if include_csv:
+                table["csv"] = table_to_csv(table)
+            tables.append(table)
+        elif block_type == "KEY_VALUE_SET" and "KEY" in block.get("EntityTypes", []):
+            forms.append(rebuild_form_field(block, index))
+    return {"tables": tables, "forms": forms}
@@ -0,0 +1,308 @@
+"""
+Cache of toolbox tool results for the agents.
+Read-only tools are answered from memory for a per-tool TTL, keyed by their
+normalized arguments, so repeated lookups within and across sessions skip the
+toolbox and Postgres round trip. Write tools invalidate the entries whose data
+they change, and hit rates are tracked per tool.
+"""
+
+import asyncio
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+from langchain_core.tools import BaseTool, StructuredTool
+
+from .config import Config
+
+_WHITESPACE = re.compile(r"\s+")
+
+# Handed to callers waiting on a shared call whose owner was cancelled
+_ABANDONED = object()
+
+
+class ToolCachePolicy:
+    """How one tool's results are cached, and what its calls invalidate."""
+
+    def __init__(self, ttl_seconds: float = 0, reads: Sequence[str] = (),
+                 invalidates: Optional[Dict[str, Optional[str]]] = None,
+                 case_insensitive: Sequence[str] = (), numeric: Sequence[str] = ()):
+        """
+        Args:
+            ttl_seconds: How long results are reused (0 = not cached)
+            reads: Data the results depend on, e.g. "bookings"; writes to it drop them
+            invalidates: Data each call changes, mapped to the argument that narrows it (None = all of it).
+                {"availability": "hotel_id"} drops cached results reading "availability" that were
+                called with the same hotel_id
+            case_insensitive: Arguments matched case-insensitively (ILIKE searches), folded in the key
+            numeric: Integer arguments (ids), which models send as numbers or digit strings;
+                both are keyed as the integer. Other digit strings stay strings ("007" isn't 7)
+        """
+        self.ttl_seconds = ttl_seconds
+        self.reads = tuple(reads)
+        self.invalidates = dict(invalidates or {})
+        self.case_insensitive = frozenset(case_insensitive)
+        self.numeric = frozenset(numeric)
+
+
+# Policies for config/toolset_hotel_agent.yaml. Hotels and tiers rarely change; bookings and
+# availability change with every create-booking, which drops what it affects.
+HOTEL_TOOL_POLICIES: Dict[str, ToolCachePolicy] = {
+    "list-hotels": ToolCachePolicy(300, reads=("hotels", "tiers")),
+    "search-hotels-by-name": ToolCachePolicy(300, reads=("hotels",), case_insensitive=("name",)),
+    "search-hotels-by-location": ToolCachePolicy(300, reads=("hotels",), case_insensitive=("location",)),
+    "list-hotel-tiers": ToolCachePolicy(3600, reads=("tiers",)),
+    "get-hotel-tier-by-id": ToolCachePolicy(3600, reads=("tiers",), numeric=("id",)),
+    "list-bookings": ToolCachePolicy(30, reads=("bookings",)),
+    "get-upcoming-bookings": ToolCachePolicy(30, reads=("bookings",)),
+    "check-hotel-availability": ToolCachePolicy(30, reads=("availability",), numeric=("hotel_id",)),
+    "create-booking": ToolCachePolicy(invalidates={"bookings": None, "availability": "hotel_id"},
+                                      numeric=("hotel_id",)),
+}
+
+
+def parse_ttl_overrides(value: str) -> Dict[str, float]:
+    """Parse "tool=seconds,tool=seconds" (as in TOOL_CACHE_TTLS) into a dict."""
+    overrides = {}
+    for item in value.split(","):
+        if item.strip():
+            name, _, seconds = item.partition("=")
+            overrides[name.strip()] = float(seconds)
+    return overrides
+
+
+def normalize_value(value: Any, fold_case: bool = False, numeric: bool = False) -> Any:
+    if isinstance(value, str):
+        value = _WHITESPACE.sub(" ", value).strip()
+        if fold_case:
+            value = value.casefold()
+        # Integer ids arrive as numbers or digit strings depending on the model
+        return int(value) if numeric and value.isdigit() else value
+    if numeric and isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def normalize_args(args: Dict[str, Any], policy: ToolCachePolicy) -> Dict[str, Any]:
+    return {
+        name: normalize_value(value, name in policy.case_insensitive, name in policy.numeric)
+        for name, value in args.items()
+        if value is not None
+    }
+
+
+def make_tool_key(tool_name: str, args: Dict[str, Any]) -> str:
+    return tool_name + json.dumps(args, sort_keys=True, separators=(",", ":"), default=str)
+
+
+class ToolResultCache:
+    """In-memory LRU of tool results with per-tool TTLs and invalidation by the data they read."""
+
+    def __init__(self, policies: Dict[str, ToolCachePolicy], max_entries: int = 10000,
+                 ttl_overrides: Optional[Dict[str, float]] = None):
+        """
+        Args:
+            policies: Policy per tool name; tools without one are called uncached
+            max_entries: Entries kept before the least recently used are evicted
+            ttl_overrides: TTL per tool name replacing its policy's (0 turns caching off)
+        """
+        self.policies = dict(policies)
+        for name, ttl in (ttl_overrides or {}).items():
+            policy = self.policies.get(name)
+            if policy is not None:
+                self.policies[name] = ToolCachePolicy(ttl, policy.reads, policy.invalidates,
+                                                      policy.case_insensitive, policy.numeric)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # key -> (expires_at, result, tool name, normalized args)
+        self._entries: "OrderedDict[str, Tuple[float, Any, str, Dict[str, Any]]]" = OrderedDict()
+        # Bumped on every invalidation of a data name, so calls that started before it don't store stale results
+        self._generations: Dict[str, int] = {}
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._tool_stats: Dict[str, Dict[str, int]] = {}
+
+    def policy(self, tool_name: str) -> Optional[ToolCachePolicy]:
+        return self.policies.get(tool_name)
+
+    def _count(self, tool_name: str, outcome: str, amount: int = 1) -> None:
+        stats = self._tool_stats.setdefault(
+            tool_name, {"hits": 0, "misses": 0, "coalesced": 0, "invalidated": 0, "writes": 0}
+        )
+        stats[outcome] += amount
+
+    def generation(self, policy: ToolCachePolicy) -> Tuple[int, ...]:
+        with self._lock:
+            return tuple(self._generations.get(name, 0) for name in policy.reads)
+
+    def get(self, key: str, tool_name: str) -> Tuple[bool, Any]:
+        """(found, result) for a key, counting the hit or miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self._count(tool_name, "hits")
+                return True, entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self._count(tool_name, "misses")
+            return False, None
+
+    def put(self, key: str, tool_name: str, args: Dict[str, Any], result: Any,
+            generation: Tuple[int, ...]) -> None:
+        policy = self.policies[tool_name]
+        with self._lock:
+            # Data this result reads was written while the call ran; it may already be stale
+            if tuple(self._generations.get(name, 0) for name in policy.reads) != generation:
+                return
+            self._entries[key] = (time.monotonic() + policy.ttl_seconds, result, tool_name, args)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, data: str, scope: Optional[Tuple[str, Any]] = None) -> int:
+        """
+        Drop cached results of tools reading data, only those called with the scope
+        (argument, value) if given. Returns how many entries were dropped.
+        """
+        with self._lock:
+            self._generations[data] = self._generations.get(data, 0) + 1
+            dropped = [
+                key for key, (_, _, tool_name, args) in self._entries.items()
+                if data in self.policies[tool_name].reads
+                and (scope is None or scope[0] not in args or args[scope[0]] == scope[1])
+            ]
+            for key in dropped:
+                self._count(self._entries.pop(key)[2], "invalidated")
+            return len(dropped)
+
+    def record_write(self, tool_name: str, args: Dict[str, Any]) -> int:
+        """Invalidate what a call of a write tool changes; returns how many entries were dropped."""
+        policy = self.policies[tool_name]
+        with self._lock:
+            self._count(tool_name, "writes")
+        dropped = 0
+        for data, argument in policy.invalidates.items():
+            scope = (argument, args[argument]) if argument is not None and argument in args else None
+            dropped += self.invalidate(data, scope)
+        return dropped
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    async def acall(self, tool: BaseTool, args: Dict[str, Any]) -> Any:
+        """Call tool through the cache; identical concurrent misses share one call."""
+        policy = self.policy(tool.name)
+        if policy is None or (policy.ttl_seconds <= 0 and not policy.invalidates):
+            return await tool.ainvoke(args)
+        normalized = normalize_args(args, policy)
+        if policy.ttl_seconds <= 0:
+            # A write: invalidate once it has happened, so nothing stale is re-read meanwhile
+            try:
+                return await tool.ainvoke(args)
+            finally:
+                self.record_write(tool.name, normalized)
+        key = make_tool_key(tool.name, normalized)
+        found, result = self.get(key, tool.name)
+        if found:
+            return result
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            with self._lock:
+                self._count(tool.name, "coalesced")
+            result = await asyncio.shield(inflight)
+            if result is _ABANDONED:
+                # The call's owner was cancelled; this caller's turn goes on and makes the call itself
+                return await self.acall(tool, args)
+            return result
+        future = self._inflight[key] = asyncio.get_running_loop().create_future()
+        generation = self.generation(policy)
+        try:
+            result = await tool.ainvoke(args)
+        except asyncio.CancelledError:
+            # Only the owner's turn was cancelled (e.g. its client left); waiters from other sessions retry
+            future.set_result(_ABANDONED)
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Waiters get the error; don't warn when there are none
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            self.put(key, tool.name, normalized, result, generation)
+            return result
+        finally:
+            del self._inflight[key]
+
+    def call(self, tool: BaseTool, args: Dict[str, Any]) -> Any:
+        """Synchronous acall, without coalescing."""
+        policy = self.policy(tool.name)
+        if policy is None or (policy.ttl_seconds <= 0 and not policy.invalidates):
+            return tool.invoke(args)
+        normalized = normalize_args(args, policy)
+        if policy.ttl_seconds <= 0:
+            try:
+                return tool.invoke(args)
+            finally:
+                self.record_write(tool.name, normalized)
+        key = make_tool_key(tool.name, normalized)
+        found, result = self.get(key, tool.name)
+        if found:
+            return result
+        generation = self.generation(policy)
+        result = tool.invoke(args)
+        self.put(key, tool.name, normalized, result, generation)
+        return result
+
+    def wrap(self, tool: BaseTool) -> BaseTool:
+        """A tool with the same name, description and arguments that calls tool through the cache."""
+        if self.policy(tool.name) is None:
+            return tool
+
+        async def acall(**kwargs: Any) -> Any:
+            return await self.acall(tool, kwargs)
+
+        def call(**kwargs: Any) -> Any:
+            return self.call(tool, kwargs)
+
+        return StructuredTool.from_function(
+            func=call,
+            coroutine=acall,
+            name=tool.name,
+            description=tool.description,
+            args_schema=tool.args_schema,
+        )
+
+    def wrap_all(self, tools: Iterable[BaseTool]) -> List[BaseTool]:
+        return [self.wrap(tool) for tool in tools]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            tools = {}
+            for name, counts in sorted(self._tool_stats.items()):
+                lookups = counts["hits"] + counts["misses"]
+                tools[name] = {**counts, "hit_rate": round(counts["hits"] / lookups, 4) if lookups else None}
+            hits = sum(c["hits"] for c in self._tool_stats.values())
+            lookups = hits + sum(c["misses"] for c in self._tool_stats.values())
+            return {
+                "entries": len(self._entries),
+                "hits": hits,
+                "misses": lookups - hits,
+                "hit_rate": round(hits / lookups, 4) if lookups else None,
+                "tools": tools,
+            }
+
+
+def get_tool_cache() -> Optional[ToolResultCache]:
+    """The hotel toolset cache configured in Config, or None when TOOL_CACHE_ENABLED is off."""
+    if not Config.TOOL_CACHE_ENABLED:
+        return None
+    return ToolResultCache(
+        HOTEL_TOOL_POLICIES,
+        max_entries=Config.TOOL_CACHE_MAX_ENTRIES,
+        ttl_overrides=parse_ttl_overrides(Config.TOOL_CACHE_TTLS),
+    )
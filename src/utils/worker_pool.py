@@ -0,0 +1,115 @@
+"""
+Bounded worker pool for running blocking work from async endpoints.
+Limits concurrency, rejects work once the queue is full and records queue
+depth and wait-time statistics.
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+
+class PoolFullError(Exception):
+    """Raised when the worker pool queue has no room for new work."""
+
+
+class WorkerPool:
+    """Thread pool with a fixed worker count and a bounded wait queue."""
+
+    def __init__(self, max_workers: int, max_queue: int, name: str = "worker"):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.rejected = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._recent_waits = deque(maxlen=1000)
+
+    def _record_start(self, submitted_at: float) -> None:
+        wait = time.perf_counter() - submitted_at
+        with self._lock:
+            self.queued -= 1
+            self.running += 1
+            self._wait_total += wait
+            self._wait_max = max(self._wait_max, wait)
+            self._recent_waits.append(wait)
+
+    def _record_finish(self) -> None:
+        with self._lock:
+            self.running -= 1
+            self.completed += 1
+
+    def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        """
+        Queue fn(*args, **kwargs) on a worker thread and return its future.
+
+        Raises:
+            PoolFullError: If every worker is busy and the queue is full
+        """
+        with self._lock:
+            if self.queued + self.running >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise PoolFullError(
+                    f"Worker pool is full ({self.running} running, {self.queued} queued)"
+                )
+            self.queued += 1
+        submitted_at = time.perf_counter()
+
+        def task():
+            self._record_start(submitted_at)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self._record_finish()
+
+        return self._executor.submit(task)
+
+    def cancel(self, future: Future) -> bool:
+        """Cancel work that has not started yet, giving back its queue slot."""
+        if future.cancel():
+            with self._lock:
+                self.queued -= 1
+            return True
+        return False
+
+    async def run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Run fn(*args, **kwargs) on a worker thread and await its result.
+
+        Raises:
+            PoolFullError: If every worker is busy and the queue is full
+        """
+        future = self.submit(fn, *args, **kwargs)
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            self.cancel(future)
+            raise
+
+    def stats(self) -> Dict[str, Any]:
+        """Return queue depth, throughput and wait-time statistics."""
+        with self._lock:
+            waits = sorted(self._recent_waits)
+            started = self.completed + self.running
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "queue_depth": self.queued,
+                "running": self.running,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "wait_seconds_avg": self._wait_total / started if started else 0.0,
+                "wait_seconds_p95": waits[min(len(waits) - 1, int(len(waits) * 0.95))] if waits else 0.0,
+                "wait_seconds_max": self._wait_max,
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting work and release the worker threads."""
+        self._executor.shutdown(wait=wait, cancel_futures=True)
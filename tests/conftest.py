@@ -0,0 +1,20 @@
+"""
+Shared pytest fixtures.
+"""
+
+import sys
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def reset_textract_rate_limiter():
+    """
+    Give each test the Textract server's shared rate limiter at full rate and with a
+    full bucket, so throttling or bursts in one test don't slow down the next.
+    """
+    # Only when a test has loaded the server; importing it here would load it for every test
+    server = sys.modules.get("src.agents.textract_http_server")
+    if server is not None and server.rate_limiter is not None:
+        server.rate_limiter.reset()
+    yield
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Test script for the multi-session agent server.
+Serves fake agents whose astream yields message chunks like a LangGraph ReAct
+agent, and checks streaming over HTTP and WebSocket, per-session turn limits
+and many sessions running concurrently in one process.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+from unittest import mock
+
+import httpx
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from fastapi.testclient import TestClient
+from langchain_core.messages import AIMessageChunk, ToolMessage
+
+from src.agents import agent_server
+from src.agents.agent_server import AgentRuntime, ServedAgent
+from src.utils.agent_sessions import SessionRegistry
+from src.utils.conversation_memory import MemoryPolicy
+
+
+class FakeGraph:
+    """Agent that calls one tool, then answers with the message it was sent."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.thread_ids = []
+
+    async def astream(self, inputs, config, stream_mode):
+        self.thread_ids.append(config["configurable"]["thread_id"])
+        message = inputs["messages"][-1][1]
+        yield AIMessageChunk(content="", tool_call_chunks=[
+            {"name": "list-hotels", "args": "{}", "id": "call-1", "index": 0},
+        ]), {"langgraph_node": "agent"}
+        await asyncio.sleep(self.delay)
+        yield ToolMessage(content="[]", name="list-hotels", tool_call_id="call-1"), {"langgraph_node": "tools"}
+        for token in ("You said: ", message):
+            yield AIMessageChunk(content=token), {"langgraph_node": "agent"}
+
+
+class FakeCheckpointer:
+    def __init__(self):
+        self.deleted = []
+
+    async def adelete_thread(self, thread_id):
+        self.deleted.append(thread_id)
+
+
+def make_runtime(delay=0.0, max_turns_per_session=1, max_concurrent_turns=0):
+    graph = FakeGraph(delay)
+    agents = {
+        "hotel": ServedAgent(graph, lambda message: {"messages": [("user", message)]}),
+        "db-admin": ServedAgent(FakeGraph(), lambda message: {"messages": [("user", message)]}),
+    }
+    registry = SessionRegistry(max_turns_per_session, max_concurrent_turns)
+    return AgentRuntime(agents, FakeCheckpointer(), registry=registry), graph
+
+
+def test_streams_events_over_http():
+    runtime, graph = make_runtime()
+    with mock.patch.object(agent_server, "runtime", runtime):
+        client = TestClient(agent_server.app)
+        assert client.get("/agents").json() == {"agents": ["db-admin", "hotel"]}
+
+        response = client.post("/agents/hotel/sessions/guest-1/messages", json={"message": "hi"})
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        events = [json.loads(line) for line in response.text.splitlines()]
+        assert [e["type"] for e in events] == ["tool_call", "tool_result", "token", "token", "done"]
+        assert events[-1]["text"] == "You said: hi"
+        assert events[-1]["tool_calls"] == 1
+        # Threads are namespaced per agent in the shared checkpointer
+        assert graph.thread_ids == ["hotel:guest-1"]
+
+        reply = client.post("/agents/hotel/sessions/guest-1/messages",
+                            json={"message": "again", "stream": False}).json()
+        assert reply["type"] == "done" and reply["text"] == "You said: again"
+
+        assert client.post("/agents/nope/sessions/x/messages", json={"message": "hi"}).status_code == 404
+        assert client.post("/agents/hotel/sessions/x/messages", json={"message": " "}).status_code == 400
+
+        stats = client.get("/sessions/stats").json()
+        assert stats["sessions"] == 1 and stats["completed_turns"] == 2 and stats["running_turns"] == 0
+
+        assert client.delete("/agents/hotel/sessions/guest-1").status_code == 200
+        assert runtime.checkpointer.deleted == ["hotel:guest-1"]
+        assert client.get("/sessions/stats").json()["sessions"] == 0
+
+
+def test_websocket_session():
+    runtime, graph = make_runtime()
+    with mock.patch.object(agent_server, "runtime", runtime):
+        client = TestClient(agent_server.app)
+        with client.websocket_connect("/agents/hotel/sessions/guest-2/ws") as ws:
+            for message in ("first", "second"):
+                ws.send_json({"message": message})
+                events = []
+                while not events or events[-1]["type"] not in ("done", "error"):
+                    events.append(ws.receive_json())
+                assert events[-1]["text"] == f"You said: {message}"
+            ws.send_json({"message": ""})
+            assert ws.receive_json()["type"] == "error"
+        assert graph.thread_ids == ["hotel:guest-2", "hotel:guest-2"]
+
+
+def test_busy_session_is_rejected_and_sessions_run_concurrently():
+    runtime, graph = make_runtime(delay=0.2)
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=agent_server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            first = asyncio.create_task(
+                client.post("/agents/hotel/sessions/busy/messages", json={"message": "slow"})
+            )
+            while not runtime.registry.stats()["active_sessions"]:
+                await asyncio.sleep(0.01)
+            second = await client.post("/agents/hotel/sessions/busy/messages", json={"message": "too"})
+            assert second.status_code == 429
+            assert (await first).status_code == 200
+
+            # Hundreds of sessions share the process; their turns overlap instead of queueing
+            start = time.perf_counter()
+            responses = await asyncio.gather(*(
+                client.post(f"/agents/hotel/sessions/guest-{i}/messages", json={"message": f"m{i}", "stream": False})
+                for i in range(200)
+            ))
+            elapsed = time.perf_counter() - start
+            assert all(r.status_code == 200 for r in responses)
+            assert {r.json()["text"] for r in responses} == {f"You said: m{i}" for i in range(200)}
+            assert elapsed < 200 * 0.2 / 10
+
+    with mock.patch.object(agent_server, "runtime", runtime):
+        asyncio.run(scenario())
+    stats = runtime.registry.stats()
+    assert stats["rejected_turns"] == 1
+    assert stats["sessions"] == 201
+    assert stats["running_turns"] == 0
+
+
+def test_server_wide_turn_limit():
+    runtime, graph = make_runtime(delay=0.1, max_concurrent_turns=2)
+    peak = []
+
+    original = graph.astream
+
+    async def tracked(inputs, config, stream_mode):
+        peak.append(runtime.registry.running)
+        async for item in original(inputs, config, stream_mode):
+            yield item
+
+    graph.astream = tracked
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=agent_server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            await asyncio.gather(*(
+                client.post(f"/agents/hotel/sessions/s{i}/messages", json={"message": "x"}) for i in range(6)
+            ))
+
+    with mock.patch.object(agent_server, "runtime", runtime):
+        asyncio.run(scenario())
+    assert max(peak) <= 2
+    assert runtime.registry.stats()["completed_turns"] == 6
+
+
+def test_unsent_response_holds_no_turn_and_idle_sessions_drop_memory():
+    runtime, graph = make_runtime()
+    memory = MemoryPolicy("prompt", max_tokens=1000)
+    runtime.agents["hotel"].memory = memory
+    runtime.registry.idle_seconds = 0.05
+
+    async def scenario():
+        # The client leaves before the body starts: the response is never iterated
+        request = agent_server.MessageRequest(message="hi")
+        response = await agent_server.post_message("hotel", "gone", request)
+        assert runtime.registry.stats()["active_sessions"] == 0
+        del response
+        transport = httpx.ASGITransport(app=agent_server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            again = await client.post("/agents/hotel/sessions/gone/messages", json={"message": "hi"})
+            assert again.status_code == 200
+            memory.pre_model_hook({"messages": []}, {"configurable": {"thread_id": "hotel:gone"}})
+            assert memory.prompt_tokens("hotel:gone") is not None
+            await asyncio.sleep(0.1)
+            await client.post("/agents/hotel/sessions/other/messages", json={"message": "hi"})
+        assert memory.prompt_tokens("hotel:gone") is None
+        assert runtime.registry.get("hotel", "gone") is None
+
+    with mock.patch.object(agent_server, "runtime", runtime):
+        asyncio.run(scenario())
+
+
+if __name__ == "__main__":
+    test_streams_events_over_http()
+    test_websocket_session()
+    test_busy_session_is_rejected_and_sessions_run_concurrently()
+    test_server_wide_turn_limit()
+    test_unsent_response_holds_no_turn_and_idle_sessions_drop_memory()
+    print("✅ Agent server tests completed!")
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Test script for streaming agent turns.
+Uses a fake agent whose astream yields LangChain message chunks the way a
+LangGraph ReAct agent does with stream_mode="messages".
+"""
+
+import asyncio
+import itertools
+import os
+import sys
+import time
+from unittest import mock
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, ToolMessage
+
+from src.utils.agent_streaming import TurnStats, chunk_text, read_input, stream_turn, turn_events
+from src.utils.conversation_memory import MemoryPolicy
+
+
+class FakeAgent:
+    """Agent that calls one tool, then answers in three tokens."""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.inputs = None
+
+    async def astream(self, inputs, config, stream_mode):
+        assert stream_mode == "messages"
+        self.inputs = inputs
+        await asyncio.sleep(self.delay)
+        yield AIMessageChunk(content="", tool_call_chunks=[
+            {"name": "search-hotels-by-location", "args": '{"location"', "id": "call-1", "index": 0},
+        ]), {"langgraph_node": "agent"}
+        yield AIMessageChunk(content="", tool_call_chunks=[
+            {"name": None, "args": ': "Basel"}', "id": None, "index": 0},
+        ]), {"langgraph_node": "agent"}
+        await asyncio.sleep(self.delay)
+        yield ToolMessage(content="[...]", name="search-hotels-by-location", tool_call_id="call-1"), \
+            {"langgraph_node": "tools"}
+        for token in ("Hilton ", "Basel ", "(id 1)"):
+            await asyncio.sleep(self.delay)
+            yield AIMessageChunk(content=token), {"langgraph_node": "agent"}
+
+
+def test_tokens_and_tool_calls_render_as_they_arrive():
+    output = []
+    arrivals = []
+
+    def write(text):
+        output.append(text)
+        arrivals.append(time.perf_counter())
+
+    stats = asyncio.run(stream_turn(FakeAgent(), {"messages": []}, {}, write))
+    assert output == [
+        "🔧 Calling search-hotels-by-location...\n",
+        "✅ search-hotels-by-location finished\n",
+        "Hilton ", "Basel ", "(id 1)", "\n",
+    ]
+    assert stats.text == "Hilton Basel (id 1)"
+    assert stats.tool_calls == 1
+    # The first token arrives after the tool call, well before the turn ends
+    assert 0.1 < stats.first_token_seconds < stats.total_seconds - 0.08
+    assert arrivals[-1] - arrivals[0] > 0.1
+    assert "1 tool call" in stats.format()
+
+
+class FakeToolModel(GenericFakeChatModel):
+    """Fake streaming chat model that create_react_agent can bind (no) tools to."""
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+
+def test_memory_summary_is_not_streamed_as_answer():
+    """A rolling summary made in pre_model_hook during a streamed turn never shows up as tokens."""
+    pytest.importorskip("langgraph.prebuilt")
+    from langgraph.checkpoint.memory import MemorySaver
+    from langgraph.prebuilt import create_react_agent
+
+    model = FakeToolModel(messages=itertools.cycle([AIMessage("Hotel seven has rooms.")]))
+    summary_model = GenericFakeChatModel(messages=itertools.cycle([AIMessage("SUMMARY of earlier turns")]))
+    memory = MemoryPolicy("You're a hotel assistant.", max_tokens=40, summary_model=summary_model)
+    agent = create_react_agent(model, [], checkpointer=MemorySaver(), pre_model_hook=memory.pre_model_hook)
+    config = {"configurable": {"thread_id": "guest-1"}}
+
+    async def turn(question):
+        stats = TurnStats()
+        events = [e async for e in turn_events(agent, {"messages": [("user", question)]}, config, stats)]
+        return events, stats
+
+    async def scenario():
+        for i in range(4):
+            events, stats = await turn(f"Question {i}: which hotels near the lake still have rooms?")
+            tokens = "".join(e["text"] for e in events if e["type"] == "token")
+            assert "SUMMARY" not in tokens
+            assert tokens == stats.text == "Hotel seven has rooms."
+
+    asyncio.run(scenario())
+    # Later turns did trim and summarize while streaming
+    assert memory.summaries >= 2
+
+
+def test_chunk_text_handles_content_parts():
+    assert chunk_text(AIMessageChunk(content=[{"type": "text", "text": "Hi"}, {"type": "image_url"}, " there"])) \
+        == "Hi there"
+
+
+def test_input_does_not_block_the_loop():
+    """Other tasks keep running while a line of input is awaited."""
+    ticks = []
+
+    def slow_input(prompt):
+        time.sleep(0.2)
+        return "quit"
+
+    async def ticker():
+        for _ in range(5):
+            ticks.append(time.perf_counter())
+            await asyncio.sleep(0.02)
+
+    async def main():
+        answer, _ = await asyncio.gather(read_input("> "), ticker())
+        return answer
+
+    with mock.patch("builtins.input", slow_input):
+        assert asyncio.run(main()) == "quit"
+    assert len(ticks) == 5
+
+
+if __name__ == "__main__":
+    test_tokens_and_tool_calls_render_as_they_arrive()
+    test_memory_summary_is_not_streamed_as_answer()
+    test_chunk_text_handles_content_parts()
+    test_input_does_not_block_the_loop()
+    print("✅ Agent streaming tests completed!")
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Test script for batch summarization and model quota limits.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from unittest import mock
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.model_quota import RateLimitedModel, is_quota_error
+from src.utils.rate_limiter import AdaptiveRateLimiter
+from src.utils.stub_model import StubChatModel, StubMessage
+from src.utils.summarization import ChunkedSummarizer
+from src.agents import orchestrator_extract_and_summarize as orchestrator
+
+
+class FakeBackend:
+    def extract(self, file_path, use_cache=True):
+        if "missing" in file_path:
+            raise orchestrator.ExtractionError("File not found")
+        if "blank" in file_path:
+            return "   "
+        return f"Contents of {os.path.basename(file_path)}."
+
+
+def test_batch_reports_every_file():
+    """Failures are recorded per file and the rest of the batch still completes."""
+    model = StubChatModel(latency=0.05)
+    summarizer = ChunkedSummarizer(model, max_chunk_tokens=1000, concurrency=2)
+    files = [f"/docs/invoice-{i}.pdf" for i in range(6)] + ["/docs/missing.pdf", "/docs/blank.png"]
+    with tempfile.TemporaryDirectory() as tmp:
+        report_path = os.path.join(tmp, "report.jsonl")
+        start = time.perf_counter()
+        asyncio.run(orchestrator.run_batch(files, FakeBackend(), summarizer, report_path, concurrency=6))
+        elapsed = time.perf_counter() - start
+        with open(report_path) as f:
+            records = {r["file_path"]: r for r in map(json.loads, f)}
+    assert len(records) == 8
+    assert records["/docs/invoice-3.pdf"]["summary"] == "Contents of invoice-3.pdf."
+    assert records["/docs/invoice-3.pdf"]["status"] == "ok"
+    assert "summarize_seconds" in records["/docs/invoice-3.pdf"]
+    assert records["/docs/missing.pdf"]["stage"] == "extract"
+    assert records["/docs/blank.png"]["stage"] == "summarize"
+    assert records["/docs/blank.png"]["error"] == "No text to summarize"
+    # Six summaries ran concurrently rather than one after another
+    assert elapsed < 6 * 0.05
+    assert model.max_active > 1
+
+
+def test_expand_paths():
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in ("b.pdf", "a.pdf", "c.png"):
+            open(os.path.join(tmp, name), "w").close()
+        paths = orchestrator.expand_paths([os.path.join(tmp, "*.pdf"), "/no/such/file.pdf"])
+    assert [os.path.basename(p) for p in paths] == ["a.pdf", "b.pdf", "file.pdf"]
+
+
+def test_token_budget_debt():
+    """Calls larger than the bucket go through, and later calls wait off the debt."""
+    limiter = AdaptiveRateLimiter(rate=100, burst=10, min_rate=1)
+    assert limiter.acquire(30) < 0.01
+    waited = limiter.acquire(1)
+    assert 0.15 < waited < 0.5
+
+
+def test_rate_limited_model_retries_quota_errors():
+    """429s back the budgets off and are retried; other errors are raised at once."""
+    model = mock.Mock()
+    model.invoke.side_effect = [
+        RuntimeError("429 RESOURCE_EXHAUSTED"),
+        RuntimeError("429 RESOURCE_EXHAUSTED"),
+        StubMessage("done"),
+    ]
+    limited = RateLimitedModel(model, requests_per_minute=6000, tokens_per_minute=600000, base_delay=0)
+    assert limited.invoke("Summarize this").content == "done"
+    stats = limited.stats()
+    assert stats["calls"] == 3
+    assert stats["quota_errors"] == 2
+    assert stats["requests"]["throttled"] == 2
+    assert stats["requests"]["rate"] < 100
+
+    model.invoke.side_effect = ValueError("bad request")
+    try:
+        limited.invoke("Summarize this")
+        raise AssertionError("expected ValueError")
+    except ValueError:
+        pass
+    assert limited.stats()["quota_errors"] == 2
+
+    paced = RateLimitedModel(StubChatModel(latency=0), requests_per_minute=60, tokens_per_minute=0)
+    start = time.perf_counter()
+    for _ in range(11):
+        paced.invoke("hello")
+    assert time.perf_counter() - start > 0.8
+
+
+def test_is_quota_error():
+    """Quota errors are told by status code or wording, not by any "429" in the message."""
+    class APIError(Exception):
+        def __init__(self, message, status_code):
+            super().__init__(message)
+            self.status_code = status_code
+
+    assert is_quota_error(APIError("slow down", 429))
+    assert is_quota_error(RuntimeError("Rate limit reached for requests"))
+    assert is_quota_error(RuntimeError("HTTP Error 429 Too Many Requests"))
+    assert not is_quota_error(APIError("Document has 429 pages", 400))
+    assert not is_quota_error(ValueError("Invalid id 14290"))
+    try:
+        try:
+            raise APIError("slow down", 429)
+        except APIError as e:
+            raise RuntimeError("Error calling model") from e
+    except RuntimeError as e:
+        assert is_quota_error(e)
+
+
+def test_budgets_recover_after_a_quota_error():
+    """A 429 halves both budgets; successes bring them back to the configured rate."""
+    model = mock.Mock()
+    model.invoke.side_effect = [RuntimeError("429 RESOURCE_EXHAUSTED")] + [StubMessage("ok")] * 30
+    limited = RateLimitedModel(model, requests_per_minute=6000, tokens_per_minute=1_000_000, base_delay=0)
+    limited.invoke("hello")
+    stats = limited.stats()
+    assert stats["tokens"]["rate"] < 1_000_000 / 60
+    for _ in range(20):
+        limited.invoke("hello")
+    stats = limited.stats()
+    assert stats["requests"]["rate"] == 100
+    assert abs(stats["tokens"]["rate"] - 1_000_000 / 60) < 0.01
+
+
+if __name__ == "__main__":
+    test_batch_reports_every_file()
+    test_expand_paths()
+    test_token_budget_debt()
+    test_rate_limited_model_retries_quota_errors()
+    test_is_quota_error()
+    test_budgets_recover_after_a_quota_error()
+    print("✅ Batch summary tests completed!")
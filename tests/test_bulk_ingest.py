@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Test script for bulk ingestion.
+Checks results and manifest entries are written and that a rerun resumes.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import zipfile
+from unittest import mock
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.agents import bulk_ingest, textract_http_server
+from src.utils.ingest_manifest import IngestManifest, IngestProgress, format_eta
+
+
+class EchoTextract:
+    """Stand-in for the Textract client that echoes the document and fails on demand."""
+
+    def __init__(self):
+        self.calls = []
+
+    def detect_document_text(self, Document):
+        text = bytes(Document["Bytes"]).decode()
+        self.calls.append(text)
+        if text.startswith("bad"):
+            raise RuntimeError("unreadable")
+        return {"Blocks": [{"BlockType": "LINE", "Text": text}]}
+
+
+def write_documents(root, documents):
+    for name, content in documents.items():
+        path = os.path.join(root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(content)
+
+
+def run_ingest(source, output, textract, **kwargs):
+    with mock.patch.object(textract_http_server, "result_cache", None), \
+            mock.patch.object(textract_http_server, "get_textract_client", return_value=textract):
+        return bulk_ingest.ingest(source, output, workers=2, report=lambda line: None, **kwargs)
+
+
+def test_ingest_and_resume():
+    """Finished documents are skipped on rerun; failed and changed ones are redone."""
+    with tempfile.TemporaryDirectory() as tmp:
+        source, output = os.path.join(tmp, "docs"), os.path.join(tmp, "store")
+        write_documents(source, {
+            "a.png": "alpha", "nested/b.jpg": "beta", "nested/c.png": "bad scan", "notes.txt": "skip me",
+        })
+        textract = EchoTextract()
+        summary = run_ingest(source, output, textract)
+        assert (summary["done"], summary["failed"], summary["skipped"]) == (2, 1, 0)
+        assert sorted(textract.calls) == ["alpha", "bad scan", "beta"]
+
+        manifest = IngestManifest(os.path.join(output, bulk_ingest.MANIFEST_NAME))
+        entry = manifest.get("nested/b.jpg")
+        assert entry["status"] == "done"
+        with open(bulk_ingest.result_path(output, entry["hash"])) as f:
+            assert json.load(f)["text"] == "beta"
+        assert "unreadable" in manifest.get("nested/c.png")["error"]
+
+        write_documents(source, {"nested/c.png": "gamma", "a.png": "alpha v2"})
+        rerun = EchoTextract()
+        summary = run_ingest(source, output, rerun, response_format="text")
+        assert sorted(rerun.calls) == ["alpha v2", "gamma"]
+        assert (summary["done"], summary["failed"], summary["skipped"]) == (2, 0, 1)
+        assert IngestManifest(os.path.join(output, bulk_ingest.MANIFEST_NAME)).counts() == {"done": 3}
+
+
+def test_each_file_is_hashed_once():
+    """Files are hashed on the workers, and extraction reuses that hash as its cache key."""
+    with tempfile.TemporaryDirectory() as tmp:
+        source, output = os.path.join(tmp, "docs"), os.path.join(tmp, "store")
+        write_documents(source, {"a.png": "alpha", "b.png": "beta"})
+        hashed = []
+        real_hash = bulk_ingest.make_file_cache_key
+
+        def counting_hash(path, feature_types):
+            hashed.append(os.path.basename(path))
+            return real_hash(path, feature_types)
+
+        with mock.patch.object(bulk_ingest, "make_file_cache_key", side_effect=counting_hash), \
+                mock.patch.object(textract_http_server, "make_cache_key") as make_cache_key:
+            assert run_ingest(source, output, EchoTextract())["done"] == 2
+            assert run_ingest(source, output, EchoTextract())["skipped"] == 2
+        assert sorted(hashed) == ["a.png", "a.png", "b.png", "b.png"]
+        make_cache_key.assert_not_called()
+
+
+def test_eta_past_a_day():
+    assert format_eta(59) == "00:00:59"
+    assert format_eta(3 * 3600 + 5) == "03:00:05"
+    assert format_eta(26 * 3600 + 61) == "1d 02:01:01"
+    progress = IngestProgress(total=100001)
+    progress.update("done", 10)
+    progress._started -= 2
+    # 100000 documents left at about 0.5 a second
+    assert "ETA 2d 07:3" in progress.format()
+
+
+def test_ingest_archive():
+    """Zip archives are unpacked and their members keyed by path inside the archive."""
+    with tempfile.TemporaryDirectory() as tmp:
+        archive_path = os.path.join(tmp, "docs.zip")
+        with zipfile.ZipFile(archive_path, "w") as archive:
+            archive.writestr("scans/one.png", "one")
+            archive.writestr("scans/two.pdf.png", "two")
+        output = os.path.join(tmp, "store")
+        summary = run_ingest(archive_path, output, EchoTextract())
+        assert summary["done"] == 2
+        manifest = IngestManifest(os.path.join(output, bulk_ingest.MANIFEST_NAME))
+        assert manifest.get("scans/one.png")["status"] == "done"
+        assert os.listdir(os.path.join(output, ".staging")) == []
+
+
+if __name__ == "__main__":
+    test_ingest_and_resume()
+    test_each_file_is_hashed_once()
+    test_eta_past_a_day()
+    test_ingest_archive()
+    print("✅ Bulk ingestion tests completed!")
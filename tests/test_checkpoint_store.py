@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Test script for the SQLite checkpoint store.
+Writes checkpoints shaped like LangGraph's through a JSON serializer and checks
+unchanged channels aren't stored again, sessions survive a reopen and pruning
+keeps the latest checkpoints of each thread.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.checkpoint_store import CheckpointStore
+
+
+class JsonSerde:
+    """Stand-in for LangGraph's serializer with the same typed interface."""
+
+    def dumps_typed(self, obj):
+        return "json", json.dumps(obj).encode()
+
+    def loads_typed(self, typed):
+        return json.loads(typed[1])
+
+
+def make_checkpoint(step, versions, values):
+    return {
+        "v": 4,
+        "id": f"{step:08d}",
+        "ts": "2026-01-01T00:00:00+00:00",
+        "channel_versions": dict(versions),
+        "versions_seen": {},
+        "channel_values": dict(values),
+    }
+
+
+def run_session(store, thread_id, steps):
+    """Append to "messages" every step while "profile" stays the same, as an agent turn would."""
+    versions = {"profile": 1, "messages": 0}
+    values = {"profile": {"guest": thread_id, "notes": "x" * 1000}, "messages": []}
+    parent = None
+    for step in range(steps):
+        new_versions = {"messages": step + 1}
+        if step == 0:
+            new_versions["profile"] = 1
+        versions["messages"] = step + 1
+        values["messages"] = values["messages"] + [f"message {step}"]
+        checkpoint = make_checkpoint(step, versions, values)
+        store.put(thread_id, "", checkpoint, {"step": step, "source": "loop"}, parent, new_versions)
+        parent = checkpoint["id"]
+    return values
+
+
+def test_unchanged_channels_are_stored_once():
+    store = CheckpointStore(":memory:", JsonSerde(), keep_last=0)
+    values = run_session(store, "guest-1", 10)
+    stats = store.stats()
+    assert stats["checkpoints"] == 10
+    # One blob per messages version plus a single profile blob
+    assert stats["blobs"] == 11
+    assert stats["blobs_reused"] == 9
+
+    latest = store.get("guest-1")
+    assert latest["checkpoint"]["channel_values"] == values
+    assert latest["metadata"] == {"step": 9, "source": "loop"}
+    assert latest["parent_checkpoint_id"] == "00000008"
+    older = store.get("guest-1", checkpoint_id="00000003")
+    assert older["checkpoint"]["channel_values"]["messages"] == [f"message {i}" for i in range(4)]
+    assert older["checkpoint"]["channel_values"]["profile"] == values["profile"]
+
+    listed = list(store.list("guest-1", before="00000005", limit=2))
+    assert [r["checkpoint_id"] for r in listed] == ["00000004", "00000003"]
+    assert [r["checkpoint_id"] for r in store.list(metadata_filter={"step": 7})] == ["00000007"]
+    assert store.get("guest-2") is None
+
+
+def test_session_resumes_after_reopen():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "state", "checkpoints.sqlite")
+        store = CheckpointStore(path, JsonSerde())
+        values = run_session(store, "guest-1", 5)
+        store.put_writes("guest-1", "", "00000004", "task-a", "", [(0, "messages", "pending"), (1, "x", 1)])
+        store.put_writes("guest-1", "", "00000004", "task-a", "", [(0, "messages", "ignored")])
+        store.put_writes("guest-1", "", "00000004", "task-a", "", [(-1, "__error__", "first")])
+        store.put_writes("guest-1", "", "00000004", "task-a", "", [(-1, "__error__", "second")])
+        store.close()
+
+        reopened = CheckpointStore(path, JsonSerde())
+        latest = reopened.get("guest-1")
+        assert latest["checkpoint_id"] == "00000004"
+        assert latest["checkpoint"]["channel_values"] == values
+        assert latest["pending_writes"] == [
+            ("task-a", "__error__", "second"),
+            ("task-a", "messages", "pending"),
+            ("task-a", "x", 1),
+        ]
+        assert reopened.threads() == ["guest-1"]
+        reopened.delete_thread("guest-1")
+        assert reopened.get("guest-1") is None
+        assert reopened.stats()["blobs"] == 0
+        reopened.close()
+
+
+def test_prune_keeps_latest_checkpoints_and_their_blobs():
+    store = CheckpointStore(":memory:", JsonSerde(), keep_last=3, prune_every=0)
+    values = run_session(store, "guest-1", 10)
+    store.put_writes("guest-1", "", "00000001", "task-a", "", [(0, "messages", "old")])
+    deleted = store.prune()
+    assert deleted["checkpoints"] == 7
+    stats = store.stats()
+    assert stats["checkpoints"] == 3
+    assert stats["writes"] == 0
+    # Three messages versions and the profile blob, which the kept checkpoints still reference
+    assert stats["blobs"] == 4
+    assert store.get("guest-1")["checkpoint"]["channel_values"] == values
+    assert store.get("guest-1", checkpoint_id="00000007") is not None
+    assert store.get("guest-1", checkpoint_id="00000006") is None
+
+    # Pruning also runs automatically as checkpoints are written
+    auto = CheckpointStore(":memory:", JsonSerde(), keep_last=2, prune_every=4)
+    run_session(auto, "guest-1", 9)
+    assert auto.stats()["checkpoints"] == 3
+
+
+def test_idle_threads_expire():
+    store = CheckpointStore(":memory:", JsonSerde(), keep_last=0, ttl_seconds=0.2, prune_every=0)
+    run_session(store, "idle", 3)
+    time.sleep(0.3)
+    run_session(store, "active", 3)
+    assert store.prune()["threads"] == 1
+    assert store.threads() == ["active"]
+    assert store.get("idle") is None
+    assert store.get("active") is not None
+
+
+if __name__ == "__main__":
+    test_unchanged_channels_are_stored_once()
+    test_session_resumes_after_reopen()
+    test_prune_keeps_latest_checkpoints_and_their_blobs()
+    test_idle_threads_expire()
+    print("✅ Checkpoint store tests completed!")
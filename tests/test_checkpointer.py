@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Test script for the LangGraph SQLite checkpointer.
+Round-trips checkpoints, pending writes and versions through SqliteCheckpointSaver
+with LangGraph's own serializer; skipped when langgraph isn't installed.
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+pytest.importorskip("langgraph.checkpoint.base")
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.base import create_checkpoint, empty_checkpoint
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+from src.utils.checkpointer import SqliteCheckpointSaver
+
+THREAD = {"configurable": {"thread_id": "guest-1", "checkpoint_ns": ""}}
+
+
+def next_checkpoint(saver, previous, messages):
+    """A checkpoint after previous holding messages, and the channel versions it bumps."""
+    checkpoint = create_checkpoint(previous, None, 0) if previous else empty_checkpoint()
+    version = saver.get_next_version(checkpoint["channel_versions"].get("messages"))
+    checkpoint["channel_values"] = {"messages": messages}
+    checkpoint["channel_versions"] = {"messages": version}
+    return checkpoint, {"messages": version}
+
+
+def checkpoint_ids(tuples):
+    return [t.checkpoint["id"] for t in tuples]
+
+
+def test_versions_sort_in_order():
+    saver = SqliteCheckpointSaver(":memory:")
+    versions = [None]
+    for _ in range(11):
+        versions.append(saver.get_next_version(versions[-1]))
+    assert versions[1:] == sorted(versions[1:])
+    assert [int(v.split(".")[0]) for v in versions[1:]] == list(range(1, 12))
+    # Forks of one checkpoint get distinct versions of the same channel
+    assert saver.get_next_version(versions[3]) != saver.get_next_version(versions[3])
+    saver.close()
+
+
+def test_round_trip_with_langgraph_serializer():
+    """Checkpoints, parents and pending writes come back as LangGraph wrote them."""
+    with tempfile.TemporaryDirectory() as tmp:
+        saver = SqliteCheckpointSaver(os.path.join(tmp, "checkpoints.db"), serde=JsonPlusSerializer())
+        hello = [HumanMessage("Any rooms in Basel?")]
+        first, versions = next_checkpoint(saver, None, hello)
+        first_config = saver.put(THREAD, first, {"source": "input", "step": -1}, versions)
+
+        answered = hello + [AIMessage("Two hotels have rooms.")]
+        second, versions = next_checkpoint(saver, first, answered)
+        second_config = saver.put(first_config, second, {"source": "loop", "step": 0, "user": "alice"}, versions)
+        assert second_config["configurable"]["checkpoint_id"] == second["id"]
+
+        saver.put_writes(second_config, [("messages", AIMessage("Booking...")), ("__error__", "timeout")], "task-1")
+        # Special writes keep their WRITES_IDX_MAP index, so a retry replaces the error instead of adding one
+        saver.put_writes(second_config, [("__error__", "retried timeout")], "task-1")
+
+        latest = saver.get_tuple(THREAD)
+        assert latest.checkpoint["id"] == second["id"]
+        assert latest.checkpoint["channel_values"]["messages"] == answered
+        assert latest.checkpoint["channel_versions"] == second["channel_versions"]
+        assert latest.metadata["user"] == "alice" and latest.metadata["step"] == 0
+        assert latest.parent_config == first_config
+        assert sorted(latest.pending_writes, key=lambda w: w[1]) == [
+            ("task-1", "__error__", "retried timeout"),
+            ("task-1", "messages", AIMessage("Booking...")),
+        ]
+
+        oldest = saver.get_tuple(first_config)
+        assert oldest.checkpoint["channel_values"]["messages"] == hello
+        assert oldest.parent_config is None
+        assert oldest.pending_writes == []
+
+        assert checkpoint_ids(saver.list(THREAD)) == [second["id"], first["id"]]
+        assert checkpoint_ids(saver.list(THREAD, before=second_config)) == [first["id"]]
+        assert checkpoint_ids(saver.list(THREAD, limit=1)) == [second["id"]]
+        assert checkpoint_ids(saver.list(THREAD, filter={"source": "input"})) == [first["id"]]
+        assert checkpoint_ids(saver.list(THREAD, filter={"user": "alice", "step": 0})) == [second["id"]]
+        assert checkpoint_ids(saver.list(THREAD, filter={"user": "bob"})) == []
+        assert checkpoint_ids(saver.list({"configurable": {"thread_id": "other"}})) == []
+        saver.close()
+
+        # A new saver on the same file resumes the session
+        reopened = SqliteCheckpointSaver(os.path.join(tmp, "checkpoints.db"), serde=JsonPlusSerializer())
+        assert reopened.get_tuple(THREAD).checkpoint["channel_values"]["messages"] == answered
+        reopened.close()
+
+
+def test_async_methods():
+    saver = SqliteCheckpointSaver(":memory:", serde=JsonPlusSerializer())
+
+    async def scenario():
+        first, versions = next_checkpoint(saver, None, [HumanMessage("hi")])
+        first_config = await saver.aput(THREAD, first, {"source": "input", "step": -1}, versions)
+        second, versions = next_checkpoint(saver, first, [HumanMessage("hi"), AIMessage("hello")])
+        second_config = await saver.aput(first_config, second, {"source": "loop", "step": 0}, versions)
+        await saver.aput_writes(second_config, [("messages", AIMessage("more"))], "task-2")
+
+        latest = await saver.aget_tuple(THREAD)
+        assert latest.checkpoint["id"] == second["id"]
+        assert latest.parent_config == first_config
+        assert latest.pending_writes == [("task-2", "messages", AIMessage("more"))]
+        assert checkpoint_ids([t async for t in saver.alist(THREAD)]) == [second["id"], first["id"]]
+        assert checkpoint_ids([t async for t in saver.alist(THREAD, before=second_config, limit=5)]) == [first["id"]]
+
+        await saver.adelete_thread("guest-1")
+        assert await saver.aget_tuple(THREAD) is None
+
+    asyncio.run(scenario())
+    saver.close()
+
+
+if __name__ == "__main__":
+    test_versions_sort_in_order()
+    test_round_trip_with_langgraph_serializer()
+    test_async_methods()
+    print("✅ Checkpointer tests completed!")
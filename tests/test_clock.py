@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Test script for the cached clock provider.
+Runs a small time server on a free port to check remote refreshes and the
+fallback to the local clock when it stops answering.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+from zoneinfo import ZoneInfo
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils import clock as clock_module
+from src.utils.clock import ClockProvider
+from src.utils.time_utils import get_current_time
+
+
+class TimeServer:
+    """Time server reporting a fixed offset from the real time."""
+
+    def __init__(self, offset):
+        offset_seconds = offset.total_seconds()
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                now = datetime.now(ZoneInfo("UTC")) + timedelta(seconds=offset_seconds)
+                body = json.dumps({"datetime": now.isoformat()}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def test_local_readings_are_cached():
+    """Within the TTL the local reading is reused and extrapolated, not read again."""
+    with mock.patch.object(clock_module, "get_current_time", wraps=get_current_time) as reads:
+        clock = ClockProvider("America/Denver", ttl_seconds=60)
+        first = clock.now()
+        time.sleep(0.05)
+        second = clock.now()
+        assert reads.call_count == 1
+        assert timedelta(seconds=0.04) < second - first < timedelta(seconds=0.5)
+        assert abs((clock.now() - datetime.now(ZoneInfo("America/Denver"))).total_seconds()) < 1
+        assert clock.current_date() == datetime.now(ZoneInfo("America/Denver")).date().isoformat()
+
+        expiring = ClockProvider("America/Denver", ttl_seconds=0)
+        expiring.now()
+        time.sleep(0.01)
+        expiring.now()
+        assert reads.call_count == 3
+
+
+def test_remote_refresh_and_fallback():
+    """Fresh time server readings win; once they go stale the local clock takes over."""
+    server = TimeServer(offset=timedelta(days=3))
+    clock = ClockProvider("America/Denver", ttl_seconds=60, remote_url=server.url, refresh_seconds=0.2)
+    try:
+        clock.start()
+        deadline = time.monotonic() + 2
+        while clock.source() != "remote" and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert clock.source() == "remote"
+        local_now = datetime.now(ZoneInfo("America/Denver"))
+        assert abs((clock.now() - local_now) - timedelta(days=3)) < timedelta(seconds=1)
+        assert clock.now().tzinfo is not None
+    finally:
+        server.close()
+    # Two missed refreshes later the remote reading is stale
+    time.sleep(0.6)
+    assert clock.source() == "local"
+    assert abs((clock.now() - datetime.now(ZoneInfo("America/Denver"))).total_seconds()) < 1
+    clock.stop()
+    assert clock.stats()["remote_errors"] >= 1
+
+
+def test_unreachable_time_server_does_not_block():
+    """Without a reachable time server the clock answers at once from the local clock."""
+    clock = ClockProvider("America/Denver", ttl_seconds=60, remote_url="http://127.0.0.1:9", remote_timeout=0.5)
+    clock.start()
+    start = time.perf_counter()
+    assert clock.current_date()
+    assert time.perf_counter() - start < 0.05
+    assert clock.source() == "local"
+    clock.stop()
+    assert not clock.refresh_remote()
+
+
+if __name__ == "__main__":
+    test_local_readings_are_cached()
+    test_remote_refresh_and_fallback()
+    test_unreachable_time_server_does_not_block()
+    print("✅ Clock tests completed!")
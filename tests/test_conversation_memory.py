@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Test script for the bounded conversation memory policy.
+Replays long sessions through the pre-model hook the way LangGraph applies
+its state updates, and checks prompt size stays flat.
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from langchain_core.messages import AIMessage, HumanMessage, RemoveMessage, SystemMessage, ToolMessage
+
+from src.utils.conversation_memory import (
+    REMOVE_ALL_MESSAGES,
+    SUMMARY_NAME,
+    MemoryPolicy,
+    count_tokens,
+)
+from src.utils.stub_model import StubChatModel
+
+PROMPT = "You're a helpful hotel assistant. Always mention hotel ids."
+CONFIG = {"configurable": {"thread_id": "guest-1"}}
+
+
+def make_turn(i):
+    """A user question, a tool call, its result and the answer."""
+    return [
+        HumanMessage(content=f"Find hotels in city {i} with a pool and late checkout please."),
+        AIMessage(content="", tool_calls=[{"name": "search-hotels-by-location", "args": {"location": f"city {i}"},
+                                           "id": f"call-{i}"}]),
+        ToolMessage(content=f'[{{"id": {i}, "name": "Hotel {i}", "price_tier": "Midscale"}}]',
+                    tool_call_id=f"call-{i}"),
+        AIMessage(content=f"Hotel {i} (id {i}) in city {i} is a midscale option with a pool."),
+    ]
+
+
+def apply_update(messages, update):
+    """Apply a hook's "messages" update like LangGraph's add_messages reducer."""
+    new = update.get("messages")
+    if not new:
+        return messages
+    if isinstance(new[0], RemoveMessage) and new[0].id == REMOVE_ALL_MESSAGES:
+        return list(new[1:])
+    return messages + new
+
+
+def test_system_prompt_sent_once_and_not_stored():
+    policy = MemoryPolicy(PROMPT, max_tokens=4000)
+    history = make_turn(1)
+    update = policy.pre_model_hook({"messages": history}, CONFIG)
+    assert "messages" not in update
+    llm_input = update["llm_input_messages"]
+    assert isinstance(llm_input[0], SystemMessage) and llm_input[0].content == PROMPT
+    assert llm_input[1:] == history
+    assert policy.prompt_tokens("guest-1") == count_tokens(llm_input)
+
+
+def test_trim_keeps_whole_turns_within_budget():
+    policy = MemoryPolicy(PROMPT, max_tokens=300)
+    history = [m for i in range(20) for m in make_turn(i)]
+    update = policy.pre_model_hook({"messages": history}, CONFIG)
+    llm_input = update["llm_input_messages"]
+    assert count_tokens(llm_input) <= 300
+    # History restarts at a user message, so no tool result is separated from its call
+    assert isinstance(llm_input[1], HumanMessage)
+    assert llm_input[-4:] == make_turn(19)
+    stored = update["messages"]
+    assert stored[0].id == REMOVE_ALL_MESSAGES
+    assert stored[1:] == llm_input[1:]
+
+    # A single turn over budget is still sent whole
+    huge = [HumanMessage(content="x" * 4000)]
+    assert policy.pre_model_hook({"messages": huge}, CONFIG)["llm_input_messages"][1:] == huge
+
+
+def test_prompt_tokens_stay_flat_over_a_long_session():
+    for summary_model in (None, StubChatModel(latency=0, summary_words=30)):
+        policy = MemoryPolicy(PROMPT, max_tokens=500, summary_model=summary_model)
+        messages = []
+        sizes = []
+        for i in range(60):
+            messages = messages + make_turn(i)[:1]
+            messages = apply_update(messages, policy.pre_model_hook({"messages": messages}, CONFIG))
+            messages = messages + make_turn(i)[1:]
+            sizes.append(policy.prompt_tokens("guest-1"))
+        assert max(sizes[10:]) <= 500
+        assert len(messages) < 30
+        if summary_model is not None:
+            assert messages[0].name == SUMMARY_NAME
+            assert policy.summaries > 0
+            last_input = policy.pre_model_hook({"messages": messages}, CONFIG)["llm_input_messages"]
+            assert "Summary of the conversation so far" in last_input[0].content
+
+
+def test_summary_is_updated_from_dropped_turns():
+    model = StubChatModel(latency=0, summary_words=200)
+    policy = MemoryPolicy(PROMPT, max_tokens=250, summary_model=model)
+    history = [SystemMessage(content="Guest booked hotel 7.", name=SUMMARY_NAME)] + \
+        [m for i in range(6) for m in make_turn(i)]
+    update = policy.pre_model_hook({"messages": history}, CONFIG)
+    summary = update["messages"][1]
+    assert summary.name == SUMMARY_NAME
+    assert model.calls == 1
+    # The stub echoes the prompt text, so the update saw the old summary and the dropped calls
+    assert "Guest booked hotel 7." in summary.content
+    assert "called search-hotels-by-location" in summary.content
+
+
+if __name__ == "__main__":
+    test_system_prompt_sent_once_and_not_stored()
+    test_trim_keeps_whole_turns_within_budget()
+    test_prompt_tokens_stay_flat_over_a_long_session()
+    test_summary_is_updated_from_dropped_turns()
+    print("✅ Conversation memory tests completed!")
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test script for the pluggable extraction backends.
+Checks the HTTP and in-process backends return the same text for a document,
+and that the stub backend works without the Textract server.
+"""
+
+import os
+import sys
+import tempfile
+from unittest import mock
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from fastapi.testclient import TestClient
+
+from src.utils.config import Config
+from src.utils.extraction_backends import (
+    ExtractionError,
+    HttpExtractionBackend,
+    InProcessExtractionBackend,
+    StubExtractionBackend,
+    get_extraction_backend,
+)
+from src.utils.textract_cache import TextractResultCache
+from src.agents import textract_http_server
+
+
+class LineTextract:
+    """Stand-in for the Textract client returning lines spread over three pages."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def detect_document_text(self, Document):
+        self.calls += 1
+        return {"Blocks": [
+            {"BlockType": "LINE", "Page": page, "Text": f"page {page} line {line}"}
+            for page in (1, 2, 3) for line in (1, 2)
+        ]}
+
+
+def test_http_and_inprocess_agree():
+    """Both backends return the same page-separated text; the in-process one shares the server's cache."""
+    textract = LineTextract()
+    with tempfile.TemporaryDirectory() as tmp, \
+            mock.patch.object(textract_http_server, "result_cache",
+                              TextractResultCache(os.path.join(tmp, "cache"), max_bytes=1 << 20, ttl_seconds=0)), \
+            mock.patch.object(textract_http_server, "get_textract_client", return_value=textract):
+        path = os.path.join(tmp, "scan.png")
+        with open(path, "wb") as f:
+            f.write(b"\x89PNG not really an image")
+
+        http = HttpExtractionBackend("http://testserver")
+        http.session = TestClient(textract_http_server.app)
+        in_process = InProcessExtractionBackend()
+
+        expected = "page 1 line 1\npage 1 line 2\fpage 2 line 1\npage 2 line 2\fpage 3 line 1\npage 3 line 2"
+        assert http.extract(path) == expected
+        assert in_process.extract(path) == expected
+        assert textract.calls == 1
+        assert [p["page"] for p in in_process.stream_pages(path)] == [1, 2, 3]
+
+        for backend in (http, in_process):
+            try:
+                backend.extract(path + ".missing")
+                raise AssertionError("expected ExtractionError")
+            except ExtractionError as e:
+                assert "File not found" in str(e)
+
+
+def test_stub_backend():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "doc.txt")
+        with open(path, "w") as f:
+            f.write("first page\fsecond page")
+        backend = StubExtractionBackend()
+        assert backend.extract(path) == "first page\fsecond page"
+        assert [p["text"] for p in backend.stream_pages(path)] == ["first page", "second page"]
+        try:
+            backend.extract(os.path.join(tmp, "missing.txt"))
+            raise AssertionError("expected ExtractionError")
+        except ExtractionError:
+            pass
+
+
+def test_backend_selection():
+    with mock.patch.object(Config, "EXTRACTION_BACKEND", "stub"):
+        assert isinstance(get_extraction_backend(), StubExtractionBackend)
+    assert isinstance(get_extraction_backend("inprocess"), InProcessExtractionBackend)
+    assert get_extraction_backend("http").base_url == Config.TEXTRACT_SERVER_URL.rstrip("/")
+    try:
+        get_extraction_backend("grpc")
+        raise AssertionError("expected ValueError")
+    except ValueError:
+        pass
+
+
+if __name__ == "__main__":
+    test_http_and_inprocess_agree()
+    test_stub_backend()
+    test_backend_selection()
+    print("✅ Extraction backend tests completed!")
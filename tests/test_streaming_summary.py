@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Test script for the streaming extract-to-summarize pipeline.
+Checks pages stream from the server in order and that summary output starts
+before extraction has finished.
+"""
+
+import asyncio
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from unittest import mock
+
+import pypdf
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from fastapi.testclient import TestClient
+
+from src.utils.stub_model import StubChatModel
+from src.utils.streaming_summary import StreamingSummaryPipeline
+from src.utils.summarization import ChunkedSummarizer
+from src.utils.summary_cache import SummaryCache
+from src.utils.textract_cache import TextractResultCache
+from src.agents import textract_http_server
+
+
+def slow_pages(count, delay, words=60, cached=False):
+    for page in range(1, count + 1):
+        time.sleep(delay)
+        yield {"page": page, "text": " ".join(f"page{page}word{i}" for i in range(words)), "cached": cached}
+
+
+def test_output_starts_before_extraction_finishes():
+    """Partial summaries are written while later pages are still arriving."""
+    model = StubChatModel(latency=0.02, summary_words=3)
+    summarizer = ChunkedSummarizer(model, max_chunk_tokens=450, concurrency=4)
+    output = []
+    pipeline = StreamingSummaryPipeline(summarizer, write=output.append)
+    stats = pipeline.run(slow_pages(8, delay=0.05))
+    assert stats["pages"] == 8
+    assert stats["chunks"] == 4
+    # All pages take 0.4s to arrive; the first part is written long before that
+    assert stats["first_output_seconds"] < 0.3
+    text = "".join(output)
+    assert text.startswith("[part 1] page1word0")
+    assert text.index("[part 4]") < text.index("Summary:\n")
+
+
+def test_short_document_streams_tokens_and_caches():
+    """A one-chunk document streams word by word; a cached re-run skips the model."""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = SummaryCache(tmp, max_bytes=1 << 20, ttl_seconds=0)
+        model = StubChatModel(latency=0, summary_words=5)
+        summarizer = ChunkedSummarizer(model, max_chunk_tokens=1000, concurrency=2,
+                                       cache=cache, model_name="stub")
+        output = []
+        stats = StreamingSummaryPipeline(summarizer, write=output.append).run(slow_pages(1, delay=0))
+        assert output[:3] == ["Summary:\n", "page1word0", " page1word1"]
+        assert stats["chunks"] == 1
+        assert model.calls == 1
+
+        output = []
+        stats = StreamingSummaryPipeline(summarizer, write=output.append).run(
+            slow_pages(1, delay=0, cached=True)
+        )
+        assert stats["cached"]
+        assert "".join(output) == "Summary:\npage1word0 page1word1 page1word2 page1word3 page1word4\n"
+        assert model.calls == 1
+
+
+class PageTextract:
+    """Stand-in for the Textract client returning one line per page of each chunk."""
+
+    def analyze_document(self, Document, FeatureTypes):
+        reader = pypdf.PdfReader(io.BytesIO(bytes(Document["Bytes"])))
+        return {"Blocks": [
+            {"BlockType": "LINE", "Page": number, "Text": f"width {int(page.mediabox.width)}"}
+            for number, page in enumerate(reader.pages, start=1)
+        ]}
+
+
+def test_stream_endpoint():
+    """Pages stream in order, and a second request is served from the result cache."""
+    with tempfile.TemporaryDirectory() as tmp, \
+            mock.patch.object(textract_http_server, "result_cache",
+                              TextractResultCache(os.path.join(tmp, "cache"), max_bytes=1 << 20, ttl_seconds=0)), \
+            mock.patch.object(textract_http_server, "get_textract_client", return_value=PageTextract()):
+        path = os.path.join(tmp, "report.pdf")
+        writer = pypdf.PdfWriter()
+        for i in range(4):
+            writer.add_blank_page(width=100 + i, height=100)
+        with open(path, "wb") as f:
+            writer.write(f)
+        client = TestClient(textract_http_server.app)
+        for cached in (False, True):
+            response = client.post("/extract-text/stream", json={"file_path": path})
+            assert response.headers["content-type"] == "application/x-ndjson"
+            pages = [json.loads(line) for line in response.text.splitlines()]
+            assert pages == [
+                {"page": i + 1, "text": f"width {100 + i}", "cached": cached} for i in range(4)
+            ]
+        assert client.post("/extract-text/stream", json={"file_path": path + ".missing"}).status_code == 400
+
+
+def test_stream_endpoint_closes_pages_after_disconnect():
+    """A client leaving while a page is being extracted closes the page generator once that page is done."""
+    closed = []
+
+    def pages(file_path, use_cache=True):
+        try:
+            yield from slow_pages(3, delay=0.1)
+        finally:
+            closed.append(file_path)
+
+    async def disconnect_mid_page():
+        request = textract_http_server.StreamRequest(file_path="report.pdf")
+        response = await textract_http_server.stream_extracted_pages(request)
+        body = response.body_iterator
+        await body.__anext__()
+        reading = asyncio.ensure_future(body.__anext__())
+        await asyncio.sleep(0.05)
+        reading.cancel()
+        try:
+            await reading
+        except asyncio.CancelledError:
+            pass
+        assert closed == []
+        await asyncio.sleep(0.2)
+
+    with mock.patch.object(textract_http_server, "iter_document_pages", pages):
+        asyncio.run(disconnect_mid_page())
+    assert closed == ["report.pdf"]
+
+
+if __name__ == "__main__":
+    test_output_starts_before_extraction_finishes()
+    test_short_document_streams_tokens_and_caches()
+    test_stream_endpoint()
+    test_stream_endpoint_closes_pages_after_disconnect()
+    print("✅ Streaming summary tests completed!")
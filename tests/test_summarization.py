@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Test script for map-reduce chunked summarization.
+Uses the local stub model, so no API key is needed.
+"""
+
+import argparse
+import os
+import sys
+import time
+from unittest import mock
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.config import Config
+from src.utils.stub_model import StubChatModel
+from src.utils.summarization import (
+    PAGE_BREAK,
+    ChunkedSummarizer,
+    add_summary_arguments,
+    estimate_tokens,
+    join_pages,
+    split_text,
+)
+
+
+def make_document(pages, paragraphs_per_page=3, words=50):
+    return PAGE_BREAK.join(
+        "\n\n".join(
+            " ".join(f"p{page}w{i}" for i in range(words)) for _ in range(paragraphs_per_page)
+        )
+        for page in range(1, pages + 1)
+    )
+
+
+def test_split_on_page_and_paragraph_boundaries():
+    """Chunks fit the budget, pages stay whole when they fit and text is never lost."""
+    document = make_document(pages=6)
+    page_tokens = estimate_tokens(document.split(PAGE_BREAK)[0])
+    chunks = split_text(document, max_tokens=page_tokens * 2 + 1)
+    assert len(chunks) == 3
+    assert all(chunk.count(PAGE_BREAK) == 1 for chunk in chunks)
+
+    small = split_text(document, max_tokens=page_tokens // 2)
+    assert all(estimate_tokens(chunk) <= page_tokens // 2 for chunk in small)
+    assert all(PAGE_BREAK not in chunk for chunk in small)
+    assert " ".join(" ".join(small).split()) == " ".join(document.split())
+    assert split_text("  \n ", 100) == []
+
+    lines = [{"text": "b", "page": 2}, {"text": "a1", "page": 1}, {"text": "a2", "page": 1}]
+    assert join_pages(lines) == "a1\na2" + PAGE_BREAK + "b"
+
+
+def test_short_documents_use_one_prompt():
+    model = StubChatModel(latency=0)
+    summary = ChunkedSummarizer(model, max_chunk_tokens=1000, concurrency=4).summarize("A short memo.")
+    assert summary == "A short memo."
+    assert model.calls == 1
+
+
+def test_map_reduce_runs_chunks_concurrently():
+    """Latency follows the number of rounds, not the number of chunks."""
+    # Long enough that all 16 workers overlap even if a garbage collection delays thread start
+    model = StubChatModel(latency=0.2, summary_words=5)
+    document = make_document(pages=16)
+    page_tokens = max(estimate_tokens(page) for page in document.split(PAGE_BREAK))
+    summarizer = ChunkedSummarizer(model, max_chunk_tokens=page_tokens, concurrency=16)
+    start = time.perf_counter()
+    summary = summarizer.summarize(document)
+    elapsed = time.perf_counter() - start
+    assert model.calls == 17
+    assert model.max_active == 16
+    assert summary == "p1w0 p1w1 p1w2 p1w3 p1w4"
+    # One concurrent map round plus one reduce, against 17 sequential calls
+    assert elapsed < 17 * 0.2 / 2
+
+
+def test_hierarchical_reduce_rounds():
+    """Summaries that overflow the budget are reduced in rounds; flat mode uses one prompt."""
+    document = make_document(pages=16, paragraphs_per_page=1, words=40)
+    budget = max(estimate_tokens(page) for page in document.split(PAGE_BREAK)) + 1
+
+    hierarchical = StubChatModel(latency=0, summary_words=30)
+    ChunkedSummarizer(hierarchical, max_chunk_tokens=budget, concurrency=4).summarize(document)
+    flat = StubChatModel(latency=0, summary_words=30)
+    ChunkedSummarizer(flat, max_chunk_tokens=budget, concurrency=4, hierarchical=False).summarize(document)
+    assert flat.calls == 17
+    assert hierarchical.calls > 17
+
+
+def test_hierarchical_setting_sets_flat_reduce_default():
+    for hierarchical in (True, False):
+        parser = argparse.ArgumentParser()
+        with mock.patch.object(Config, "SUMMARY_HIERARCHICAL", hierarchical):
+            add_summary_arguments(parser)
+        assert parser.parse_args([]).flat_reduce is not hierarchical
+    assert parser.parse_args(["--flat-reduce"]).flat_reduce is True
+
+
+if __name__ == "__main__":
+    test_split_on_page_and_paragraph_boundaries()
+    test_short_documents_use_one_prompt()
+    test_map_reduce_runs_chunks_concurrently()
+    test_hierarchical_reduce_rounds()
+    test_hierarchical_setting_sets_flat_reduce_default()
+    print("✅ Summarization tests completed!")
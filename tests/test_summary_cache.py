@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Test script for the summary cache.
+"""
+
+import os
+import sys
+import tempfile
+from unittest import mock
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.config import Config
+from src.utils.stub_model import StubChatModel
+from src.utils.summarization import ChunkedSummarizer, NoTextError
+from src.utils.summary_cache import SummaryCache, SummaryKeyBuilder, make_summary_key
+from src.agents import summarize_text_agent
+
+
+def test_summary_keys():
+    """Whitespace differences share a key; model and prompt changes don't."""
+    key = make_summary_key("Guest  checked in.\n\nPaid.", "gemini-1.5-flash", "prompt")
+    assert key == make_summary_key(" Guest checked in. Paid. ", "gemini-1.5-flash", "prompt")
+    assert key != make_summary_key("Guest checked in. Paid.", "gemini-1.5-pro", "prompt")
+    assert key != make_summary_key("Guest checked in. Paid.", "gemini-1.5-flash", "other prompt")
+
+    # Text hashed in whitespace-separated pieces gets the key of the whole text
+    builder = SummaryKeyBuilder()
+    for piece in ("Guest checked", "", "in.\n\n", " Paid."):
+        builder.update(piece)
+    assert builder.key("gemini-1.5-flash", "prompt") == key
+
+
+def test_summarizer_uses_cache():
+    """Repeat summaries come from the cache; bypassing it calls the model and refreshes the entry."""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = SummaryCache(tmp, max_bytes=1 << 20, ttl_seconds=0)
+        model = StubChatModel(latency=0)
+        summarizer = ChunkedSummarizer(model, max_chunk_tokens=1000, concurrency=2,
+                                       cache=cache, model_name="stub")
+        assert summarizer.summarize("Room 12 was upgraded.") == "Room 12 was upgraded."
+        assert summarizer.summarize("Room 12  was upgraded.\n") == "Room 12 was upgraded."
+        assert model.calls == 1
+
+        smaller_chunks = ChunkedSummarizer(model, max_chunk_tokens=500, concurrency=2,
+                                           cache=cache, model_name="stub")
+        smaller_chunks.summarize("Room 12 was upgraded.")
+        assert model.calls == 2
+
+        summarizer.use_cache = False
+        summarizer.summarize("Room 12 was upgraded.")
+        assert model.calls == 3
+        assert cache.stats()["entries"] == 2
+
+
+def test_streamed_chunks_use_cache():
+    """Multi-chunk input is keyed from its chunks as they stream, and shares keys with summarize."""
+    chunks = [f"Floor {i} was repainted. " + "word " * 150 for i in range(6)]
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = SummaryCache(tmp, max_bytes=1 << 20, ttl_seconds=0)
+        model = StubChatModel(latency=0, summary_words=10)
+        summarizer = ChunkedSummarizer(model, max_chunk_tokens=200, concurrency=2,
+                                       cache=cache, model_name="stub")
+        summary = summarizer.summarize_chunks(iter(chunks))
+        calls = model.calls
+        assert calls > len(chunks)
+        assert cache.stats()["entries"] == 1
+
+        assert summarizer.cached_summary_of_chunks(iter(chunks)) == summary
+        assert summarizer.summarize_chunks(iter(chunks)) == summary
+        # Chunks already submitted when the input ended still ran; the final reduce was skipped
+        assert model.calls - calls < calls
+        assert summarizer.cached_summary(" ".join(chunks)) == summary
+
+        summarizer.use_cache = False
+        assert summarizer.cached_summary_of_chunks(iter(chunks)) is None
+        try:
+            summarizer.summarize_chunks(iter([]))
+            raise AssertionError("expected NoTextError")
+        except NoTextError:
+            pass
+
+
+def test_cli_cache_flags(capsys):
+    """The summarize agent hits the cache on re-runs and --clear-cache empties it."""
+    with tempfile.TemporaryDirectory() as tmp:
+        text_file = os.path.join(tmp, "notes.txt")
+        with open(text_file, "w") as f:
+            f.write("The pool opens at 7am.")
+        cache_dir = os.path.join(tmp, "summaries")
+        with mock.patch.object(Config, "SUMMARY_CACHE_DIR", cache_dir), \
+                mock.patch.object(Config, "SUMMARY_CACHE_ENABLED", True):
+            for extra in ([], [], ["--clear-cache"]):
+                with mock.patch.object(sys, "argv", ["summarize", text_file, "--model", "stub", *extra]):
+                    summarize_text_agent.main()
+            assert "The pool opens at 7am." in capsys.readouterr().out
+            cache = SummaryCache(cache_dir, max_bytes=1 << 20, ttl_seconds=0)
+            assert cache.stats()["entries"] == 1
+
+
+if __name__ == "__main__":
+    test_summary_keys()
+    test_summarizer_uses_cache()
+    test_streamed_chunks_use_cache()
+    print("✅ Summary cache tests completed!")
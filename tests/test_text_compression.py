@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Test script for extractive pre-compression of extracted text.
+"""
+
+import os
+import sys
+from unittest import mock
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils import text_compression
+from src.utils.stub_model import StubChatModel
+from src.utils.summarization import PAGE_BREAK, ChunkedSummarizer, estimate_tokens
+from src.utils.text_compression import (
+    _textrank_numpy,
+    _textrank_python,
+    _tfidf_vectors,
+    compress_text,
+    rank_sentences,
+    split_sentences,
+    strip_repeated_lines,
+)
+
+
+TOPICS = ("breakfast", "parking", "the spa", "room service", "check-in", "the pool", "housekeeping")
+
+
+def make_pages(count):
+    return [
+        f"ACME Hotels - Confidential\nQuarterly report 2024\n"
+        f"Revenue from {TOPICS[page % 7]} on floor {page} rose by {page} percent.\n"
+        f"Guests staying near {TOPICS[(page + 3) % 7]} gave it {page} stars.\n"
+        f"Page {page} of {count}"
+        for page in range(1, count + 1)
+    ]
+
+
+def test_strip_repeated_lines():
+    """Headers and numbered footers repeated across pages are dropped; body lines are kept."""
+    pages, removed = strip_repeated_lines(make_pages(5))
+    assert removed == 10
+    assert pages[2] == (
+        "Quarterly report 2024\nRevenue from room service on floor 3 rose by 3 percent.\n"
+        "Guests staying near housekeeping gave it 3 stars."
+    )
+    # Too few pages to tell a header from content
+    assert strip_repeated_lines(make_pages(2)) == (make_pages(2), 0)
+
+
+def test_split_sentences():
+    text = "First sentence wraps\nonto a second line. Second one!\n\nA heading\n\nLast?"
+    assert split_sentences(text) == [
+        "First sentence wraps onto a second line.", "Second one!", "A heading", "Last?",
+    ]
+
+
+def test_rank_prefers_central_sentences():
+    sentences = [
+        "The hotel booking system handles guest reservations.",
+        "Guest reservations in the booking system are confirmed by email.",
+        "The booking system stores every guest reservation.",
+        "Lunch was pasta.",
+    ]
+    scores = rank_sentences(sentences)
+    assert scores.index(min(scores)) == 3
+
+
+def test_numpy_and_python_textrank_agree():
+    """The dense numpy ranking and the sparse fallback give the same scores and keep the same sentences."""
+    pytest.importorskip("numpy")
+    pages, _ = strip_repeated_lines(make_pages(40))
+    sentences = [s for page in pages for s in split_sentences(page)] + ["Lunch was pasta."]
+    vectors = _tfidf_vectors(sentences)
+    dense, sparse = _textrank_numpy(vectors), _textrank_python(vectors)
+    assert dense == pytest.approx(sparse, rel=1e-9)
+
+    text = PAGE_BREAK.join(make_pages(40))
+    with mock.patch.object(text_compression, "np", None):
+        fallback_scores = rank_sentences(sentences)
+        fallback = compress_text(text, max_tokens=300)
+    assert rank_sentences(sentences) == fallback_scores
+    assert compress_text(text, max_tokens=300) == fallback
+
+
+def test_compress_to_budget():
+    """Output fits the budget, keeps document order and page breaks, and reports the ratio."""
+    text = PAGE_BREAK.join(make_pages(40))
+    compressed, stats = compress_text(text, max_tokens=300)
+    assert estimate_tokens(compressed) <= 300 + stats["sentences_kept"]
+    assert "Confidential" not in compressed
+    assert stats["repeated_lines_removed"] == 80
+    assert stats["ratio"] > 3
+    assert stats["input_tokens"] == estimate_tokens(text)
+    flat = " ".join(text.split())
+    positions = [flat.index(line) for line in compressed.replace(PAGE_BREAK, "\n").splitlines()]
+    assert positions == sorted(positions)
+    assert PAGE_BREAK in compressed
+
+    # Text already within budget after removing headers keeps every sentence
+    _, stats = compress_text(PAGE_BREAK.join(make_pages(4)), max_tokens=10000)
+    assert stats["sentences_kept"] == stats["sentences_total"] == 8
+
+
+def test_summarizer_compresses_long_text():
+    model = StubChatModel(latency=0)
+    text = PAGE_BREAK.join(make_pages(200))
+    summarizer = ChunkedSummarizer(model, max_chunk_tokens=1000, concurrency=2, compress_tokens=800)
+    summary, stats = summarizer.summarize_with_stats(text)
+    assert summary
+    assert stats["output_tokens"] < 1000
+    # The compressed text fits one chunk, so a single call replaces the map-reduce
+    assert model.calls == 1
+
+    short, stats = summarizer.summarize_with_stats("Short text.")
+    assert stats is None
+    assert ChunkedSummarizer(model, 1000, 2).prompt_fingerprint() != summarizer.prompt_fingerprint()
+
+
+if __name__ == "__main__":
+    test_strip_repeated_lines()
+    test_split_sentences()
+    test_rank_prefers_central_sentences()
+    test_numpy_and_python_textrank_agree()
+    test_compress_to_budget()
+    test_summarizer_compresses_long_text()
+    print("✅ Text compression tests completed!")
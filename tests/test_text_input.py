@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Test script for memory-bounded text input and incremental summarization.
+"""
+
+import gzip
+import io
+import os
+import sys
+import tempfile
+import tracemalloc
+from unittest import mock
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.stub_model import StubChatModel
+from src.utils.summarization import CHARS_PER_TOKEN, PAGE_BREAK, ChunkedSummarizer
+from src.utils.text_input import iter_chunks, read_chunks
+
+PAGE = "\n\n".join(f"Paragraph {i} of the page, with some words in it." for i in range(8))
+
+
+def write_document(path, pages, opener=open):
+    with opener(path, "wt", encoding="utf-8") as f:
+        for page in range(pages):
+            f.write(f"Page {page} café\n{PAGE}{PAGE_BREAK}")
+
+
+def words(text):
+    return text.split()
+
+
+def test_chunks_respect_budget_and_boundaries():
+    """Chunks fit the budget, end on page breaks when pages fit, and lose no text."""
+    text = "".join(f"Page {page} café\n{PAGE}{PAGE_BREAK}" for page in range(30))
+    max_tokens = 300
+    chunks = list(iter_chunks(io.StringIO(text), max_tokens))
+    assert all(len(chunk) <= max_tokens * CHARS_PER_TOKEN for chunk in chunks)
+    assert all(chunk.startswith("Page ") for chunk in chunks)
+    assert words(" ".join(chunks)) == words(text)
+
+    # Text with no boundaries at all is cut at the budget
+    assert [len(c) for c in iter_chunks(io.StringIO("x" * 1000), 100)] == [400, 400, 200]
+
+
+def test_file_gzip_mmap_and_stdin_agree():
+    with tempfile.TemporaryDirectory() as tmp:
+        plain = os.path.join(tmp, "doc.txt")
+        packed = os.path.join(tmp, "doc.txt.gz")
+        write_document(plain, 20)
+        write_document(packed, 20, opener=gzip.open)
+        expected = list(read_chunks(plain, 250))
+        assert len(expected) > 5
+        assert list(read_chunks(packed, 250)) == expected
+        assert [words(c) for c in read_chunks(plain, 250, use_mmap=True)] == [words(c) for c in expected]
+        with open(plain, encoding="utf-8") as f, mock.patch.object(sys, "stdin", io.StringIO(f.read())):
+            assert list(read_chunks("-", 250)) == expected
+
+        empty = os.path.join(tmp, "empty.txt")
+        open(empty, "w").close()
+        assert list(read_chunks(empty, 250, use_mmap=True)) == []
+
+
+def test_mmap_keeps_multibyte_characters_whole():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "accents.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("é" * 1000)
+        chunks = list(read_chunks(path, 100, use_mmap=True))
+        assert "".join(chunks) == "é" * 1000
+
+
+def test_incremental_summary_bounds_work_in_flight():
+    """At most concurrency chunks are in flight, and partial summaries are folded within the budget."""
+    model = StubChatModel(latency=0.01, summary_words=30)
+    summarizer = ChunkedSummarizer(model, max_chunk_tokens=200, concurrency=3)
+    chunks = (f"chunk {i} " + "word " * 150 for i in range(40))
+    summary = summarizer.summarize_chunks(chunks)
+    assert summary
+    assert model.max_active <= 3
+    # One call per chunk plus the rolling reduces and the final one
+    assert model.calls > 40
+
+    single = StubChatModel(latency=0)
+    assert ChunkedSummarizer(single, 200, 3).summarize_chunks(iter(["Only chunk."])) == "Only chunk."
+    assert single.calls == 1
+    try:
+        summarizer.summarize_chunks(iter([]))
+        raise AssertionError("expected ValueError")
+    except ValueError:
+        pass
+
+
+def test_peak_memory_is_independent_of_input_size():
+    model = StubChatModel(latency=0, summary_words=10)
+    peaks = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for pages in (1000, 10000):
+            path = os.path.join(tmp, f"doc-{pages}.txt")
+            write_document(path, pages)
+            summarizer = ChunkedSummarizer(model, max_chunk_tokens=500, concurrency=2)
+            tracemalloc.start()
+            summarizer.summarize_chunks(read_chunks(path, 500))
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+    # The larger input is ten times the size (about 4 MB) but peaks about as high
+    assert peaks[1] < peaks[0] * 2
+    assert peaks[1] < 1 << 20
+
+
+if __name__ == "__main__":
+    test_chunks_respect_budget_and_boundaries()
+    test_file_gzip_mmap_and_stdin_agree()
+    test_mmap_keeps_multibyte_characters_whole()
+    test_incremental_summary_bounds_work_in_flight()
+    test_peak_memory_is_independent_of_input_size()
+    print("✅ Text input tests completed!")
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Test script for batch extraction on the Textract HTTP server.
+Checks NDJSON streaming, per-item errors and the batch concurrency limit.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from unittest import mock
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from fastapi.testclient import TestClient
+from starlette.requests import ClientDisconnect
+
+from src.utils.config import Config
+from src.agents import textract_http_server
+
+
+class SlowTextract:
+    """Stand-in for the Textract client that tracks how many calls overlap."""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def detect_document_text(self, Document):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        return {"Blocks": [{"BlockType": "LINE", "Text": bytes(Document["Bytes"]).decode()}]}
+
+
+def parse_lines(response):
+    items = [json.loads(line) for line in response.text.splitlines()]
+    return sorted(items, key=lambda item: item["index"])
+
+
+def test_batch_paths_with_per_item_errors():
+    """Every path gets its own line; a missing file fails only its item."""
+    textract = SlowTextract()
+    with tempfile.TemporaryDirectory() as tmp, \
+            mock.patch.object(Config, "TEXTRACT_BATCH_CONCURRENCY", 2), \
+            mock.patch.object(textract_http_server, "result_cache", None), \
+            mock.patch.object(textract_http_server, "get_textract_client", return_value=textract):
+        paths = []
+        for i in range(5):
+            path = os.path.join(tmp, f"doc{i}.png")
+            with open(path, "wb") as f:
+                f.write(f"document {i}".encode())
+            paths.append(path)
+        paths.append(os.path.join(tmp, "missing.png"))
+
+        client = TestClient(textract_http_server.app)
+        response = client.post("/extract-text/batch", json={"file_paths": paths})
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        items = parse_lines(response)
+        assert len(items) == 6
+        assert [item["text"] for item in items[:5]] == [f"document {i}" for i in range(5)]
+        assert all(item["status_code"] == 200 for item in items[:5])
+        assert items[5]["status_code"] == 400
+        assert "File not found" in items[5]["error"]
+    assert textract.max_active <= 2
+
+
+def test_batch_uploads_and_limits():
+    """Multipart batches are spooled and cleaned up; oversized batches are rejected."""
+    textract = SlowTextract(delay=0)
+    with tempfile.TemporaryDirectory() as spool_dir, \
+            mock.patch.object(Config, "TEXTRACT_SPOOL_DIR", spool_dir), \
+            mock.patch.object(Config, "TEXTRACT_BATCH_MAX_ITEMS", 3), \
+            mock.patch.object(textract_http_server, "result_cache", None), \
+            mock.patch.object(textract_http_server, "get_textract_client", return_value=textract):
+        client = TestClient(textract_http_server.app)
+        files = [("files", (f"page{i}.png", f"upload {i}".encode(), "image/png")) for i in range(3)]
+        response = client.post("/extract-text/batch/upload", files=files)
+        items = parse_lines(response)
+        assert [item["file_path"] for item in items] == ["page0.png", "page1.png", "page2.png"]
+        assert [item["text"] for item in items] == ["upload 0", "upload 1", "upload 2"]
+        assert os.listdir(spool_dir) == []
+
+        too_many = client.post("/extract-text/batch", json={"file_paths": ["a", "b", "c", "d"]})
+        assert too_many.status_code == 413
+        assert client.post("/extract-text/batch", json={"file_paths": []}).status_code == 400
+
+
+def test_batch_upload_spool_removed_on_early_disconnect():
+    """Spooled uploads are removed even if the client leaves before the response body starts."""
+    async def receive():
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        # The server's first write fails: the client has already gone
+        raise OSError("connection reset")
+
+    async def disconnect(response):
+        scope = {"type": "http", "asgi": {"version": "3.0", "spec_version": "2.4"}}
+        try:
+            await response(scope, receive, send)
+            raise AssertionError("expected ClientDisconnect")
+        except ClientDisconnect:
+            pass
+
+    with tempfile.TemporaryDirectory() as spool_dir:
+        spool_paths = []
+        for i in range(2):
+            spool_paths.append(os.path.join(spool_dir, f"upload{i}.png"))
+            with open(spool_paths[-1], "w") as f:
+                f.write(f"upload {i}")
+        response = textract_http_server.batch_response(
+            [(os.path.basename(path), path) for path in spool_paths],
+            use_cache=False,
+            options=textract_http_server.OutputOptions(),
+            spool_paths=spool_paths,
+        )
+        asyncio.run(disconnect(response))
+        assert os.listdir(spool_dir) == []
+
+if __name__ == "__main__":
+    test_batch_paths_with_per_item_errors()
+    test_batch_uploads_and_limits()
+    test_batch_upload_spool_removed_on_early_disconnect()
+    print("✅ Textract batch tests completed!")
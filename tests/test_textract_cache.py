@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Test script for the Textract result cache.
+Exercises keying, LRU eviction, TTL expiry and the server's cache bypass.
+"""
+
+import os
+import sys
+import tempfile
+import time
+from unittest import mock
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.textract_cache import TextractResultCache, make_cache_key
+from src.agents import textract_http_server
+
+
+class StubTextract:
+    """Stand-in for the boto3 Textract client that counts calls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def detect_document_text(self, Document):
+        self.calls += 1
+        return {"Blocks": [{"BlockType": "LINE", "Text": "hello"}]}
+
+    def analyze_document(self, Document, FeatureTypes):
+        self.calls += 1
+        return {"Blocks": [{"BlockType": "LINE", "Text": "invoice"}]}
+
+
+def test_cache_key_depends_on_features():
+    """The same bytes with different feature types must not collide."""
+    assert make_cache_key(b"doc", ["TABLES", "FORMS"]) == make_cache_key(b"doc", ["FORMS", "TABLES"])
+    assert make_cache_key(b"doc", ["TABLES", "FORMS"]) != make_cache_key(b"doc", [])
+    assert make_cache_key(b"doc", []) != make_cache_key(b"other", [])
+
+
+def test_lru_eviction_and_counters():
+    """Entries past max_bytes are evicted least recently used first."""
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = TextractResultCache(cache_dir, max_bytes=200, ttl_seconds=0)
+        cache.put("a", {"text": "a" * 60})
+        cache.put("b", {"text": "b" * 60})
+        assert cache.get("a") is not None  # "a" is now most recently used
+        cache.put("c", {"text": "c" * 60})
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("c") is not None
+        stats = cache.stats()
+        assert stats["hits"] == 3
+        assert stats["misses"] == 1
+        assert stats["evictions"] == 1
+
+        # A fresh instance picks up the entries already on disk
+        reloaded = TextractResultCache(cache_dir, max_bytes=200, ttl_seconds=0)
+        assert reloaded.get("c") == {"text": "c" * 60}
+
+
+def test_ttl_expiry():
+    """Entries older than the TTL count as misses and are dropped."""
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = TextractResultCache(cache_dir, max_bytes=1024, ttl_seconds=60)
+        cache.put("k", {"text": "x"})
+        with mock.patch("src.utils.textract_cache.time.time", return_value=time.time() + 120):
+            assert cache.get("k") is None
+        assert cache.stats()["entries"] == 0
+
+
+def test_extract_text_uses_cache():
+    """Repeat extractions skip Textract unless the cache is bypassed."""
+    stub = StubTextract()
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = TextractResultCache(cache_dir, max_bytes=1024 * 1024, ttl_seconds=0)
+        doc_path = os.path.join(cache_dir, "doc.png")
+        with open(doc_path, "wb") as f:
+            f.write(b"fake image bytes")
+        with mock.patch.object(textract_http_server, "result_cache", cache), \
+                mock.patch.object(textract_http_server, "get_textract_client", return_value=stub):
+            first = textract_http_server.extract_text_from_file(doc_path)
+            second = textract_http_server.extract_text_from_file(doc_path)
+            assert first == second == {"text": "hello", "blocks": [{"BlockType": "LINE", "Text": "hello"}]}
+            assert stub.calls == 1
+            textract_http_server.extract_text_from_file(doc_path, use_cache=False)
+            assert stub.calls == 2
+
+
+if __name__ == "__main__":
+    test_cache_key_depends_on_features()
+    test_lru_eviction_and_counters()
+    test_ttl_expiry()
+    test_extract_text_uses_cache()
+    print("✅ Textract cache tests completed!")
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Test script for the shared Textract client registry.
+Checks client reuse per region/credentials, single-attempt clients for
+rate-limited calls and the server lifespan hooks.
+"""
+
+import os
+import sys
+from unittest import mock
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from botocore.stub import Stubber
+from fastapi.testclient import TestClient
+
+from src.utils.config import Config
+from src.utils.rate_limiter import AdaptiveRateLimiter
+from src.utils.textract_clients import TextractClientRegistry
+from src.agents import textract_http_server
+
+CREDENTIALS = {"aws_access_key_id": "test", "aws_secret_access_key": "test"}
+
+
+def test_registry_reuses_clients():
+    """One client per region and credential set, reused on every lookup."""
+    registry = TextractClientRegistry(max_pool_connections=4, max_attempts=2)
+    client = registry.get("us-east-1", CREDENTIALS)
+    assert registry.get("us-east-1", dict(CREDENTIALS)) is client
+    assert registry.get("eu-west-1", CREDENTIALS) is not client
+    other = {"aws_access_key_id": "other", "aws_secret_access_key": "other"}
+    assert registry.get("us-east-1", other) is not client
+    assert len(registry) == 3
+    assert client.meta.config.max_pool_connections == 4
+    assert client.meta.config.retries["total_max_attempts"] == 2
+    single = registry.get("us-east-1", CREDENTIALS, retries=False)
+    assert single is not client
+    assert single.meta.config.retries["total_max_attempts"] == 1
+    assert single.meta.config.max_pool_connections == 4
+    registry.close()
+    assert len(registry) == 0
+
+
+def test_rate_limited_calls_are_retried_once():
+    """With the rate limiter on, throttling is retried by the limiter alone, not by botocore too."""
+    registry = TextractClientRegistry(max_attempts=3)
+    limiter = AdaptiveRateLimiter(rate=100, burst=10, min_rate=1)
+    with mock.patch.dict(os.environ, {"AWS_ACCESS_KEY_ID": "test", "AWS_SECRET_ACCESS_KEY": "test"}), \
+            mock.patch.object(Config, "TEXTRACT_THROTTLE_RETRIES", 2), \
+            mock.patch.object(Config, "TEXTRACT_THROTTLE_BASE_DELAY", 0), \
+            mock.patch.object(textract_http_server, "rate_limiter", limiter), \
+            mock.patch.object(textract_http_server, "client_registry", registry), \
+            Stubber(registry.get(Config.AWS_REGION, retries=False)) as stubber:
+        for _ in range(2):
+            stubber.add_client_error("detect_document_text", "ThrottlingException", http_status_code=400)
+        stubber.add_response("detect_document_text", {"Blocks": [{"BlockType": "PAGE"}]})
+        assert textract_http_server.analyze_bytes(b"doc", []) == [{"BlockType": "PAGE"}]
+        stubber.assert_no_pending_responses()
+    # The calls went to the single-attempt client, so each limiter retry is one request
+    assert stubber.client.meta.config.retries["total_max_attempts"] == 1
+    assert limiter.stats()["retries"] == 2
+
+    limiter.reset()
+    assert limiter.stats() == {"rate": 100, "max_rate": 100, "throttled": 0, "retries": 0, "wait_seconds": 0}
+    registry.close()
+
+
+def test_lifespan_builds_and_closes_registry():
+    """The app builds the registry at startup and releases it at shutdown."""
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "test")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "test")
+    with TestClient(textract_http_server.app):
+        registry = textract_http_server.client_registry
+        assert registry is not None
+        assert len(registry) == 1
+    assert textract_http_server.client_registry is None
+
+
+if __name__ == "__main__":
+    test_registry_reuses_clients()
+    test_rate_limited_calls_are_retried_once()
+    test_lifespan_builds_and_closes_registry()
+    print("✅ Textract client registry tests completed!")
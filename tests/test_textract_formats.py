@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Test script for Textract response formats.
+Checks each format's shape and that the endpoint applies the requested one.
+"""
+
+import os
+import sys
+import tempfile
+from unittest import mock
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from fastapi.testclient import TestClient
+
+from src.utils.textract_formats import compact_blocks, encode_json, format_result
+from src.agents import textract_http_server
+
+BLOCKS = [
+    {"BlockType": "PAGE", "Id": "p", "Page": 1,
+     "Relationships": [{"Type": "CHILD", "Ids": ["l"]}]},
+    {"BlockType": "LINE", "Id": "l", "Page": 1, "Text": "Total due", "Confidence": 99.1234,
+     "Geometry": {"BoundingBox": {"Left": 0.1, "Top": 0.2, "Width": 0.3, "Height": 0.04},
+                  "Polygon": [{"X": 0.1, "Y": 0.2}]},
+     "Relationships": [{"Type": "CHILD", "Ids": ["w1", "w2"]}]},
+    {"BlockType": "WORD", "Id": "w1", "Page": 1, "Text": "Total", "Confidence": 99.5},
+    {"BlockType": "WORD", "Id": "w2", "Page": 1, "Text": "due", "Confidence": 98.7},
+]
+RESULT = {"text": "Total due", "blocks": BLOCKS}
+
+
+def test_formats():
+    """Each format keeps the text and drops or re-encodes the blocks."""
+    assert format_result(RESULT, "full") is RESULT
+    assert format_result(RESULT, "text") == {"text": "Total due"}
+    assert format_result(RESULT, "lines")["lines"] == [
+        {"text": "Total due", "confidence": 99.12, "page": 1}
+    ]
+    assert format_result({"error": "boom"}, "compact") == {"error": "boom"}
+
+
+def test_compact_blocks_are_columnar():
+    """Compact blocks use row indices for children and drop polygons."""
+    compact = compact_blocks(BLOCKS)
+    assert compact["rows"] == 4
+    assert compact["type"] == ["PAGE", "LINE", "WORD", "WORD"]
+    assert compact["children"] == [[1], [2, 3], [], []]
+    assert compact["bbox"][1] == [0.1, 0.2, 0.3, 0.04]
+    assert compact["confidence"][0] is None
+    assert len(encode_json(compact)) < len(encode_json(BLOCKS))
+
+
+def test_endpoint_format_option():
+    """The format field on /extract-text selects the response shape."""
+    textract = mock.Mock()
+    textract.detect_document_text.return_value = {"Blocks": BLOCKS}
+    with tempfile.TemporaryDirectory() as tmp, \
+            mock.patch.object(textract_http_server, "result_cache", None), \
+            mock.patch.object(textract_http_server, "get_textract_client", return_value=textract):
+        path = os.path.join(tmp, "receipt.png")
+        with open(path, "wb") as f:
+            f.write(b"image")
+        client = TestClient(textract_http_server.app)
+        text_only = client.post("/extract-text", json={"file_path": path, "format": "text"})
+        assert text_only.json() == {"text": "Total due"}
+        compact = client.post("/extract-text", json={"file_path": path, "format": "compact"})
+        assert compact.json()["blocks"]["type"][0] == "PAGE"
+        invalid = client.post("/extract-text", json={"file_path": path, "format": "xml"})
+        assert invalid.status_code == 422
+
+
+if __name__ == "__main__":
+    test_formats()
+    test_compact_blocks_are_columnar()
+    test_endpoint_format_option()
+    print("✅ Textract format tests completed!")
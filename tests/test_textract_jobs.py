@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Test script for asynchronous Textract jobs.
+Runs the job API against a local Textract stand-in with paginated, multi-page results.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+from unittest import mock
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from fastapi.testclient import TestClient
+
+from src.utils.config import Config
+from src.utils.textract_jobs import JOB_FAILED, JOB_SUCCEEDED, TextractJob, run_textract_job
+from src.agents import textract_http_server
+
+
+class StubS3:
+    """Stand-in for the S3 client that remembers staged objects."""
+
+    def __init__(self):
+        self.objects = {}
+
+    def upload_fileobj(self, fileobj, bucket, key):
+        self.objects[(bucket, key)] = fileobj.read()
+
+    def delete_object(self, Bucket, Key):
+        self.objects.pop((Bucket, Key), None)
+
+
+class StubAsyncTextract:
+    """Local Textract stand-in: reports IN_PROGRESS a few times, then pages results."""
+
+    def __init__(self, pages=3, lines_per_page=2, blocks_per_response=4, polls=2, fail=False):
+        self.blocks = [
+            {"BlockType": "LINE", "Page": page, "Text": f"page {page} line {line}"}
+            for page in range(1, pages + 1)
+            for line in range(lines_per_page)
+        ]
+        self.pages = pages
+        self.blocks_per_response = blocks_per_response
+        self.polls_left = polls
+        self.fail = fail
+        self.started = []
+
+    def start_document_analysis(self, DocumentLocation, FeatureTypes):
+        self.started.append(("analysis", DocumentLocation, FeatureTypes))
+        return {"JobId": "job-1"}
+
+    def start_document_text_detection(self, DocumentLocation):
+        self.started.append(("detection", DocumentLocation, None))
+        return {"JobId": "job-1"}
+
+    def get_document_analysis(self, JobId, NextToken=None):
+        if self.polls_left > 0:
+            self.polls_left -= 1
+            return {"JobStatus": "IN_PROGRESS"}
+        if self.fail:
+            return {"JobStatus": "FAILED", "StatusMessage": "unsupported document"}
+        start = int(NextToken or 0)
+        end = start + self.blocks_per_response
+        response = {
+            "JobStatus": "SUCCEEDED",
+            "DocumentMetadata": {"Pages": self.pages},
+            "Blocks": self.blocks[start:end],
+        }
+        if end < len(self.blocks):
+            response["NextToken"] = str(end)
+        return response
+
+    get_document_text_detection = get_document_analysis
+
+
+def make_document(directory, name="doc.pdf"):
+    path = os.path.join(directory, name)
+    with open(path, "wb") as f:
+        f.write(b"%PDF-1.4 fake")
+    return path
+
+
+def test_job_collects_pages_in_order():
+    """Paginated results are grouped into pages and the staged object is removed."""
+    textract, s3 = StubAsyncTextract(pages=3, blocks_per_response=3), StubS3()
+    with tempfile.TemporaryDirectory() as tmp:
+        job = TextractJob(make_document(tmp), ["TABLES", "FORMS"])
+        result = run_textract_job(job, textract, s3, bucket="bucket", prefix="jobs/", poll_interval=0)
+    assert job.status == JOB_SUCCEEDED
+    assert job.total_pages == 3
+    assert [p["page"] for p in job.completed_pages()] == [1, 2, 3]
+    assert job.pages[2]["text"] == "page 2 line 0\npage 2 line 1"
+    assert result["text"].splitlines()[0] == "page 1 line 0"
+    assert len(result["blocks"]) == 6
+    assert textract.started[0][0] == "analysis"
+    assert s3.objects == {}
+
+
+def test_job_reports_failure():
+    """A FAILED Textract job surfaces its status message."""
+    textract = StubAsyncTextract(fail=True)
+    with tempfile.TemporaryDirectory() as tmp:
+        job = TextractJob(make_document(tmp, "scan.png"), [])
+        result = run_textract_job(job, textract, StubS3(), bucket="bucket", poll_interval=0)
+    assert job.status == JOB_FAILED
+    assert result == {"error": "unsupported document"}
+    assert textract.started[0][0] == "detection"
+
+
+def test_job_times_out():
+    """A job still IN_PROGRESS at the deadline is marked failed instead of polled forever."""
+    textract, s3 = StubAsyncTextract(polls=10 ** 6), StubS3()
+    with tempfile.TemporaryDirectory() as tmp:
+        job = TextractJob(make_document(tmp), ["TABLES"])
+        start = time.monotonic()
+        result = run_textract_job(job, textract, s3, bucket="bucket", poll_interval=0.01, timeout=0.1)
+    assert time.monotonic() - start < 1
+    assert job.status == JOB_FAILED
+    assert result == {"error": "Textract job job-1 did not finish within 0.1 seconds"}
+    assert job.error == result["error"]
+    assert s3.objects == {}
+
+    # Without a timeout the job is polled until Textract finishes it
+    textract = StubAsyncTextract(polls=20)
+    with tempfile.TemporaryDirectory() as tmp:
+        job = TextractJob(make_document(tmp), ["TABLES"])
+        run_textract_job(job, textract, s3, bucket="bucket", poll_interval=0.01)
+    assert job.status == JOB_SUCCEEDED
+
+
+def test_job_endpoints():
+    """POST /jobs returns an id; status and streamed pages follow the job."""
+    textract = StubAsyncTextract(pages=4, blocks_per_response=5)
+    with tempfile.TemporaryDirectory() as tmp, \
+            mock.patch.object(Config, "TEXTRACT_S3_BUCKET", "bucket"), \
+            mock.patch.object(Config, "TEXTRACT_JOB_POLL_SECONDS", 0), \
+            mock.patch.object(textract_http_server, "result_cache", None), \
+            mock.patch.object(textract_http_server, "get_textract_client", return_value=textract), \
+            mock.patch.object(textract_http_server, "get_s3_client", return_value=StubS3()):
+        client = TestClient(textract_http_server.app)
+        created = client.post("/jobs", json={"file_path": make_document(tmp)})
+        assert created.status_code == 202
+        job_id = created.json()["job_id"]
+
+        streamed = client.get(f"/jobs/{job_id}/pages")
+        pages = [json.loads(line) for line in streamed.text.splitlines()]
+        assert [p["page"] for p in pages] == [1, 2, 3, 4]
+
+        status = client.get(f"/jobs/{job_id}").json()
+        assert status["status"] == JOB_SUCCEEDED
+        assert status["pages_completed"] == 4
+        assert "blocks" not in status["pages"][0]
+        assert status["text"].count("\n") == 7
+
+        assert client.get("/jobs/missing").status_code == 404
+        missing_file = client.post("/jobs", json={"file_path": os.path.join(tmp, "nope.pdf")})
+        assert missing_file.status_code == 400
+
+
+if __name__ == "__main__":
+    test_job_collects_pages_in_order()
+    test_job_reports_failure()
+    test_job_times_out()
+    test_job_endpoints()
+    print("✅ Textract job tests completed!")
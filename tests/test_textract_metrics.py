@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Test script for the Textract server metrics and timing headers.
+"""
+
+import os
+import sys
+import tempfile
+from unittest import mock
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from fastapi.testclient import TestClient
+
+from src.utils.metrics import MetricsRegistry
+from src.utils.textract_metrics import extractions
+from src.utils.textract_cache import TextractResultCache
+from src.agents import textract_http_server
+
+
+def test_exposition_format():
+    """Counters and histograms render in the Prometheus text format."""
+    registry = MetricsRegistry()
+    counter = registry.counter("demo_total", "Demo counter.")
+    histogram = registry.histogram("demo_seconds", "Demo histogram.", buckets=(0.1, 1))
+    counter.inc(outcome="ok")
+    counter.inc(2, outcome="ok")
+    histogram.observe(0.05, route="/a")
+    histogram.observe(0.5, route="/a")
+    histogram.observe(5, route="/a")
+    text = registry.render()
+    assert "# TYPE demo_total counter" in text
+    assert 'demo_total{outcome="ok"} 3' in text
+    assert 'demo_seconds_bucket{route="/a",le="0.1"} 1' in text
+    assert 'demo_seconds_bucket{route="/a",le="1"} 2' in text
+    assert 'demo_seconds_bucket{route="/a",le="+Inf"} 3' in text
+    assert 'demo_seconds_count{route="/a"} 3' in text
+
+
+def test_metrics_endpoint_and_timing_header():
+    """Extractions are counted by outcome and phases show up in Server-Timing."""
+    textract = mock.Mock()
+    textract.detect_document_text.return_value = {"Blocks": [{"BlockType": "LINE", "Text": "hello"}]}
+    with tempfile.TemporaryDirectory() as tmp, \
+            mock.patch.object(textract_http_server, "result_cache",
+                              TextractResultCache(os.path.join(tmp, "cache"), max_bytes=1 << 20, ttl_seconds=0)), \
+            mock.patch.object(textract_http_server, "get_textract_client", return_value=textract):
+        path = os.path.join(tmp, "receipt.png")
+        with open(path, "wb") as f:
+            f.write(b"image bytes")
+        client = TestClient(textract_http_server.app)
+        ok_before = extractions.value(outcome="ok")
+        hit_before = extractions.value(outcome="cache_hit")
+
+        first = client.post("/extract-text", json={"file_path": path}, headers={"X-Timing": "1"})
+        assert first.status_code == 200
+        timing = first.headers["Server-Timing"]
+        for phase in ("file_read", "cache_lookup", "textract", "serialization", "total"):
+            assert f"{phase};dur=" in timing
+        assert "Server-Timing" not in client.post("/extract-text", json={"file_path": path}).headers
+
+        assert extractions.value(outcome="ok") == ok_before + 1
+        assert extractions.value(outcome="cache_hit") == hit_before + 1
+        assert client.post("/extract-text", json={"file_path": path + ".missing"}).status_code == 400
+
+        response = client.get("/metrics")
+        assert response.headers["content-type"].startswith("text/plain")
+        text = response.text
+        assert 'textract_extractions_total{outcome="not_found"}' in text
+        assert 'route="/extract-text"' in text
+        assert 'textract_pool_queue_depth{pool="extraction"} 0' in text
+        assert "textract_cache_hits_total 1" in text
+
+
+if __name__ == "__main__":
+    test_exposition_format()
+    test_metrics_endpoint_and_timing_header()
+    print("✅ Textract metrics tests completed!")
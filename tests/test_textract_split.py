@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Test script for page-splitting parallel extraction.
+Builds a real multi-page PDF and checks pages are extracted concurrently and merged in order.
+"""
+
+import io
+import os
+import sys
+import tempfile
+import threading
+import time
+from unittest import mock
+
+import pypdf
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.config import Config
+from src.utils.pdf_split import count_pdf_pages, split_pdf
+from src.agents import textract_http_server
+
+
+def make_pdf(path, pages):
+    """Write a PDF whose page widths (100, 101, ...) identify each page."""
+    writer = pypdf.PdfWriter()
+    for i in range(pages):
+        writer.add_blank_page(width=100 + i, height=100)
+    with open(path, "wb") as f:
+        writer.write(f)
+
+
+def count_pdf_pages_bytes(data):
+    return len(pypdf.PdfReader(io.BytesIO(data)).pages)
+
+
+class PageAwareTextract:
+    """Stand-in for the Textract client that reads page widths from each chunk."""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.calls = 0
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def analyze_document(self, Document, FeatureTypes):
+        with self._lock:
+            self.calls += 1
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        reader = pypdf.PdfReader(io.BytesIO(bytes(Document["Bytes"])))
+        return {"Blocks": [
+            {"BlockType": "LINE", "Page": number, "Text": f"page {int(page.mediabox.width) - 99}"}
+            for number, page in enumerate(reader.pages, start=1)
+        ]}
+
+
+def test_split_pdf_chunks():
+    """Chunks cover every page in order and respect the chunk size."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "doc.pdf")
+        make_pdf(path, 5)
+        assert count_pdf_pages(path) == 5
+        chunks = split_pdf(path, 2)
+        assert [first for first, _ in chunks] == [1, 3, 5]
+        assert [count_pdf_pages_bytes(chunk) for _, chunk in chunks] == [2, 2, 1]
+        with open(os.path.join(tmp, "broken.pdf"), "wb") as f:
+            f.write(b"not a pdf")
+        assert count_pdf_pages(os.path.join(tmp, "broken.pdf")) is None
+
+
+def test_multi_page_pdf_is_split_and_merged():
+    """Pages are extracted in parallel and merged back with document page numbers."""
+    textract = PageAwareTextract()
+    with tempfile.TemporaryDirectory() as tmp, \
+            mock.patch.object(Config, "TEXTRACT_SPLIT_PAGES_PER_CHUNK", 1), \
+            mock.patch.object(textract_http_server, "result_cache", None), \
+            mock.patch.object(textract_http_server, "get_textract_client", return_value=textract):
+        path = os.path.join(tmp, "scan.pdf")
+        make_pdf(path, 6)
+        result = textract_http_server.extract_text_from_file(path)
+    assert result["text"].splitlines() == [f"page {i}" for i in range(1, 7)]
+    assert [b["Page"] for b in result["blocks"]] == [1, 2, 3, 4, 5, 6]
+    assert textract.calls == 6
+    assert textract.max_active > 1
+
+    single = PageAwareTextract(delay=0)
+    with tempfile.TemporaryDirectory() as tmp, \
+            mock.patch.object(textract_http_server, "result_cache", None), \
+            mock.patch.object(textract_http_server, "get_textract_client", return_value=single):
+        path = os.path.join(tmp, "one.pdf")
+        make_pdf(path, 1)
+        assert textract_http_server.extract_text_from_file(path)["text"] == "page 1"
+    assert single.calls == 1
+
+
+if __name__ == "__main__":
+    test_split_pdf_chunks()
+    test_multi_page_pdf_is_split_and_merged()
+    print("✅ Textract page-splitting tests completed!")
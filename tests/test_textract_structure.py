@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Test script for table and form reconstruction from Textract blocks.
+"""
+
+import os
+import sys
+import tempfile
+from unittest import mock
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from fastapi.testclient import TestClient
+
+from src.utils.textract_structure import extract_structure
+from src.agents import textract_http_server
+
+
+def word(block_id, text):
+    return {"BlockType": "WORD", "Id": block_id, "Text": text, "Page": 1}
+
+
+def cell(block_id, row, column, child_ids, row_span=1, column_span=1):
+    return {
+        "BlockType": "CELL", "Id": block_id, "Page": 1,
+        "RowIndex": row, "ColumnIndex": column, "RowSpan": row_span, "ColumnSpan": column_span,
+        "Relationships": [{"Type": "CHILD", "Ids": child_ids}] if child_ids else [],
+    }
+
+
+BLOCKS = [
+    {"BlockType": "TABLE", "Id": "t", "Page": 1, "Confidence": 97.0,
+     "Relationships": [{"Type": "CHILD", "Ids": ["c11", "c12", "c21", "c22", "c31"]}]},
+    cell("c11", 1, 1, ["w-item"]),
+    cell("c12", 1, 2, ["w-price"]),
+    cell("c21", 2, 1, ["w-room", "w-night"]),
+    cell("c22", 2, 2, ["w-120"]),
+    cell("c31", 3, 1, ["w-total"], column_span=2),
+    word("w-item", "Item"), word("w-price", "Price"), word("w-room", "Room,"),
+    word("w-night", "night"), word("w-120", "120"), word("w-total", "Total"),
+    {"BlockType": "KEY_VALUE_SET", "Id": "k", "EntityTypes": ["KEY"], "Page": 1, "Confidence": 88.0,
+     "Relationships": [{"Type": "VALUE", "Ids": ["v"]}, {"Type": "CHILD", "Ids": ["w-guest"]}]},
+    {"BlockType": "KEY_VALUE_SET", "Id": "v", "EntityTypes": ["VALUE"], "Page": 1,
+     "Relationships": [{"Type": "CHILD", "Ids": ["w-name", "sel"]}]},
+    word("w-guest", "Guest:"), word("w-name", "Ada"),
+    {"BlockType": "SELECTION_ELEMENT", "Id": "sel", "SelectionStatus": "SELECTED", "Page": 1},
+]
+
+
+def test_tables_and_forms():
+    """Cells land in their grid positions and keys are paired with values."""
+    structure = extract_structure(BLOCKS, include_csv=True)
+    table = structure["tables"][0]
+    assert table["row_count"] == 3
+    assert table["column_count"] == 2
+    assert table["rows"] == [["Item", "Price"], ["Room, night", "120"], ["Total", ""]]
+    assert table["csv"] == 'Item,Price\n"Room, night",120\nTotal,\n'
+    assert table["merged_cells"] == [{"row": 3, "column": 1, "row_span": 1, "column_span": 2}]
+    assert structure["forms"] == [
+        {"page": 1, "key": "Guest:", "value": "Ada [X]", "confidence": 88.0}
+    ]
+
+
+def test_merged_cells():
+    """MERGED_CELL blocks put their cells' text in the top-left position of the span."""
+    blocks = [
+        {"BlockType": "TABLE", "Id": "t", "Page": 1,
+         "Relationships": [
+             {"Type": "CHILD", "Ids": ["c11", "c12", "c13", "c21", "c22", "c23", "c31", "c32", "c33"]},
+             {"Type": "MERGED_CELL", "Ids": ["m-header", "m-room"]},
+         ]},
+        cell("c11", 1, 1, ["w-room"]), cell("c12", 1, 2, []), cell("c13", 1, 3, ["w-rates"]),
+        cell("c21", 2, 1, []), cell("c22", 2, 2, ["w-mon"]), cell("c23", 2, 3, ["w-tue"]),
+        cell("c31", 3, 1, ["w-suite"]), cell("c32", 3, 2, ["w-200"]), cell("c33", 3, 3, ["w-210"]),
+        # "Room" heads a column two rows deep; "Rates" heads a row two columns wide
+        {"BlockType": "MERGED_CELL", "Id": "m-room", "Page": 1, "RowIndex": 1, "ColumnIndex": 1,
+         "RowSpan": 2, "ColumnSpan": 1, "Relationships": [{"Type": "CHILD", "Ids": ["c11", "c21"]}]},
+        {"BlockType": "MERGED_CELL", "Id": "m-header", "Page": 1, "RowIndex": 1, "ColumnIndex": 2,
+         "RowSpan": 1, "ColumnSpan": 2, "Relationships": [{"Type": "CHILD", "Ids": ["c12", "c13"]}]},
+        word("w-room", "Room"), word("w-rates", "Rates"), word("w-mon", "Mon"), word("w-tue", "Tue"),
+        word("w-suite", "Suite"), word("w-200", "200"), word("w-210", "210"),
+    ]
+    table = extract_structure(blocks)["tables"][0]
+    assert (table["row_count"], table["column_count"]) == (3, 3)
+    assert table["rows"] == [
+        ["Room", "Rates", ""],
+        ["", "Mon", "Tue"],
+        ["Suite", "200", "210"],
+    ]
+    assert table["merged_cells"] == [
+        {"row": 1, "column": 2, "row_span": 1, "column_span": 2},
+        {"row": 1, "column": 1, "row_span": 2, "column_span": 1},
+    ]
+
+
+def test_structure_option_on_endpoint():
+    """The structure option adds tables and forms to /extract-text responses."""
+    textract = mock.Mock()
+    textract.analyze_document.return_value = {"Blocks": BLOCKS}
+    with tempfile.TemporaryDirectory() as tmp, \
+            mock.patch.object(textract_http_server, "result_cache", None), \
+            mock.patch.object(textract_http_server, "get_textract_client", return_value=textract):
+        path = os.path.join(tmp, "invoice.pdf")
+        with open(path, "wb") as f:
+            f.write(b"%PDF-1.4")
+        client = TestClient(textract_http_server.app)
+        body = client.post(
+            "/extract-text", json={"file_path": path, "format": "text", "structure": True}
+        ).json()
+        assert set(body) == {"text", "tables", "forms"}
+        assert body["tables"][0]["rows"][0] == ["Item", "Price"]
+        assert "csv" not in body["tables"][0]
+
+        with open(path, "rb") as f:
+            uploaded = client.post(
+                "/extract-text/upload?filename=invoice.pdf&format=text&structure=true&tables_csv=true",
+                content=f.read(),
+            ).json()
+        assert uploaded["tables"][0]["csv"].startswith("Item,Price")
+
+
+if __name__ == "__main__":
+    test_tables_and_forms()
+    test_merged_cells()
+    test_structure_option_on_endpoint()
+    print("✅ Textract structure tests completed!")
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Test script for Textract call coalescing and adaptive rate limiting.
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+from unittest import mock
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from botocore.exceptions import ClientError
+from fastapi.testclient import TestClient
+
+from src.utils.config import Config
+from src.utils.rate_limiter import AdaptiveRateLimiter
+from src.utils.singleflight import SingleFlight
+from src.utils.textract_cache import TextractResultCache
+from src.utils.textract_metrics import extractions
+from src.agents import textract_http_server
+
+
+def throttling_error():
+    return ClientError({"Error": {"Code": "ThrottlingException", "Message": "Rate exceeded"}}, "AnalyzeDocument")
+
+
+class CountingTextract:
+    """Stand-in for the Textract client that is slow and throttles its first calls."""
+
+    def __init__(self, delay=0.1, throttle_first=0):
+        self.delay = delay
+        self.throttle_first = throttle_first
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def detect_document_text(self, Document):
+        with self._lock:
+            self.calls += 1
+            throttle = self.calls <= self.throttle_first
+        if throttle:
+            raise throttling_error()
+        time.sleep(self.delay)
+        return {"Blocks": [{"BlockType": "LINE", "Text": bytes(Document["Bytes"]).decode()}]}
+
+
+def test_singleflight_shares_one_call():
+    """Concurrent callers with the same key get the first caller's result."""
+    flight = SingleFlight()
+    calls = []
+
+    def work():
+        calls.append(1)
+        time.sleep(0.1)
+        return "result"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.do("doc", work))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert sorted(shared for _, shared in results) == [False, True, True, True, True]
+    assert flight.stats() == {"in_flight": 0, "executed": 1, "shared": 4}
+    assert flight.do("doc", lambda: "again") == ("again", False)
+
+
+def test_rate_limiter_backs_off_and_retries():
+    """Throttling halves the rate and is retried; other errors are raised at once."""
+    limiter = AdaptiveRateLimiter(rate=100, burst=1, min_rate=10)
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise throttling_error()
+        return "ok"
+
+    assert limiter.call(flaky, max_retries=5, base_delay=0) == "ok"
+    stats = limiter.stats()
+    assert stats["throttled"] == 2
+    assert stats["retries"] == 2
+    assert 25 <= stats["rate"] < 100
+
+    denied = ClientError({"Error": {"Code": "AccessDeniedException"}}, "AnalyzeDocument")
+    try:
+        limiter.call(mock.Mock(side_effect=denied), max_retries=5, base_delay=0)
+        raise AssertionError("expected ClientError")
+    except ClientError as e:
+        assert e is denied
+    assert limiter.stats()["retries"] == 2
+
+    start = time.monotonic()
+    paced = AdaptiveRateLimiter(rate=50, burst=1, min_rate=1)
+    for _ in range(6):
+        paced.acquire()
+    assert time.monotonic() - start >= 0.09
+
+
+def test_duplicate_requests_are_coalesced():
+    """A batch asking for the same document four times makes one Textract call."""
+    textract = CountingTextract()
+    with tempfile.TemporaryDirectory() as tmp, \
+            mock.patch.object(textract_http_server, "result_cache", None), \
+            mock.patch.object(textract_http_server, "get_textract_client", return_value=textract):
+        path = os.path.join(tmp, "same.png")
+        with open(path, "w") as f:
+            f.write("shared text")
+        coalesced_before = extractions.value(outcome="coalesced")
+        client = TestClient(textract_http_server.app)
+        response = client.post("/extract-text/batch", json={"file_paths": [path] * 4, "format": "text"})
+        lines = response.text.splitlines()
+    assert len(lines) == 4
+    assert all('"shared text"' in line for line in lines)
+    assert textract.calls == 1
+    assert extractions.value(outcome="coalesced") == coalesced_before + 3
+
+
+def test_result_is_cached_before_flight_ends():
+    """A caller arriving just after a flight ends hits the cache instead of calling Textract again."""
+    textract = CountingTextract(delay=0)
+    flight = SingleFlight()
+    cached_when_released = []
+
+    def do(key, fn, *args):
+        outcome = SingleFlight.do(flight, key, fn, *args)
+        cached_when_released.append(cache.get(key))
+        return outcome
+
+    flight.do = do
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = TextractResultCache(tmp, max_bytes=1024 * 1024, ttl_seconds=0)
+        path = os.path.join(tmp, "doc.png")
+        with open(path, "w") as f:
+            f.write("cached text")
+        with mock.patch.object(textract_http_server, "result_cache", cache), \
+                mock.patch.object(textract_http_server, "textract_flight", flight), \
+                mock.patch.object(textract_http_server, "get_textract_client", return_value=textract):
+            result = textract_http_server.extract_text_from_file(path)
+    assert cached_when_released == [result]
+    assert textract.calls == 1
+
+
+def test_throttled_extraction_recovers():
+    """Throttling errors are absorbed by retries; persistent throttling is reported as such."""
+    limiter = AdaptiveRateLimiter(rate=100, burst=5, min_rate=1)
+    with tempfile.TemporaryDirectory() as tmp, \
+            mock.patch.object(Config, "TEXTRACT_THROTTLE_BASE_DELAY", 0), \
+            mock.patch.object(textract_http_server, "rate_limiter", limiter), \
+            mock.patch.object(textract_http_server, "result_cache", None):
+        path = os.path.join(tmp, "burst.png")
+        with open(path, "w") as f:
+            f.write("recovered")
+        with mock.patch.object(textract_http_server, "get_textract_client",
+                               return_value=CountingTextract(delay=0, throttle_first=2)):
+            assert textract_http_server.extract_text_from_file(path)["text"] == "recovered"
+        throttled_before = extractions.value(outcome="throttled")
+        with mock.patch.object(Config, "TEXTRACT_THROTTLE_RETRIES", 1), \
+                mock.patch.object(textract_http_server, "get_textract_client",
+                                  return_value=CountingTextract(delay=0, throttle_first=10)):
+            assert "ThrottlingException" in textract_http_server.extract_text_from_file(path)["error"]
+        assert extractions.value(outcome="throttled") == throttled_before + 1
+    assert limiter.stats()["throttled"] == 4
+
+
+if __name__ == "__main__":
+    test_singleflight_shares_one_call()
+    test_rate_limiter_backs_off_and_retries()
+    test_duplicate_requests_are_coalesced()
+    test_result_is_cached_before_flight_ends()
+    test_throttled_extraction_recovers()
+    print("✅ Textract throttling tests completed!")
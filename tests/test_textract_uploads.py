@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Test script for document uploads to the Textract HTTP server.
+Covers raw and multipart uploads, the size limit and memory-mapped path reads.
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+from unittest import mock
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import httpx
+from fastapi.testclient import TestClient
+
+from src.utils.config import Config
+from src.agents import textract_http_server
+
+
+class RecordingTextract:
+    """Stand-in for the Textract client that records the documents it receives."""
+
+    def __init__(self):
+        self.documents = []
+
+    def detect_document_text(self, Document):
+        self.documents.append(("detect", bytes(Document["Bytes"])))
+        return {"Blocks": [{"BlockType": "LINE", "Text": "uploaded"}]}
+
+    def analyze_document(self, Document, FeatureTypes):
+        self.documents.append(("analyze", bytes(Document["Bytes"])))
+        return {"Blocks": [{"BlockType": "LINE", "Text": "uploaded pdf"}]}
+
+
+def make_client(textract):
+    patches = [
+        mock.patch.object(textract_http_server, "result_cache", None),
+        mock.patch.object(textract_http_server, "get_textract_client", return_value=textract),
+    ]
+    for patch in patches:
+        patch.start()
+    return TestClient(textract_http_server.app), patches
+
+
+def test_raw_and_multipart_uploads():
+    """Both upload styles reach Textract and leave no spool files behind."""
+    textract = RecordingTextract()
+    client, patches = make_client(textract)
+    try:
+        with tempfile.TemporaryDirectory() as spool_dir, \
+                mock.patch.object(Config, "TEXTRACT_SPOOL_DIR", spool_dir):
+            raw = client.post(
+                "/extract-text/upload?filename=scan.png",
+                content=b"raw image bytes",
+                headers={"Content-Type": "application/octet-stream"},
+            )
+            assert raw.status_code == 200
+            assert raw.json()["text"] == "uploaded"
+
+            multipart = client.post(
+                "/extract-text/upload",
+                files={"file": ("contract.pdf", b"%PDF-1.4 bytes", "application/pdf")},
+            )
+            assert multipart.status_code == 200
+            assert multipart.json()["text"] == "uploaded pdf"
+            assert os.listdir(spool_dir) == []
+        assert textract.documents == [("detect", b"raw image bytes"), ("analyze", b"%PDF-1.4 bytes")]
+    finally:
+        for patch in patches:
+            patch.stop()
+
+
+def test_upload_size_limit():
+    """Uploads over TEXTRACT_MAX_UPLOAD_BYTES are rejected with 413, a bad Content-Length with 400."""
+    textract = RecordingTextract()
+    client, patches = make_client(textract)
+    try:
+        with mock.patch.object(Config, "TEXTRACT_MAX_UPLOAD_BYTES", 8):
+            response = client.post("/extract-text/upload", content=b"0123456789")
+            assert response.status_code == 413
+
+            def chunks():
+                yield b"01234"
+                yield b"56789"
+
+            streamed = client.post("/extract-text/upload", content=chunks())
+            assert streamed.status_code == 413
+
+            malformed = client.post("/extract-text/upload", content=b"0123",
+                                    headers={"Content-Length": "four"})
+            assert malformed.status_code == 400
+
+        # Multipart bodies are cut off as they arrive, not parsed in full first
+        sent = []
+
+        async def multipart_body():
+            yield b'--b\r\nContent-Disposition: form-data; name="file"; filename="big.png"\r\n\r\n'
+            for _ in range(100):
+                sent.append(1)
+                yield b"x" * 1024
+            yield b"\r\n--b--\r\n"
+
+        async def post_multipart():
+            transport = httpx.ASGITransport(app=textract_http_server.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as async_client:
+                return await async_client.post(
+                    "/extract-text/upload", content=multipart_body(),
+                    headers={"Content-Type": "multipart/form-data; boundary=b"},
+                )
+
+        with mock.patch.object(Config, "TEXTRACT_MAX_UPLOAD_BYTES", 4096), \
+                mock.patch.object(textract_http_server, "MULTIPART_OVERHEAD_BYTES", 1024):
+            assert asyncio.run(post_multipart()).status_code == 413
+        assert len(sent) < 10
+        assert textract.documents == []
+    finally:
+        for patch in patches:
+            patch.stop()
+
+
+def test_path_extraction_reads_memory_mapped_file():
+    """The path-based flow sends the file contents, including empty files."""
+    textract = RecordingTextract()
+    with tempfile.TemporaryDirectory() as tmp, \
+            mock.patch.object(textract_http_server, "result_cache", None), \
+            mock.patch.object(textract_http_server, "get_textract_client", return_value=textract):
+        path = os.path.join(tmp, "page.png")
+        with open(path, "wb") as f:
+            f.write(b"x" * 5000)
+        assert textract_http_server.extract_text_from_file(path)["text"] == "uploaded"
+        empty = os.path.join(tmp, "empty.png")
+        open(empty, "wb").close()
+        assert textract_http_server.extract_text_from_file(empty)["text"] == "uploaded"
+    assert textract.documents == [("detect", b"x" * 5000), ("detect", b"")]
+
+
+if __name__ == "__main__":
+    test_raw_and_multipart_uploads()
+    test_upload_size_limit()
+    test_path_extraction_reads_memory_mapped_file()
+    print("✅ Textract upload tests completed!")
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Test script for the tool result cache.
+Wraps LangChain tools standing in for the hotel toolset and checks hits on
+normalized arguments, TTLs, booking invalidation and hit-rate reporting.
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from langchain_core.tools import StructuredTool
+
+from src.utils.tool_cache import (
+    HOTEL_TOOL_POLICIES,
+    ToolCachePolicy,
+    ToolResultCache,
+    normalize_args,
+    parse_ttl_overrides,
+)
+
+
+class FakeToolbox:
+    """Hotel tools backed by a bookings list, counting the calls that reach the "database"."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = []
+        self.bookings = []
+
+    def tools(self):
+        async def search_hotels_by_location(location: str):
+            await self.record("search-hotels-by-location")
+            return f"hotels in {location.lower()}"
+
+        async def list_bookings():
+            await self.record("list-bookings")
+            return list(self.bookings)
+
+        async def check_hotel_availability(hotel_id: int, checkin_date: str, checkout_date: str):
+            await self.record("check-hotel-availability")
+            booked = any(b[0] == int(hotel_id) for b in self.bookings)
+            return "Booked" if booked else "Available"
+
+        async def create_booking(hotel_id: int, checkin_date: str, checkout_date: str):
+            await self.record("create-booking")
+            self.bookings.append((int(hotel_id), checkin_date, checkout_date))
+            return "ok"
+
+        async def extract_text(file_path: str):
+            await self.record("extract-text")
+            return "text"
+
+        functions = {
+            "search-hotels-by-location": search_hotels_by_location,
+            "list-bookings": list_bookings,
+            "check-hotel-availability": check_hotel_availability,
+            "create-booking": create_booking,
+            "extract-text": extract_text,
+        }
+        return [StructuredTool.from_function(coroutine=fn, name=name, description=name)
+                for name, fn in functions.items()]
+
+    async def record(self, name):
+        self.calls.append(name)
+        await asyncio.sleep(self.delay)
+
+
+def wrapped_tools(cache, toolbox):
+    return {tool.name: tool for tool in cache.wrap_all(toolbox.tools())}
+
+
+def test_hits_on_normalized_arguments():
+    toolbox = FakeToolbox()
+    cache = ToolResultCache(HOTEL_TOOL_POLICIES)
+    tools = wrapped_tools(cache, toolbox)
+
+    async def scenario():
+        search = tools["search-hotels-by-location"]
+        assert search.description == "search-hotels-by-location"
+        first = await search.ainvoke({"location": "Basel"})
+        assert await search.ainvoke({"location": "  basel "}) == first
+        assert await search.ainvoke({"location": "BASEL"}) == first
+        await search.ainvoke({"location": "Zurich"})
+        # Tools without a policy aren't cached
+        await tools["extract-text"].ainvoke({"file_path": "a.pdf"})
+        await tools["extract-text"].ainvoke({"file_path": "a.pdf"})
+
+    asyncio.run(scenario())
+    assert toolbox.calls == ["search-hotels-by-location", "search-hotels-by-location", "extract-text", "extract-text"]
+    stats = cache.stats()
+    assert stats["tools"]["search-hotels-by-location"]["hits"] == 2
+    assert stats["tools"]["search-hotels-by-location"]["hit_rate"] == 0.5
+    assert stats["hit_rate"] == 0.5 and stats["entries"] == 2
+
+
+def test_only_id_arguments_are_coerced_to_integers():
+    availability = HOTEL_TOOL_POLICIES["check-hotel-availability"]
+    assert normalize_args({"hotel_id": " 7 ", "checkin_date": "2026"}, availability) == \
+        {"hotel_id": 7, "checkin_date": "2026"}
+    assert normalize_args({"hotel_id": 7.0}, availability) == {"hotel_id": 7}
+    by_name = HOTEL_TOOL_POLICIES["search-hotels-by-name"]
+    assert normalize_args({"name": "007"}, by_name) != normalize_args({"name": "7"}, by_name)
+
+    toolbox = FakeToolbox()
+    cache = ToolResultCache(HOTEL_TOOL_POLICIES, ttl_overrides={"check-hotel-availability": 60})
+    tools = wrapped_tools(cache, toolbox)
+    dates = {"checkin_date": "2026-05-01", "checkout_date": "2026-05-03"}
+
+    async def scenario():
+        await tools["check-hotel-availability"].ainvoke({"hotel_id": "1", **dates})
+        await tools["check-hotel-availability"].ainvoke({"hotel_id": 1, **dates})
+        await tools["search-hotels-by-location"].ainvoke({"location": "007"})
+        await tools["search-hotels-by-location"].ainvoke({"location": "7"})
+
+    asyncio.run(scenario())
+    assert toolbox.calls == ["check-hotel-availability", "search-hotels-by-location", "search-hotels-by-location"]
+
+
+def test_booking_invalidates_bookings_and_that_hotels_availability():
+    toolbox = FakeToolbox()
+    cache = ToolResultCache(HOTEL_TOOL_POLICIES)
+    tools = wrapped_tools(cache, toolbox)
+    dates = {"checkin_date": "2026-05-01", "checkout_date": "2026-05-03"}
+
+    async def scenario():
+        availability = tools["check-hotel-availability"]
+        assert await availability.ainvoke({"hotel_id": 1, **dates}) == "Available"
+        assert await availability.ainvoke({"hotel_id": 2, **dates}) == "Available"
+        assert await tools["list-bookings"].ainvoke({}) == []
+        await tools["search-hotels-by-location"].ainvoke({"location": "Basel"})
+
+        await tools["create-booking"].ainvoke({"hotel_id": "1", **dates})
+
+        assert await availability.ainvoke({"hotel_id": 1, **dates}) == "Booked"
+        assert await availability.ainvoke({"hotel_id": 2, **dates}) == "Available"
+        assert await tools["list-bookings"].ainvoke({}) == [(1, "2026-05-01", "2026-05-03")]
+        await tools["search-hotels-by-location"].ainvoke({"location": "Basel"})
+
+    asyncio.run(scenario())
+    # Hotel 2's availability and the hotel search were still served from the cache
+    assert toolbox.calls.count("check-hotel-availability") == 3
+    assert toolbox.calls.count("list-bookings") == 2
+    assert toolbox.calls.count("search-hotels-by-location") == 1
+    stats = cache.stats()["tools"]
+    assert stats["check-hotel-availability"]["invalidated"] == 1
+    assert stats["list-bookings"]["invalidated"] == 1
+    assert stats["create-booking"]["writes"] == 1
+
+
+def test_concurrent_misses_share_a_call_and_writes_during_a_read_win():
+    toolbox = FakeToolbox(delay=0.05)
+    cache = ToolResultCache(HOTEL_TOOL_POLICIES)
+    tools = wrapped_tools(cache, toolbox)
+
+    async def scenario():
+        results = await asyncio.gather(*(tools["list-bookings"].ainvoke({}) for _ in range(10)))
+        assert results == [[]] * 10
+        assert toolbox.calls.count("list-bookings") == 1
+
+        # A booking lands while a read is in flight; the read's result must not be cached
+        cache.clear()
+        read = asyncio.create_task(tools["list-bookings"].ainvoke({}))
+        await asyncio.sleep(0.01)
+        await tools["create-booking"].ainvoke({"hotel_id": 3, "checkin_date": "a", "checkout_date": "b"})
+        await read
+        assert await tools["list-bookings"].ainvoke({}) == [(3, "a", "b")]
+
+    asyncio.run(scenario())
+    assert cache.stats()["tools"]["list-bookings"]["coalesced"] == 9
+
+
+def test_cancelled_caller_does_not_cancel_coalesced_waiters():
+    """When the session owning a shared call is cancelled, the others' calls still complete."""
+    toolbox = FakeToolbox(delay=0.05)
+    cache = ToolResultCache(HOTEL_TOOL_POLICIES)
+    tools = wrapped_tools(cache, toolbox)
+
+    async def scenario():
+        owner = asyncio.create_task(tools["list-bookings"].ainvoke({}))
+        await asyncio.sleep(0.01)
+        waiter = asyncio.create_task(tools["list-bookings"].ainvoke({}))
+        await asyncio.sleep(0.01)
+        owner.cancel()
+        assert await waiter == []
+        assert owner.cancelled()
+        # The waiter's own call was cached for the next one
+        assert await tools["list-bookings"].ainvoke({}) == []
+
+    asyncio.run(scenario())
+    assert toolbox.calls == ["list-bookings", "list-bookings"]
+    stats = cache.stats()["tools"]["list-bookings"]
+    assert stats["coalesced"] == 1 and stats["hits"] == 1
+
+
+def test_ttls_and_overrides():
+    assert parse_ttl_overrides("list-hotels=600, list-bookings=0,") == {"list-hotels": 600.0, "list-bookings": 0.0}
+    toolbox = FakeToolbox()
+    policies = {"search-hotels-by-location": ToolCachePolicy(0.1, reads=("hotels",)),
+                "list-bookings": ToolCachePolicy(30, reads=("bookings",))}
+    cache = ToolResultCache(policies, ttl_overrides={"list-bookings": 0})
+    tools = wrapped_tools(cache, toolbox)
+
+    async def scenario():
+        search = tools["search-hotels-by-location"]
+        await search.ainvoke({"location": "Basel"})
+        await search.ainvoke({"location": "Basel"})
+        time.sleep(0.15)
+        await search.ainvoke({"location": "Basel"})
+        await tools["list-bookings"].ainvoke({})
+        await tools["list-bookings"].ainvoke({})
+
+    asyncio.run(scenario())
+    assert toolbox.calls == ["search-hotels-by-location", "search-hotels-by-location",
+                             "list-bookings", "list-bookings"]
+
+
+if __name__ == "__main__":
+    test_hits_on_normalized_arguments()
+    test_only_id_arguments_are_coerced_to_integers()
+    test_booking_invalidates_bookings_and_that_hotels_availability()
+    test_concurrent_misses_share_a_call_and_writes_during_a_read_win()
+    test_cancelled_caller_does_not_cancel_coalesced_waiters()
+    test_ttls_and_overrides()
+    print("✅ Tool cache tests completed!")
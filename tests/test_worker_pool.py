@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Test script for the bounded worker pool.
+Checks that blocking work runs off the event loop and that overflow is rejected.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.worker_pool import PoolFullError, WorkerPool
+
+
+def test_runs_concurrently_off_event_loop():
+    """Blocking calls overlap instead of running back to back."""
+    pool = WorkerPool(max_workers=4, max_queue=0)
+
+    async def run():
+        start = time.perf_counter()
+        results = await asyncio.gather(*[pool.run(time.sleep, 0.2) for _ in range(4)])
+        return results, time.perf_counter() - start
+
+    try:
+        results, elapsed = asyncio.run(run())
+        assert results == [None] * 4
+        assert elapsed < 0.6
+        stats = pool.stats()
+        assert stats["completed"] == 4
+        assert stats["queue_depth"] == 0
+        assert stats["running"] == 0
+    finally:
+        pool.shutdown()
+
+
+def test_rejects_when_queue_full():
+    """Work beyond workers plus queue slots raises PoolFullError."""
+    pool = WorkerPool(max_workers=1, max_queue=1)
+    release = threading.Event()
+
+    async def run():
+        busy = asyncio.ensure_future(pool.run(release.wait))
+        waiting = asyncio.ensure_future(pool.run(lambda: "queued"))
+        await asyncio.sleep(0.05)
+        assert pool.stats()["queue_depth"] == 1
+        try:
+            await pool.run(lambda: "overflow")
+            raise AssertionError("expected PoolFullError")
+        except PoolFullError:
+            pass
+        release.set()
+        return await asyncio.gather(busy, waiting)
+
+    try:
+        assert asyncio.run(run()) == [True, "queued"]
+        stats = pool.stats()
+        assert stats["rejected"] == 1
+        assert stats["completed"] == 2
+        assert stats["wait_seconds_max"] > 0
+    finally:
+        pool.shutdown()
+
+
+if __name__ == "__main__":
+    test_runs_concurrently_off_event_loop()
+    test_rejects_when_queue_full()
+    print("✅ Worker pool tests completed!")